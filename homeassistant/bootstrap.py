@@ -7,7 +7,7 @@ import sys
 from time import time
 from collections import OrderedDict
 
-from typing import Any, Optional, Dict
+from typing import Any, Optional, Dict, Set
 
 import voluptuous as vol
 
@@ -15,10 +15,13 @@ from homeassistant import (
     core, config as conf_util, loader, components as core_components)
 from homeassistant.components import persistent_notification
 from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
-from homeassistant.setup import async_setup_component
+from homeassistant.setup import (
+    async_setup_component, async_get_setup_timeline)
+from homeassistant.util import OrderedSet
 from homeassistant.util.logging import AsyncHandler
 from homeassistant.util.package import async_get_user_site, get_user_site
-from homeassistant.util.yaml import clear_secret_cache
+from homeassistant.util.yaml import (
+    CACHE_FILE as YAML_CACHE_FILE, clear_secret_cache, load_cache, save_cache)
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers.signal import async_register_signal_handling
 
@@ -33,6 +36,10 @@ FIRST_INIT_COMPONENT = set((
     'system_log', 'recorder', 'mqtt', 'mqtt_eventstream', 'logger',
     'introduction', 'frontend', 'history'))
 
+# Components that all other components wait for, so log levels and error
+# capturing are in place before the bulk of the components is set up.
+LOGGING_COMPONENT = set(('system_log', 'logger'))
+
 
 def from_config_dict(config: Dict[str, Any],
                      hass: Optional[core.HomeAssistant]=None,
@@ -112,8 +119,9 @@ def async_from_config_dict(config: Dict[str, Any],
         yield from hass.async_add_job(loader.prepare, hass)
 
     # Merge packages
-    conf_util.merge_packages_config(
-        config, core_config.get(conf_util.CONF_PACKAGES, {}))
+    yield from hass.async_add_job(
+        conf_util.merge_packages_config, config,
+        core_config.get(conf_util.CONF_PACKAGES, {}))
 
     # Make a copy because we are mutating it.
     # Use OrderedDict in case original one was one.
@@ -139,29 +147,65 @@ def async_from_config_dict(config: Dict[str, Any],
 
     _LOGGER.info("Home Assistant core initialized")
 
-    # stage 1
-    for component in components:
-        if component not in FIRST_INIT_COMPONENT:
-            continue
-        hass.async_add_job(async_setup_component(hass, component, config))
-
-    yield from hass.async_block_till_done()
+    yield from _async_setup_components(hass, components, config)
 
-    # stage 2
-    for component in components:
-        if component in FIRST_INIT_COMPONENT:
-            continue
-        hass.async_add_job(async_setup_component(hass, component, config))
-
-    yield from hass.async_block_till_done()
+    # Store the manifests so the next start does not need to parse them
+    yield from hass.async_add_job(loader.save_manifest, hass)
 
     stop = time()
     _LOGGER.info("Home Assistant initialized in %.2fs", stop-start)
 
+    timeline = async_get_setup_timeline(hass)
+    for domain in sorted(timeline, reverse=True,
+                         key=lambda domain: timeline[domain]['setup']):
+        _LOGGER.debug("Setup of %s waited %.2fs and took %.2fs", domain,
+                      timeline[domain]['wait'], timeline[domain]['setup'])
+
     async_register_signal_handling(hass)
     return hass
 
 
+@asyncio.coroutine
+def _async_setup_components(hass: core.HomeAssistant, components: Set[str],
+                            config: Dict[str, Any]) -> None:
+    """Set up components as soon as their dependencies are set up.
+
+    Components are scheduled in dependency order, with the components in
+    FIRST_INIT_COMPONENT first. Apart from the logging components, a
+    component only waits for its own dependencies.
+
+    This method is a coroutine.
+    """
+    order = yield from hass.async_add_job(_load_order, components)
+
+    logging_tasks = [
+        hass.async_add_job(async_setup_component(hass, domain, config))
+        for domain in order if domain in LOGGING_COMPONENT]
+
+    if logging_tasks:
+        yield from asyncio.wait(logging_tasks, loop=hass.loop)
+
+    for domain in order:
+        if domain not in LOGGING_COMPONENT:
+            hass.async_add_job(async_setup_component(hass, domain, config))
+
+    yield from hass.async_block_till_done()
+
+
+def _load_order(components: Set[str]) -> OrderedSet:
+    """Return the components and their dependencies in load order.
+
+    This method needs to run in an executor.
+    """
+    order = OrderedSet()
+    for domain in sorted(components, key=FIRST_INIT_COMPONENT.__contains__,
+                         reverse=True):
+        # Unresolvable components are left for async_setup_component to report
+        order.update(loader.load_order_component(domain) or [domain])
+
+    return order
+
+
 def from_config_file(config_path: str,
                      hass: Optional[core.HomeAssistant]=None,
                      verbose: bool=False,
@@ -204,6 +248,9 @@ def async_from_config_file(config_path: str,
 
     async_enable_logging(hass, verbose, log_rotate_days, log_file)
 
+    yaml_cache_path = hass.config.path(YAML_CACHE_FILE)
+    yield from hass.async_add_job(load_cache, yaml_cache_path)
+
     try:
         config_dict = yield from hass.async_add_job(
             conf_util.load_yaml_config_file, config_path)
@@ -213,6 +260,8 @@ def async_from_config_file(config_path: str,
     finally:
         clear_secret_cache()
 
+    yield from hass.async_add_job(save_cache, yaml_cache_path)
+
     hass = yield from async_from_config_dict(
         config_dict, hass, enable_log=False, skip_pip=skip_pip)
     return hass
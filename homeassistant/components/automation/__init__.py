@@ -18,7 +18,8 @@ from homeassistant.const import (
     SERVICE_TOGGLE, SERVICE_RELOAD, EVENT_HOMEASSISTANT_START, CONF_ID)
 from homeassistant.components import logbook
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.helpers import extract_domain_configs, script, condition
+from homeassistant.helpers import (
+    config_hash, extract_domain_configs, script, condition)
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.restore_state import async_get_last_state
@@ -201,8 +202,8 @@ def async_setup(hass, config):
 
     @asyncio.coroutine
     def reload_service_handler(service_call):
-        """Remove all automations and load new ones from config."""
-        conf = yield from component.async_prepare_reload()
+        """Replace the automations that changed in the config."""
+        conf = yield from component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         yield from _async_process_config(hass, conf, component)
@@ -231,8 +232,9 @@ class AutomationEntity(ToggleEntity):
     """Entity to show status of entity."""
 
     def __init__(self, automation_id, name, async_attach_triggers, cond_func,
-                 async_action, hidden, initial_state):
+                 async_action, hidden, initial_state, conf_hash=None):
         """Initialize an automation entity."""
+        self.conf_hash = conf_hash
         self._id = automation_id
         self._name = name
         self._async_attach_triggers = async_attach_triggers
@@ -371,8 +373,15 @@ class AutomationEntity(ToggleEntity):
 def _async_process_config(hass, config, component):
     """Process config and add automations.
 
+    Automations that are already set up with the same config are kept,
+    together with their triggers and running actions.
+
     This method is a coroutine.
     """
+    current = {}
+    for entity in component.entities.values():
+        current.setdefault(entity.conf_hash, []).append(entity)
+
     entities = []
 
     for config_key in extract_domain_configs(config, DOMAIN):
@@ -383,6 +392,11 @@ def _async_process_config(hass, config, component):
             name = config_block.get(CONF_ALIAS) or "{} {}".format(config_key,
                                                                   list_no)
 
+            block_hash = (name, config_hash(config_block))
+            if current.get(block_hash):
+                current[block_hash].pop()
+                continue
+
             hidden = config_block[CONF_HIDE_ENTITY]
             initial_state = config_block.get(CONF_INITIAL_STATE)
 
@@ -405,10 +419,14 @@ def _async_process_config(hass, config, component):
             )
             entity = AutomationEntity(
                 automation_id, name, async_attach_triggers, cond_func, action,
-                hidden, initial_state)
+                hidden, initial_state, block_hash)
 
             entities.append(entity)
 
+    for removed in current.values():
+        for entity in removed:
+            yield from component.async_remove_entity(entity.entity_id)
+
     if entities:
         yield from component.async_add_entities(entities)
 
@@ -440,6 +458,8 @@ def _async_process_if(hass, config, p_config):
             _LOGGER.warning('Invalid condition: %s', ex)
             return None
 
+    checks.sort(key=lambda check: check.cost)
+
     def if_action(variables=None):
         """AND all conditions."""
         return all(check(hass, variables) for check in checks)
@@ -14,7 +14,7 @@ from homeassistant.const import (
     CONF_VALUE_TEMPLATE, CONF_PLATFORM, CONF_ENTITY_ID,
     CONF_BELOW, CONF_ABOVE, CONF_FOR)
 from homeassistant.helpers.event import (
-    async_track_state_change, async_track_same_state)
+    async_track_state_change, async_track_held_state)
 from homeassistant.helpers import condition, config_validation as cv
 
 TRIGGER_SCHEMA = vol.All(vol.Schema({
@@ -43,6 +43,9 @@ def async_trigger(hass, config, action):
     if value_template is not None:
         value_template.hass = hass
 
+    held_key = ('numeric_state', below, above,
+                value_template.template if value_template else None)
+
     @callback
     def check_numeric_state(entity, from_s, to_s):
         """Return True if criteria are now met."""
@@ -85,9 +88,12 @@ def async_trigger(hass, config, action):
             entities_triggered.add(entity)
 
             if time_delta:
-                unsub_track_same[entity] = async_track_same_state(
-                    hass, time_delta, call_action, entity_ids=entity_id,
-                    async_check_same_func=check_numeric_state)
+                if entity in unsub_track_same:
+                    unsub_track_same.pop(entity)()
+
+                unsub_track_same[entity] = async_track_held_state(
+                    hass, time_delta, call_action, check_numeric_state,
+                    entity, held_key, to_s)
             else:
                 call_action()
 
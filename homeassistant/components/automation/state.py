@@ -10,7 +10,7 @@ import voluptuous as vol
 from homeassistant.core import callback
 from homeassistant.const import MATCH_ALL, CONF_PLATFORM, CONF_FOR
 from homeassistant.helpers.event import (
-    async_track_state_change, async_track_same_state)
+    async_track_state_change, async_track_held_state)
 import homeassistant.helpers.config_validation as cv
 
 CONF_ENTITY_ID = 'entity_id'
@@ -62,10 +62,13 @@ def async_trigger(hass, config, action):
             call_action()
             return
 
-        unsub_track_same[entity] = async_track_same_state(
+        if entity in unsub_track_same:
+            unsub_track_same.pop(entity)()
+
+        unsub_track_same[entity] = async_track_held_state(
             hass, time_delta, call_action,
             lambda _, _2, to_state: to_state.state == to_s.state,
-            entity_ids=entity_id)
+            entity, ('state', to_s.state), to_s)
 
     unsub = async_track_state_change(
         hass, entity_id, state_automation_listener, from_state, to_state)
@@ -19,10 +19,9 @@ import async_timeout
 import voluptuous as vol
 
 from homeassistant.core import callback
-from homeassistant.const import (ATTR_ENTITY_ID, ATTR_ENTITY_PICTURE)
+from homeassistant.const import ATTR_ENTITY_ID
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import bind_hass
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA  # noqa
@@ -51,6 +50,10 @@ DEFAULT_CONTENT_TYPE = 'image/jpeg'
 ENTITY_IMAGE_URL = '/api/camera_proxy/{0}?token={1}'
 
 TOKEN_CHANGE_INTERVAL = timedelta(minutes=5)
+
+DATA_FRAME_CACHE = 'camera_frame_cache'
+# Seconds a frame is shared with image processing after it was fetched
+FRAME_MAX_AGE = 1
 _RND = SystemRandom()
 
 CAMERA_SERVICE_SCHEMA = vol.Schema({
@@ -90,39 +93,97 @@ def async_snapshot(hass, filename, entity_id=None):
 
 @bind_hass
 @asyncio.coroutine
-def async_get_image(hass, entity_id, timeout=10):
-    """Fetch a image from a camera entity."""
-    websession = async_get_clientsession(hass)
-    state = hass.states.get(entity_id)
+def async_get_image(hass, entity_id, timeout=10, max_age=FRAME_MAX_AGE):
+    """Fetch a image from a camera entity.
+
+    Frames of up to max_age seconds old are shared between callers.
+    """
+    frame_cache = hass.data.get(DATA_FRAME_CACHE)
+    camera = None
+
+    if frame_cache is not None and hass.states.get(entity_id) is not None:
+        camera = frame_cache.entities.get(entity_id)
 
-    if state is None:
+    if camera is None:
         raise HomeAssistantError(
             "No entity '{0}' for grab a image".format(entity_id))
 
-    url = "{0}{1}".format(
-        hass.config.api.base_url,
-        state.attributes.get(ATTR_ENTITY_PICTURE)
-    )
-
     try:
         with async_timeout.timeout(timeout, loop=hass.loop):
-            response = yield from websession.get(url)
+            image = yield from frame_cache.async_get(camera, max_age)
+
+    except (asyncio.TimeoutError, aiohttp.ClientError):
+        raise HomeAssistantError(
+            "Can't get a image from {0}".format(entity_id))
 
-            if response.status != 200:
-                raise HomeAssistantError("Error {0} on {1}".format(
-                    response.status, url))
+    if not image:
+        raise HomeAssistantError("No image from {0}".format(entity_id))
 
-            image = yield from response.read()
-            return image
+    return image
 
-    except (asyncio.TimeoutError, aiohttp.ClientError):
-        raise HomeAssistantError("Can't connect to {0}".format(url))
+
+class CameraFrameCache(object):
+    """Share the frames of cameras between consumers.
+
+    Concurrent requests for a frame of the same camera wait for a single
+    fetch from the camera. The last frame of each camera is kept, so requests
+    that accept a frame of up to max_age seconds old can reuse it.
+    """
+
+    def __init__(self, hass, entities):
+        """Initialize the frame cache."""
+        self.hass = hass
+        self.entities = entities
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+        }
+        self._frames = {}
+        self._fetches = {}
+
+    @asyncio.coroutine
+    def async_get(self, camera, max_age=0):
+        """Return a frame of a camera."""
+        entity_id = camera.entity_id
+        frame = self._frames.get(entity_id)
+
+        if frame is not None and \
+                self.hass.loop.time() - frame[0] <= max_age:
+            self.stats['hits'] += 1
+            return frame[1]
+
+        fetch = self._fetches.get(entity_id)
+
+        if fetch is not None:
+            self.stats['coalesced'] += 1
+        else:
+            self.stats['misses'] += 1
+            fetch = self._fetches[entity_id] = asyncio.ensure_future(
+                camera.async_camera_image(), loop=self.hass.loop)
+            fetch.add_done_callback(
+                lambda fut: self._async_fetch_done(entity_id, fut))
+
+        # Don't cancel the fetch for other consumers on a timeout
+        return (yield from asyncio.shield(fetch, loop=self.hass.loop))
+
+    @callback
+    def _async_fetch_done(self, entity_id, fetch):
+        """Store the frame of a finished fetch."""
+        self._fetches.pop(entity_id, None)
+
+        if fetch.cancelled() or fetch.exception() is not None:
+            return
+
+        if fetch.result():
+            self._frames[entity_id] = (self.hass.loop.time(), fetch.result())
 
 
 @asyncio.coroutine
 def async_setup(hass, config):
     """Set up the camera component."""
     component = EntityComponent(_LOGGER, DOMAIN, hass, SCAN_INTERVAL)
+    hass.data[DATA_FRAME_CACHE] = CameraFrameCache(hass, component.entities)
 
     hass.http.register_view(CameraImageView(component.entities))
     hass.http.register_view(CameraMjpegStream(component.entities))
@@ -175,7 +236,7 @@ def async_setup(hass, config):
                     "Can't write %s, no access to path!", snapshot_file)
                 continue
 
-            image = yield from camera.async_camera_image()
+            image = yield from hass.data[DATA_FRAME_CACHE].async_get(camera)
 
             def _write_image(to_file, image_data):
                 """Executor helper to write image."""
@@ -277,7 +338,8 @@ class Camera(Entity):
 
         try:
             while True:
-                img_bytes = yield from self.async_camera_image()
+                img_bytes = yield from \
+                    self.hass.data[DATA_FRAME_CACHE].async_get(self)
                 if not img_bytes:
                     break
 
@@ -397,7 +459,8 @@ class CameraImageView(CameraView):
         """Serve camera image."""
         with suppress(asyncio.CancelledError, asyncio.TimeoutError):
             with async_timeout.timeout(10, loop=request.app['hass'].loop):
-                image = yield from camera.async_camera_image()
+                image = yield from request.app['hass'].data[
+                    DATA_FRAME_CACHE].async_get(camera)
 
             if image:
                 return web.Response(body=image,
@@ -8,10 +8,13 @@ import logging
 import voluptuous as vol
 
 from homeassistant.const import (CONF_HOST, CONF_PORT, CONF_PREFIX,
-                                 EVENT_LOGBOOK_ENTRY, EVENT_STATE_CHANGED,
-                                 STATE_UNKNOWN)
+                                 EVENT_LOGBOOK_ENTRY, STATE_UNKNOWN)
 from homeassistant.helpers import state as state_helper
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entityfilter import (
+    FILTER_SCHEMA, generate_filter)
+from homeassistant.helpers.export import (
+    CONF_FILTER, EXPORT_SCHEMA, ExportPipeline)
 
 REQUIREMENTS = ['datadog==0.15.0']
 
@@ -31,7 +34,10 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PREFIX, default=DEFAULT_PREFIX): cv.string,
         vol.Optional(CONF_RATE, default=DEFAULT_RATE):
             vol.All(vol.Coerce(int), vol.Range(min=1)),
-    }),
+        vol.Optional(
+            CONF_FILTER, default=lambda: generate_filter([], [], [], [])
+        ): FILTER_SCHEMA,
+    }).extend(EXPORT_SCHEMA),
 }, extra=vol.ALLOW_EXTRA)
 
 
@@ -63,11 +69,11 @@ def setup(hass, config):
 
         _LOGGER.debug('Sent event %s', event.data.get('entity_id'))
 
-    def state_changed_listener(event):
-        """Listen for new messages on the bus and sends them to Datadog."""
-        state = event.data.get('new_state')
+    def state_metrics(event):
+        """Return the metrics of a state change."""
+        state = event.data['new_state']
 
-        if state is None or state.state == STATE_UNKNOWN:
+        if state.state == STATE_UNKNOWN:
             return
 
         if state.attributes.get('hidden') is True:
@@ -76,23 +82,12 @@ def setup(hass, config):
         states = dict(state.attributes)
         metric = "{}.{}".format(prefix, state.domain)
         tags = ["entity:{}".format(state.entity_id)]
+        metrics = []
 
         for key, value in states.items():
             if isinstance(value, (float, int)):
                 attribute = "{}.{}".format(metric, key.replace(' ', '_'))
-                statsd.gauge(
-                    attribute,
-                    value,
-                    sample_rate=sample_rate,
-                    tags=tags
-                )
-
-                _LOGGER.debug(
-                    'Sent metric %s: %s (tags: %s)',
-                    attribute,
-                    value,
-                    tags
-                )
+                metrics.append((attribute, value, tags))
 
         try:
             value = state_helper.state_as_number(state)
@@ -103,18 +98,33 @@ def setup(hass, config):
                 state.state,
                 tags
             )
-            return
+        else:
+            metrics.append((metric, value, tags))
 
-        statsd.gauge(
-            metric,
-            value,
-            sample_rate=sample_rate,
-            tags=tags
-        )
+        return metrics or None
 
-        _LOGGER.debug('Sent metric %s: %s (tags: %s)', metric, value, tags)
+    def send_metrics(batch):
+        """Send the metrics of a batch of state changes to Datadog."""
+        statsd.open_buffer()
+        try:
+            for metrics in batch:
+                for metric, value, tags in metrics:
+                    statsd.gauge(
+                        metric,
+                        value,
+                        sample_rate=sample_rate,
+                        tags=tags
+                    )
+
+                    _LOGGER.debug(
+                        'Sent metric %s: %s (tags: %s)', metric, value, tags)
+        finally:
+            statsd.close_buffer()
 
     hass.bus.listen(EVENT_LOGBOOK_ENTRY, logbook_entry_listener)
-    hass.bus.listen(EVENT_STATE_CHANGED, state_changed_listener)
+
+    pipeline = hass.data[DOMAIN] = ExportPipeline(
+        hass, DOMAIN, state_metrics, send_metrics, conf[CONF_FILTER], conf)
+    pipeline.start()
 
     return True
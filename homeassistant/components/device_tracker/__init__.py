@@ -6,7 +6,9 @@ https://home-assistant.io/components/device_tracker/
 """
 import asyncio
 from datetime import timedelta
+import heapq
 import logging
+import os
 from typing import Any, List, Sequence, Callable
 
 import aiohttp
@@ -30,13 +32,14 @@ from homeassistant.loader import get_component
 import homeassistant.util as util
 from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.util.dt as dt_util
+from homeassistant.util.json import load_json, save_json
 from homeassistant.util.yaml import dump
 
 from homeassistant.helpers.event import async_track_utc_time_change
 from homeassistant.const import (
     ATTR_GPS_ACCURACY, ATTR_LATITUDE, ATTR_LONGITUDE, CONF_NAME, CONF_MAC,
     DEVICE_DEFAULT_NAME, STATE_HOME, STATE_NOT_HOME, ATTR_ENTITY_ID,
-    CONF_ICON, ATTR_ICON)
+    CONF_ICON, ATTR_ICON, EVENT_HOMEASSISTANT_STOP)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,6 +52,7 @@ ENTITY_ID_ALL_DEVICES = group.ENTITY_ID_FORMAT.format('all_devices')
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
 
 YAML_DEVICES = 'known_devices.yaml'
+JSON_DEVICES = '.known_devices.json'
 
 CONF_TRACK_NEW = 'track_new_devices'
 DEFAULT_TRACK_NEW = True
@@ -63,6 +67,16 @@ DEFAULT_SCAN_INTERVAL = timedelta(seconds=12)
 CONF_AWAY_HIDE = 'hide_if_away'
 DEFAULT_AWAY_HIDE = False
 
+CONF_DEVICE_STORE = 'device_store'
+STORE_YAML = 'yaml'
+STORE_JSON = 'json'
+
+CONF_EVICT_AFTER = 'evict_after'
+
+STORE_VERSION = 1
+STORE_SAVE_DELAY = 10
+STORE_SEEN_SAVE_DELAY = 3600
+
 EVENT_NEW_DEVICE = 'device_tracker_new_device'
 
 SERVICE_SEE = 'see'
@@ -94,7 +108,10 @@ PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend({
                  default=DEFAULT_CONSIDER_HOME): vol.All(
                      cv.time_period, cv.positive_timedelta),
     vol.Optional(CONF_NEW_DEVICE_DEFAULTS,
-                 default={}): NEW_DEVICE_DEFAULTS_SCHEMA
+                 default={}): NEW_DEVICE_DEFAULTS_SCHEMA,
+    vol.Optional(CONF_DEVICE_STORE): vol.In([STORE_YAML, STORE_JSON]),
+    vol.Optional(CONF_EVICT_AFTER): vol.All(
+        cv.time_period, cv.positive_timedelta),
 })
 
 
@@ -138,9 +155,18 @@ def async_setup(hass: HomeAssistantType, config: ConfigType):
     if track_new is None:
         track_new = defaults.get(CONF_TRACK_NEW, DEFAULT_TRACK_NEW)
 
-    devices = yield from async_load_config(yaml_path, hass, consider_home)
+    if conf.get(CONF_DEVICE_STORE) == STORE_JSON:
+        store = DeviceStore(
+            hass, hass.config.path(JSON_DEVICES), yaml_path, consider_home,
+            conf.get(CONF_EVICT_AFTER))
+        yield from store.async_load()
+        devices = store.async_tracked_devices()
+    else:
+        store = None
+        devices = yield from async_load_config(yaml_path, hass, consider_home)
+
     tracker = DeviceTracker(
-        hass, consider_home, track_new, defaults, devices)
+        hass, consider_home, track_new, defaults, devices, store)
 
     @asyncio.coroutine
     def async_setup_platform(p_type, p_config, disc_info=None):
@@ -172,7 +198,7 @@ def async_setup(hass: HomeAssistantType, config: ConfigType):
 
             if scanner:
                 async_setup_scanner_platform(
-                    hass, p_config, scanner, tracker.async_see, p_type)
+                    hass, p_config, scanner, tracker.async_see_many, p_type)
                 return
 
             if not setup:
@@ -220,9 +246,10 @@ class DeviceTracker(object):
 
     def __init__(self, hass: HomeAssistantType, consider_home: timedelta,
                  track_new: bool, defaults: dict,
-                 devices: Sequence) -> None:
+                 devices: Sequence, store=None) -> None:
         """Initialize a device tracker."""
         self.hass = hass
+        self.store = store
         self.devices = {dev.dev_id: dev for dev in devices}
         self.mac_to_dev = {dev.mac: dev for dev in devices if dev.mac}
         self.consider_home = consider_home
@@ -231,6 +258,9 @@ class DeviceTracker(object):
         self.defaults = defaults
         self.group = None
         self._is_updating = asyncio.Lock(loop=hass.loop)
+        # Heap of (stale time, device id) of the tracked devices
+        self._stale_heap = []
+        self._stale_pending = set()
 
         for dev in devices:
             if self.devices[dev.dev_id] is not dev:
@@ -261,6 +291,116 @@ class DeviceTracker(object):
 
         This method is a coroutine.
         """
+        device, new = self._async_get_device(
+            mac, dev_id, host_name, picture, icon)
+
+        yield from device.async_seen(
+            host_name, location_name, gps, gps_accuracy, battery, attributes,
+            source_type)
+
+        if self.store is not None:
+            self.store.async_seen(device)
+
+        self._async_track_stale(device)
+
+        if device.track:
+            yield from device.async_update_ha_state()
+
+        if not new:
+            return
+
+        # During init, we ignore the group
+        if self.group and self.track_new:
+            self.group.async_set_group(
+                self.hass, util.slugify(GROUP_NAME_ALL_DEVICES), visible=False,
+                name=GROUP_NAME_ALL_DEVICES, add=[device.entity_id])
+
+        # lookup mac vendor string to be stored in config
+        yield from device.set_vendor_for_mac()
+
+        self._async_fire_new_device(device)
+
+        # update known_devices.yaml
+        self.hass.async_add_job(
+            self.async_update_config(
+                self.hass.config.path(YAML_DEVICES), device.dev_id, device)
+        )
+
+    @asyncio.coroutine
+    def async_see_many(self, seen: Sequence[dict]):
+        """Notify the device tracker that you see a batch of devices.
+
+        Every item holds the keyword arguments of async_see. The group of
+        all devices and known_devices.yaml are updated once for the new
+        devices of the batch, and the state of a known device is only
+        written when it changed.
+
+        This method is a coroutine.
+        """
+        new_devices = []
+        known_ids = set(self.devices)
+        if self.store is not None:
+            known_ids.update(self.store.entries)
+
+        for kwargs in seen:
+            try:
+                device, new = self._async_get_device(
+                    kwargs.get(ATTR_MAC), kwargs.get(ATTR_DEV_ID),
+                    kwargs.get(ATTR_HOST_NAME), kwargs.get('picture'),
+                    kwargs.get(ATTR_ICON), known_ids)
+            except HomeAssistantError as err:
+                _LOGGER.error("Unable to see device %s: %s", kwargs, err)
+                continue
+
+            previous = None if new else device.state_signature
+
+            yield from device.async_seen(
+                kwargs.get(ATTR_HOST_NAME), kwargs.get(ATTR_LOCATION_NAME),
+                kwargs.get(ATTR_GPS), kwargs.get(ATTR_GPS_ACCURACY),
+                kwargs.get(ATTR_BATTERY), kwargs.get(ATTR_ATTRIBUTES),
+                kwargs.get(ATTR_SOURCE_TYPE, SOURCE_TYPE_GPS))
+
+            if self.store is not None:
+                self.store.async_seen(device)
+
+            self._async_track_stale(device)
+
+            if new:
+                new_devices.append(device)
+
+            if device.track and (
+                    previous != device.state_signature or
+                    self.hass.states.get(device.entity_id) is None):
+                yield from device.async_update_ha_state()
+
+        if not new_devices:
+            return
+
+        if self.group and self.track_new:
+            self.group.async_set_group(
+                self.hass, util.slugify(GROUP_NAME_ALL_DEVICES), visible=False,
+                name=GROUP_NAME_ALL_DEVICES,
+                add=[device.entity_id for device in new_devices])
+
+        # api.macvendors.com is rate limited, so look up one at a time
+        for device in new_devices:
+            yield from device.set_vendor_for_mac()
+
+        for device in new_devices:
+            self._async_fire_new_device(device)
+
+        self.hass.async_add_job(
+            self.async_update_config_devices(
+                self.hass.config.path(YAML_DEVICES), new_devices))
+
+    @callback
+    def _async_get_device(self, mac, dev_id, host_name, picture, icon,
+                          known_ids=None):
+        """Return the device and if it is new, creating it if not found.
+
+        known_ids is a set of the device ids in use that is kept up to date
+        by the caller, so a batch of new devices does not rebuild it.
+        """
         if mac is None and dev_id is None:
             raise HomeAssistantError('Neither mac or device id passed in')
         elif mac is not None:
@@ -272,16 +412,26 @@ class DeviceTracker(object):
             dev_id = cv.slug(str(dev_id).lower())
             device = self.devices.get(dev_id)
 
+        if not device and self.store is not None:
+            device = self.store.async_get_device(
+                dev_id=dev_id if mac is None else None, mac=mac)
+            if device:
+                self.devices[device.dev_id] = device
+                if device.mac:
+                    self.mac_to_dev[device.mac] = device
+
         if device:
-            yield from device.async_seen(
-                host_name, location_name, gps, gps_accuracy, battery,
-                attributes, source_type)
-            if device.track:
-                yield from device.async_update_ha_state()
-            return
+            return device, False
 
         # If no device can be found, create it
-        dev_id = util.ensure_unique_string(dev_id, self.devices.keys())
+        if known_ids is not None:
+            dev_id = util.ensure_unique_string(dev_id, known_ids)
+            known_ids.add(dev_id)
+        elif self.store is not None:
+            dev_id = util.ensure_unique_string(
+                dev_id, set(self.devices).union(self.store.entries))
+        else:
+            dev_id = util.ensure_unique_string(dev_id, self.devices.keys())
         device = Device(
             self.hass, self.consider_home, self.track_new,
             dev_id, mac, (host_name or dev_id).replace('_', ' '),
@@ -291,22 +441,11 @@ class DeviceTracker(object):
         if mac is not None:
             self.mac_to_dev[mac] = device
 
-        yield from device.async_seen(
-            host_name, location_name, gps, gps_accuracy, battery, attributes,
-            source_type)
-
-        if device.track:
-            yield from device.async_update_ha_state()
-
-        # During init, we ignore the group
-        if self.group and self.track_new:
-            self.group.async_set_group(
-                self.hass, util.slugify(GROUP_NAME_ALL_DEVICES), visible=False,
-                name=GROUP_NAME_ALL_DEVICES, add=[device.entity_id])
-
-        # lookup mac vendor string to be stored in config
-        yield from device.set_vendor_for_mac()
+        return device, True
 
+    @callback
+    def _async_fire_new_device(self, device):
+        """Fire the event for a new device."""
         self.hass.bus.async_fire(EVENT_NEW_DEVICE, {
             ATTR_ENTITY_ID: device.entity_id,
             ATTR_HOST_NAME: device.host_name,
@@ -314,23 +453,35 @@ class DeviceTracker(object):
             ATTR_VENDOR: device.vendor,
         })
 
-        # update known_devices.yaml
-        self.hass.async_add_job(
-            self.async_update_config(
-                self.hass.config.path(YAML_DEVICES), dev_id, device)
-        )
-
     @asyncio.coroutine
     def async_update_config(self, path, dev_id, device):
         """Add device to YAML configuration file.
 
         This method is a coroutine.
         """
+        if self.store is not None:
+            self.store.async_add_devices([device])
+            return
+
         with (yield from self._is_updating):
             yield from self.hass.async_add_job(
                 update_config, self.hass.config.path(YAML_DEVICES),
                 dev_id, device)
 
+    @asyncio.coroutine
+    def async_update_config_devices(self, path, devices):
+        """Add devices to YAML configuration file in one write.
+
+        This method is a coroutine.
+        """
+        if self.store is not None:
+            self.store.async_add_devices(devices)
+            return
+
+        with (yield from self._is_updating):
+            yield from self.hass.async_add_job(
+                update_config_devices, path, devices)
+
     @callback
     def async_setup_group(self):
         """Initialize group for all tracked devices.
@@ -345,15 +496,41 @@ class DeviceTracker(object):
             self.hass, util.slugify(GROUP_NAME_ALL_DEVICES), visible=False,
             name=GROUP_NAME_ALL_DEVICES, entity_ids=entity_ids)
 
+    @callback
+    def _async_track_stale(self, device):
+        """Track when a device that was seen becomes stale."""
+        if device.track and device.last_seen and \
+                device.dev_id not in self._stale_pending:
+            self._stale_pending.add(device.dev_id)
+            heapq.heappush(self._stale_heap, (
+                device.last_seen + device.consider_home, device.dev_id))
+
     @callback
     def async_update_stale(self, now: dt_util.dt.datetime):
         """Update stale devices.
 
+        Only the devices at the top of the stale heap are looked at. A
+        device that was seen again since it was pushed is pushed again with
+        its new stale time.
+
         This method must be run in the event loop.
         """
-        for device in self.devices.values():
-            if (device.track and device.last_update_home) and \
-               device.stale(now):
+        heap = self._stale_heap
+
+        while heap and heap[0][0] < now:
+            _, dev_id = heapq.heappop(heap)
+            device = self.devices.get(dev_id)
+
+            if device is not None and device.track and device.last_seen:
+                stale_at = device.last_seen + device.consider_home
+                if stale_at >= now:
+                    heapq.heappush(heap, (stale_at, dev_id))
+                    continue
+
+            self._stale_pending.discard(dev_id)
+
+            if device is not None and device.track and \
+                    device.last_update_home:
                 self.hass.async_add_job(device.async_update_ha_state(True))
 
     @asyncio.coroutine
@@ -504,6 +681,15 @@ class Device(Entity):
         # pylint: disable=not-an-iterable
         yield from self.async_update()
 
+    @property
+    def state_signature(self):
+        """Return the values the state written for the device depends on.
+
+        Async friendly.
+        """
+        return (self._state, self.name, self.gps, self.gps_accuracy,
+                self.battery, self.source_type, dict(self._attributes))
+
     def stale(self, now: dt_util.dt.datetime=None):
         """Return if device state is stale.
 
@@ -605,6 +791,231 @@ class Device(Entity):
                         state.attributes[ATTR_LONGITUDE])
 
 
+class DeviceStore(object):
+    """Store the known devices in a JSON file.
+
+    The devices of known_devices.yaml are imported whenever that file
+    changed since the last import. Entries are only validated and turned
+    into devices when they are tracked or seen again. Devices that are not
+    tracked are evicted when they were not seen for evict_after.
+
+    Changed devices are saved after STORE_SAVE_DELAY seconds. Sightings
+    only update the time a device was last seen, which eviction does not
+    need to be exact, so they are saved after STORE_SEEN_SAVE_DELAY seconds
+    or when Home Assistant stops.
+    """
+
+    def __init__(self, hass: HomeAssistantType, path: str, yaml_path: str,
+                 consider_home: timedelta,
+                 evict_after: timedelta=None) -> None:
+        """Initialize the device store."""
+        self.hass = hass
+        self.path = path
+        self.yaml_path = yaml_path
+        self.consider_home = consider_home
+        self.evict_after = evict_after
+        self.entries = {}
+        self.mac_to_id = {}
+        self._schema = device_schema(consider_home)
+        self._yaml_mtime = None
+        self._save_handle = None
+        self._save_time = None
+
+    @asyncio.coroutine
+    def async_load(self):
+        """Load the store and import known_devices.yaml if it changed.
+
+        This method is a coroutine.
+        """
+        data, yaml_mtime = yield from self.hass.async_add_job(self._load)
+        self.entries = data.get('devices', {})
+        self._yaml_mtime = data.get('yaml_mtime')
+        changed = False
+
+        if yaml_mtime is not None and yaml_mtime != self._yaml_mtime:
+            devices = yield from async_load_config(
+                self.yaml_path, self.hass, self.consider_home)
+            _LOGGER.info("Importing %d devices from %s", len(devices),
+                         self.yaml_path)
+            for device in devices:
+                entry = self.entries.get(device.dev_id, {})
+                self.entries[device.dev_id] = _store_entry(
+                    device, entry.get('last_seen'))
+            self._yaml_mtime = yaml_mtime
+            changed = True
+
+        self.mac_to_id = {entry[CONF_MAC]: dev_id
+                          for dev_id, entry in self.entries.items()
+                          if entry.get(CONF_MAC)}
+
+        if self._async_evict() or changed:
+            self.async_schedule_save()
+
+        self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    def _load(self):
+        """Load the store and get the modification time of the YAML file."""
+        try:
+            data = load_json(self.path)
+        except HomeAssistantError:
+            data = {}
+
+        if data and data.get('version') != STORE_VERSION:
+            _LOGGER.warning("Ignoring %s with unknown version", self.path)
+            data = {}
+
+        try:
+            yaml_mtime = os.path.getmtime(self.yaml_path)
+        except OSError:
+            yaml_mtime = None
+
+        return data, yaml_mtime
+
+    @callback
+    def async_tracked_devices(self):
+        """Return the devices that are tracked."""
+        devices = (self._async_create_device(dev_id, entry)
+                   for dev_id, entry in self.entries.items()
+                   if entry.get('track'))
+        return [device for device in devices if device is not None]
+
+    @callback
+    def async_get_device(self, dev_id: str=None, mac: str=None):
+        """Return the device with a device id or MAC address, or None."""
+        if dev_id is None:
+            dev_id = self.mac_to_id.get(mac)
+
+        entry = self.entries.get(dev_id)
+        if entry is None:
+            return None
+
+        return self._async_create_device(dev_id, entry)
+
+    @callback
+    def _async_create_device(self, dev_id, entry):
+        """Validate an entry and create its device."""
+        config = dict(entry)
+        config.pop('last_seen', None)
+
+        try:
+            config = self._schema(config)
+        except vol.Invalid as err:
+            _LOGGER.error("Invalid device %s in %s: %s", dev_id, self.path,
+                          err)
+            return None
+
+        return Device(self.hass, dev_id=dev_id, **config)
+
+    @callback
+    def async_add_devices(self, devices: Sequence[Device]):
+        """Add or update devices."""
+        for device in devices:
+            self.entries[device.dev_id] = _store_entry(device)
+            if device.mac:
+                self.mac_to_id[device.mac] = device.dev_id
+
+        self.async_schedule_save()
+
+    @callback
+    def async_seen(self, device: Device):
+        """Record that a device was seen."""
+        entry = self.entries.get(device.dev_id)
+        if entry is None:
+            self.async_add_devices([device])
+            return
+
+        entry['last_seen'] = device.last_seen.timestamp()
+        self.async_schedule_save(STORE_SEEN_SAVE_DELAY)
+
+    @callback
+    def _async_evict(self):
+        """Remove the untracked devices that were not seen for a while."""
+        if self.evict_after is None:
+            return False
+
+        cutoff = (dt_util.utcnow() - self.evict_after).timestamp()
+        evicted = [dev_id for dev_id, entry in self.entries.items()
+                   if not entry.get('track') and
+                   (entry.get('last_seen') or 0) < cutoff]
+
+        for dev_id in evicted:
+            entry = self.entries.pop(dev_id)
+            self.mac_to_id.pop(entry.get(CONF_MAC), None)
+
+        if evicted:
+            _LOGGER.info("Evicted %d devices not seen since %s",
+                         len(evicted), self.evict_after)
+
+        return bool(evicted)
+
+    @callback
+    def async_schedule_save(self, delay=STORE_SAVE_DELAY):
+        """Save the store after a delay, collecting changes until then."""
+        save_time = self.hass.loop.time() + delay
+
+        if self._save_handle is not None:
+            if self._save_time <= save_time:
+                return
+            self._save_handle.cancel()
+
+        self._save_handle = self.hass.loop.call_at(
+            save_time, self._async_save)
+        self._save_time = save_time
+
+    @callback
+    def _async_save(self):
+        """Save the store in the executor."""
+        if self._save_handle is not None:
+            self._save_handle.cancel()
+            self._save_handle = None
+            self._save_time = None
+
+        self._async_evict()
+
+        return self.hass.async_add_job(self._save, {
+            'version': STORE_VERSION,
+            'yaml_mtime': self._yaml_mtime,
+            'devices': {dev_id: dict(entry)
+                        for dev_id, entry in self.entries.items()},
+        })
+
+    def _save(self, data):
+        """Write the store to a temporary file that replaces the store."""
+        tmp_path = '{}.tmp'.format(self.path)
+        try:
+            save_json(tmp_path, data)
+            os.replace(tmp_path, self.path)
+        except (HomeAssistantError, OSError) as err:
+            _LOGGER.error("Unable to save %s: %s", self.path, err)
+
+    @asyncio.coroutine
+    def _async_stop(self, event):
+        """Save pending changes when Home Assistant stops."""
+        if self._save_handle is not None:
+            yield from self._async_save()
+
+
+def _store_entry(device: Device, last_seen: float=None):
+    """Return the store entry of a device."""
+    if device.last_seen is not None:
+        last_seen = device.last_seen.timestamp()
+    elif last_seen is None:
+        last_seen = dt_util.utcnow().timestamp()
+
+    return {
+        CONF_NAME: device.name,
+        CONF_MAC: device.mac,
+        CONF_ICON: device.icon or None,
+        'picture': device.config_picture,
+        'track': device.track,
+        CONF_AWAY_HIDE: device.away_hide,
+        CONF_CONSIDER_HOME: device.consider_home.total_seconds(),
+        'vendor': device.vendor,
+        'last_seen': last_seen,
+    }
+
+
 class DeviceScanner(object):
     """Device scanner object."""
 
@@ -633,20 +1044,9 @@ class DeviceScanner(object):
         return self.hass.async_add_job(self.get_device_name, mac)
 
 
-def load_config(path: str, hass: HomeAssistantType, consider_home: timedelta):
-    """Load devices from YAML configuration file."""
-    return run_coroutine_threadsafe(
-        async_load_config(path, hass, consider_home), hass.loop).result()
-
-
-@asyncio.coroutine
-def async_load_config(path: str, hass: HomeAssistantType,
-                      consider_home: timedelta):
-    """Load devices from YAML configuration file.
-
-    This method is a coroutine.
-    """
-    dev_schema = vol.Schema({
+def device_schema(consider_home: timedelta):
+    """Return the schema of a known device."""
+    return vol.Schema({
         vol.Required(CONF_NAME): cv.string,
         vol.Optional(CONF_ICON, default=False):
             vol.Any(None, cv.icon),
@@ -660,6 +1060,22 @@ def async_load_config(path: str, hass: HomeAssistantType,
             cv.time_period, cv.positive_timedelta),
         vol.Optional('vendor', default=None): vol.Any(None, cv.string),
     })
+
+
+def load_config(path: str, hass: HomeAssistantType, consider_home: timedelta):
+    """Load devices from YAML configuration file."""
+    return run_coroutine_threadsafe(
+        async_load_config(path, hass, consider_home), hass.loop).result()
+
+
+@asyncio.coroutine
+def async_load_config(path: str, hass: HomeAssistantType,
+                      consider_home: timedelta):
+    """Load devices from YAML configuration file.
+
+    This method is a coroutine.
+    """
+    dev_schema = device_schema(consider_home)
     try:
         result = []
         try:
@@ -685,10 +1101,12 @@ def async_load_config(path: str, hass: HomeAssistantType,
 
 @callback
 def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
-                                 scanner: Any, async_see_device: Callable,
+                                 scanner: Any, async_see_devices: Callable,
                                  platform: str):
     """Set up the connect scanner-based platform to device tracker.
 
+    The devices found by a scan are passed to async_see_devices at once.
+
     This method must be run in the event loop.
     """
     interval = config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
@@ -710,6 +1128,9 @@ def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
         with (yield from update_lock):
             found_devices = yield from scanner.async_scan_devices()
 
+        zone_home = hass.states.get(zone.ENTITY_ID_HOME)
+        seen_devices = []
+
         for mac in found_devices:
             if mac in seen:
                 host_name = None
@@ -723,13 +1144,15 @@ def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
                 'source_type': SOURCE_TYPE_ROUTER
             }
 
-            zone_home = hass.states.get(zone.ENTITY_ID_HOME)
             if zone_home:
                 kwargs['gps'] = [zone_home.attributes[ATTR_LATITUDE],
                                  zone_home.attributes[ATTR_LONGITUDE]]
                 kwargs['gps_accuracy'] = 0
 
-            hass.async_add_job(async_see_device(**kwargs))
+            seen_devices.append(kwargs)
+
+        if seen_devices:
+            hass.async_add_job(async_see_devices(seen_devices))
 
     async_track_time_interval(hass, async_device_tracker_scan, interval)
     hass.async_add_job(async_device_tracker_scan(None))
@@ -737,18 +1160,24 @@ def async_setup_scanner_platform(hass: HomeAssistantType, config: ConfigType,
 
 def update_config(path: str, dev_id: str, device: Device):
     """Add device to YAML configuration file."""
+    update_config_devices(path, [device])
+
+
+def update_config_devices(path: str, devices: Sequence[Device]):
+    """Add devices to YAML configuration file."""
     with open(path, 'a') as out:
-        device = {device.dev_id: {
-            ATTR_NAME: device.name,
-            ATTR_MAC: device.mac,
-            ATTR_ICON: device.icon,
-            'picture': device.config_picture,
-            'track': device.track,
-            CONF_AWAY_HIDE: device.away_hide,
-            'vendor': device.vendor,
-        }}
-        out.write('\n')
-        out.write(dump(device))
+        for device in devices:
+            device = {device.dev_id: {
+                ATTR_NAME: device.name,
+                ATTR_MAC: device.mac,
+                ATTR_ICON: device.icon,
+                'picture': device.config_picture,
+                'track': device.track,
+                CONF_AWAY_HIDE: device.away_hide,
+                'vendor': device.vendor,
+            }}
+            out.write('\n')
+            out.write(dump(device))
 
 
 def get_gravatar_for_email(email: str):
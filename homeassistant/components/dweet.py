@@ -5,15 +5,13 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/dweet/
 """
 import logging
-from datetime import timedelta
 
 import voluptuous as vol
 
-from homeassistant.const import (
-    CONF_NAME, CONF_WHITELIST, EVENT_STATE_CHANGED, STATE_UNKNOWN)
+from homeassistant.const import CONF_NAME, CONF_WHITELIST, STATE_UNKNOWN
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import state as state_helper
-from homeassistant.util import Throttle
+from homeassistant.helpers.export import CONF_BATCH_TIMEOUT, ExportPipeline
 
 REQUIREMENTS = ['dweepy==0.3.0']
 
@@ -21,7 +19,8 @@ _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = 'dweet'
 
-MIN_TIME_BETWEEN_UPDATES = timedelta(seconds=1)
+# Dweet.io allows about one dweet per second.
+MIN_TIME_BETWEEN_UPDATES = 1
 
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
@@ -36,14 +35,13 @@ def setup(hass, config):
     """Set up the Dweet.io component."""
     conf = config[DOMAIN]
     name = conf.get(CONF_NAME)
-    whitelist = conf.get(CONF_WHITELIST)
+    whitelist = set(conf.get(CONF_WHITELIST))
     json_body = {}
 
-    def dweet_event_listener(event):
-        """Listen for new messages on the bus and sends them to Dweet.io."""
-        state = event.data.get('new_state')
-        if state is None or state.state in (STATE_UNKNOWN, '') \
-                or state.entity_id not in whitelist:
+    def dweet_value(event):
+        """Return the friendly name and value of a state change."""
+        state = event.data['new_state']
+        if state.state in (STATE_UNKNOWN, ''):
             return
 
         try:
@@ -51,20 +49,23 @@ def setup(hass, config):
         except ValueError:
             _state = state.state
 
-        json_body[state.attributes.get('friendly_name')] = _state
+        return (state.attributes.get('friendly_name'), _state)
 
-        send_data(name, json_body)
+    def send_values(values):
+        """Send the collected data to Dweet.io."""
+        json_body.update(values)
+        send_data(name, dict(json_body))
 
-    hass.bus.listen(EVENT_STATE_CHANGED, dweet_event_listener)
+    pipeline = hass.data[DOMAIN] = ExportPipeline(
+        hass, DOMAIN, dweet_value, send_values,
+        lambda entity_id: entity_id in whitelist,
+        {CONF_BATCH_TIMEOUT: MIN_TIME_BETWEEN_UPDATES})
+    pipeline.start()
 
     return True
 
 
-@Throttle(MIN_TIME_BETWEEN_UPDATES)
 def send_data(name, msg):
     """Send the collected data to Dweet.io."""
     import dweepy
-    try:
-        dweepy.dweet_for(name, msg)
-    except dweepy.DweepyError:
-        _LOGGER.error("Error saving data to Dweet.io: %s", msg)
+    dweepy.dweet_for(name, msg)
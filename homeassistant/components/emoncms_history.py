@@ -4,10 +4,12 @@ A component which allows you to send data to Emoncms.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/emoncms_history/
 """
+import asyncio
 import logging
 from datetime import timedelta
 
-import requests
+import aiohttp
+import async_timeout
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
@@ -15,14 +17,16 @@ from homeassistant.const import (
     CONF_API_KEY, CONF_WHITELIST, CONF_URL, STATE_UNKNOWN, STATE_UNAVAILABLE,
     CONF_SCAN_INTERVAL)
 from homeassistant.helpers import state as state_helper
-from homeassistant.helpers.event import track_point_in_time
-from homeassistant.util import dt as dt_util
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_track_time_interval
 
 _LOGGER = logging.getLogger(__name__)
 
 DOMAIN = 'emoncms_history'
 CONF_INPUTNODE = 'inputnode'
 
+TIMEOUT = 5
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Required(CONF_API_KEY): cv.string,
@@ -34,31 +38,36 @@ CONFIG_SCHEMA = vol.Schema({
 }, extra=vol.ALLOW_EXTRA)
 
 
-def setup(hass, config):
+@asyncio.coroutine
+def async_setup(hass, config):
     """Set up the Emoncms history component."""
     conf = config[DOMAIN]
     whitelist = conf.get(CONF_WHITELIST)
 
-    def send_data(url, apikey, node, payload):
+    @asyncio.coroutine
+    def async_send_data(url, apikey, node, payload):
         """Send payload data to Emoncms."""
+        fullurl = '{}/input/post.json'.format(url)
+        data = {"apikey": apikey, "data": payload}
+        parameters = {"node": node}
+        session = async_get_clientsession(hass)
         try:
-            fullurl = '{}/input/post.json'.format(url)
-            data = {"apikey": apikey, "data": payload}
-            parameters = {"node": node}
-            req = requests.post(
-                fullurl, params=parameters, data=data, allow_redirects=True,
-                timeout=5)
-
-        except requests.exceptions.RequestException:
+            with async_timeout.timeout(TIMEOUT, loop=hass.loop):
+                req = yield from session.post(
+                    fullurl, params=parameters, data=data)
+                yield from req.release()
+
+        except (asyncio.TimeoutError, aiohttp.ClientError):
             _LOGGER.error("Error saving data '%s' to '%s'", payload, fullurl)
 
         else:
-            if req.status_code != 200:
+            if req.status != 200:
                 _LOGGER.error(
                     "Error saving data %s to %s (http status code = %d)",
-                    payload, fullurl, req.status_code)
+                    payload, fullurl, req.status)
 
-    def update_emoncms(time):
+    @asyncio.coroutine
+    def async_update_emoncms(time):
         """Send whitelisted entities states reguarly to Emoncms."""
         payload_dict = {}
 
@@ -79,11 +88,12 @@ def setup(hass, config):
                                         for key, val in
                                         payload_dict.items())
 
-            send_data(conf.get(CONF_URL), conf.get(CONF_API_KEY),
-                      str(conf.get(CONF_INPUTNODE)), payload)
-
-        track_point_in_time(hass, update_emoncms, time +
-                            timedelta(seconds=conf.get(CONF_SCAN_INTERVAL)))
+            yield from async_send_data(
+                conf.get(CONF_URL), conf.get(CONF_API_KEY),
+                str(conf.get(CONF_INPUTNODE)), payload)
 
-    update_emoncms(dt_util.utcnow())
+    async_track_time_interval(
+        hass, async_update_emoncms,
+        timedelta(seconds=conf.get(CONF_SCAN_INTERVAL)))
+    hass.async_add_job(async_update_emoncms(None))
     return True
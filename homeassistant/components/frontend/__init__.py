@@ -11,13 +11,14 @@ import logging
 import os
 from urllib.parse import urlparse
 
-from aiohttp import web
+from aiohttp import hdrs, web
 import voluptuous as vol
 import jinja2
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.components.http import HomeAssistantView
 from homeassistant.components.http.auth import is_trusted_ip
+from homeassistant.components.http.static import etag_matches
 from homeassistant.config import find_config_file, load_yaml_config_file
 from homeassistant.const import CONF_NAME, EVENT_THEMES_UPDATED
 from homeassistant.core import callback
@@ -67,6 +68,7 @@ DATA_EXTRA_HTML_URL = 'frontend_extra_html_url'
 DATA_EXTRA_HTML_URL_ES5 = 'frontend_extra_html_url_es5'
 DATA_THEMES = 'frontend_themes'
 DATA_DEFAULT_THEME = 'frontend_default_theme'
+DATA_INDEX_CACHE = 'frontend_index_cache'
 DEFAULT_THEME = 'default'
 
 PRIMARY_COLOR = 'primary-color'
@@ -131,6 +133,7 @@ class AbstractPanel:
             yield from hass.data[DATA_FINALIZE_PANEL](self)
 
         panels[self.frontend_url_path] = self
+        async_clear_index_cache(hass)
 
     @callback
     def async_register_index_routes(self, router, index_view):
@@ -226,10 +229,12 @@ class ExternalPanel(AbstractPanel):
             _LOGGER.error('Cannot find or access %s at %s',
                           self.component_name, self.path)
             hass.data[DATA_PANELS].pop(self.frontend_url_path)
+            async_clear_index_cache(hass)
             return
 
         self.webcomponent_url_es5 = self.webcomponent_url_latest = \
             URL_PANEL_COMPONENT_FP.format(self.component_name, self.md5)
+        async_clear_index_cache(hass)
 
         if self.component_name not in self.REGISTERED_COMPONENTS:
             hass.http.register_static_path(
@@ -280,6 +285,14 @@ def add_extra_html_url(hass, url, es5=False):
     if url_set is None:
         url_set = hass.data[key] = set()
     url_set.add(url)
+    async_clear_index_cache(hass)
+
+
+@bind_hass
+@callback
+def async_clear_index_cache(hass):
+    """Render the index again on the next request."""
+    hass.data.pop(DATA_INDEX_CACHE, None)
 
 
 def add_manifest_json_key(key, val):
@@ -400,6 +413,7 @@ def async_setup_themes(hass, themes):
             MANIFEST_JSON['theme_color'] = themes[name][PRIMARY_COLOR]
         else:
             MANIFEST_JSON['theme_color'] = DEFAULT_THEME_COLOR
+        async_clear_index_cache(hass)
         hass.bus.async_fire(EVENT_THEMES_UPDATED, {
             'themes': themes,
             'default_theme': name,
@@ -493,19 +507,41 @@ class IndexView(HomeAssistantView):
             # do not try to auto connect on load
             no_auth = '0'
 
-        template = yield from hass.async_add_job(self.get_template, latest)
+        key = (latest, panel_url, no_auth)
+        cache = hass.data.get(DATA_INDEX_CACHE)
+        if cache is None:
+            cache = hass.data[DATA_INDEX_CACHE] = {}
+
+        if key not in cache:
+            template = yield from hass.async_add_job(self.get_template, latest)
+
+            extra_key = \
+                DATA_EXTRA_HTML_URL if latest else DATA_EXTRA_HTML_URL_ES5
+
+            body = template.render(
+                no_auth=no_auth,
+                panel_url=panel_url,
+                panels=hass.data[DATA_PANELS],
+                theme_color=MANIFEST_JSON['theme_color'],
+                extra_urls=hass.data[extra_key],
+            ).encode('utf-8')
+            etag = '"{}"'.format(hashlib.md5(body).hexdigest())
+
+            # Templates are read again on every request in development mode
+            if self.repo_path is not None:
+                return web.Response(
+                    body=body, content_type='text/html', charset='utf-8')
+
+            cache[key] = (body, etag)
 
-        extra_key = DATA_EXTRA_HTML_URL if latest else DATA_EXTRA_HTML_URL_ES5
+        body, etag = cache[key]
 
-        resp = template.render(
-            no_auth=no_auth,
-            panel_url=panel_url,
-            panels=hass.data[DATA_PANELS],
-            theme_color=MANIFEST_JSON['theme_color'],
-            extra_urls=hass.data[extra_key],
-        )
+        if etag_matches(request, etag):
+            return web.Response(status=304, headers={hdrs.ETAG: etag})
 
-        return web.Response(text=resp, content_type='text/html')
+        return web.Response(
+            body=body, content_type='text/html', charset='utf-8',
+            headers={hdrs.ETAG: etag})
 
 
 class ManifestJSONView(HomeAssistantView):
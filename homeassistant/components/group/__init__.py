@@ -17,6 +17,7 @@ from homeassistant.const import (
     ATTR_ASSUMED_STATE, SERVICE_RELOAD)
 from homeassistant.core import callback
 from homeassistant.loader import bind_hass
+from homeassistant.helpers import config_hash
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
 from homeassistant.helpers.entity_component import EntityComponent
 from homeassistant.helpers.event import async_track_state_change
@@ -257,8 +258,8 @@ def async_setup(hass, config):
 
     @asyncio.coroutine
     def reload_service_handler(service):
-        """Remove all groups and load new ones from config."""
-        conf = yield from component.async_prepare_reload()
+        """Replace the groups that changed in the config."""
+        conf = yield from component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
         yield from _async_process_config(hass, conf, component)
@@ -371,9 +372,32 @@ def async_setup(hass, config):
 
 @asyncio.coroutine
 def _async_process_config(hass, config, component):
-    """Process group configuration."""
+    """Process group configuration.
+
+    Groups that are already set up with the same config are kept, and
+    groups with a changed config keep their order.
+    """
     groups = []
+    hashes = {object_id: (object_id, config_hash(conf))
+              for object_id, conf in config.get(DOMAIN, {}).items()}
+    keep = set(hashes.values())
+    current = set()
+    orders = {}
+
+    for entity_id, group in list(component.entities.items()):
+        if group.conf_hash in keep:
+            current.add(group.conf_hash[0])
+            continue
+
+        if group.conf_hash is not None:
+            hass.data[DATA_ALL_GROUPS].pop(group.conf_hash[0], None)
+            orders[group.conf_hash[0]] = group.order
+        yield from component.async_remove_entity(entity_id)
+
     for object_id, conf in config.get(DOMAIN, {}).items():
+        if object_id in current:
+            continue
+
         name = conf.get(CONF_NAME, object_id)
         entity_ids = conf.get(CONF_ENTITIES) or []
         icon = conf.get(CONF_ICON)
@@ -384,7 +408,9 @@ def _async_process_config(hass, config, component):
         # groups get a number based on creation order.
         group = yield from Group.async_create_group(
             hass, name, entity_ids, icon=icon, view=view,
-            control=control, object_id=object_id)
+            control=control, object_id=object_id,
+            order=orders.get(object_id))
+        group.conf_hash = hashes[object_id]
         groups.append(group)
 
     if groups:
@@ -414,30 +440,36 @@ class Group(Entity):
         self._order = order
         self._assumed_state = False
         self._async_unsub_state_changed = None
+        self.conf_hash = None
 
     @staticmethod
     def create_group(hass, name, entity_ids=None, user_defined=True,
                      visible=True, icon=None, view=False, control=None,
-                     object_id=None):
+                     object_id=None, order=None):
         """Initialize a group."""
         return run_coroutine_threadsafe(
             Group.async_create_group(
                 hass, name, entity_ids, user_defined, visible, icon, view,
-                control, object_id),
+                control, object_id, order),
             hass.loop).result()
 
     @staticmethod
     @asyncio.coroutine
     def async_create_group(hass, name, entity_ids=None, user_defined=True,
                            visible=True, icon=None, view=False, control=None,
-                           object_id=None):
+                           object_id=None, order=None):
         """Initialize a group.
 
+        Without an order, the group is ordered after the existing groups.
+
         This method must be run in the event loop.
         """
+        if order is None:
+            order = len(hass.states.async_entity_ids(DOMAIN))
+
         group = Group(
             hass, name,
-            order=len(hass.states.async_entity_ids(DOMAIN)),
+            order=order,
             visible=visible, icon=icon, view=view, control=control,
             user_defined=user_defined
         )
@@ -488,6 +520,11 @@ class Group(Entity):
         """Set Icon for group."""
         self._icon = value
 
+    @property
+    def order(self):
+        """Return the position of the group in the frontend."""
+        return self._order
+
     @property
     def hidden(self):
         """If group should be hidden or not."""
@@ -72,7 +72,12 @@ def get_significant_states(hass, start_time, end_time=None, entity_ids=None,
         if end_time is not None:
             query = query.filter(States.last_updated < end_time)
 
-        query = query.order_by(States.last_updated)
+        if entity_ids:
+            # Read the states of each entity from the entity_id and
+            # last_updated index, without sorting all of them.
+            query = query.order_by(States.entity_id, States.last_updated)
+        else:
+            query = query.order_by(States.last_updated)
 
         states = (
             state for state in execute(query)
@@ -155,7 +160,7 @@ def get_states(hass, utc_point_in_time, entity_ids=None, run=None,
             )
 
             if entity_ids:
-                most_recent_states_by_date.filter(
+                most_recent_states_by_date = most_recent_states_by_date.filter(
                     States.entity_id.in_(entity_ids))
 
             most_recent_states_by_date = most_recent_states_by_date.group_by(
@@ -10,11 +10,13 @@ from ipaddress import ip_network
 import json
 import logging
 import os
+import pathlib
 import ssl
 
 from aiohttp import web
 from aiohttp.hdrs import ACCEPT, ORIGIN, CONTENT_TYPE
-from aiohttp.web_exceptions import HTTPUnauthorized, HTTPMovedPermanently
+from aiohttp.web_exceptions import (
+    HTTPMovedPermanently, HTTPNotFound, HTTPUnauthorized)
 import voluptuous as vol
 
 from homeassistant.const import (
@@ -33,8 +35,9 @@ from .const import (
     KEY_BANS_ENABLED, KEY_AUTHENTICATED, KEY_LOGIN_THRESHOLD,
     KEY_TRUSTED_NETWORKS, KEY_USE_X_FORWARDED_FOR)
 from .static import (
-    CachingFileResponse, CachingStaticResource, staticresource_middleware)
-from .util import get_real_ip
+    CachingStaticResource, StaticFile, async_static_response,
+    staticresource_middleware)
+from .util import IpNetworkSet, get_real_ip
 
 REQUIREMENTS = ['aiohttp_cors==0.6.0']
 
@@ -190,7 +193,7 @@ class HomeAssistantWSGI(object):
         self.app = web.Application(middlewares=middlewares)
         self.app['hass'] = hass
         self.app[KEY_USE_X_FORWARDED_FOR] = use_x_forwarded_for
-        self.app[KEY_TRUSTED_NETWORKS] = trusted_networks
+        self.app[KEY_TRUSTED_NETWORKS] = IpNetworkSet(trusted_networks)
         self.app[KEY_BANS_ENABLED] = is_ban_enabled
         self.app[KEY_LOGIN_THRESHOLD] = login_threshold
 
@@ -266,10 +269,21 @@ class HomeAssistantWSGI(object):
             return
 
         if cache_headers:
+            static_file = None
+
             @asyncio.coroutine
             def serve_file(request):
                 """Serve file from disk."""
-                return CachingFileResponse(path)
+                nonlocal static_file
+
+                if static_file is None:
+                    try:
+                        static_file = StaticFile(pathlib.Path(path))
+                    except OSError:
+                        raise HTTPNotFound()
+
+                return (yield from async_static_response(
+                    request, static_file))
         else:
             @asyncio.coroutine
             def serve_file(request):
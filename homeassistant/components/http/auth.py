@@ -53,9 +53,7 @@ def is_trusted_ip(request):
     """Test if request is from a trusted ip."""
     ip_addr = get_real_ip(request)
 
-    return ip_addr and any(
-        ip_addr in trusted_network for trusted_network
-        in request.app[KEY_TRUSTED_NETWORKS])
+    return ip_addr and ip_addr in request.app[KEY_TRUSTED_NETWORKS]
 
 
 def validate_password(request, api_password):
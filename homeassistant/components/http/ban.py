@@ -2,7 +2,7 @@
 import asyncio
 from collections import defaultdict
 from datetime import datetime
-from ipaddress import ip_address
+from ipaddress import ip_address, ip_network
 import logging
 import os
 
@@ -12,13 +12,15 @@ import voluptuous as vol
 
 from homeassistant.components import persistent_notification
 from homeassistant.config import load_yaml_config_file
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util.yaml import dump
 from .const import (
-    KEY_BANS_ENABLED, KEY_BANNED_IPS, KEY_LOGIN_THRESHOLD,
+    KEY_BANS_ENABLED, KEY_BANNED_IPS, KEY_BAN_WRITER, KEY_LOGIN_THRESHOLD,
     KEY_FAILED_LOGIN_ATTEMPTS)
-from .util import get_real_ip
+from .util import IpNetworkSet, get_real_ip
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -28,6 +30,9 @@ NOTIFICATION_ID_LOGIN = 'http-login'
 IP_BANS_FILE = 'ip_bans.yaml'
 ATTR_BANNED_AT = "banned_at"
 
+# Minimum number of seconds between writes to the ban file
+BAN_SAVE_INTERVAL = 10
+
 SCHEMA_IP_BAN_ENTRY = vol.Schema({
     vol.Optional('banned_at'): vol.Any(None, cv.datetime)
 })
@@ -46,12 +51,7 @@ def ban_middleware(request, handler):
             load_ip_bans_config, hass.config.path(IP_BANS_FILE))
 
     # Verify if IP is not banned
-    ip_address_ = get_real_ip(request)
-
-    is_banned = any(ip_ban.ip_address == ip_address_
-                    for ip_ban in request.app[KEY_BANNED_IPS])
-
-    if is_banned:
+    if request.app[KEY_BANNED_IPS].is_banned(get_real_ip(request)):
         raise HTTPForbidden()
 
     try:
@@ -88,8 +88,11 @@ def process_wrong_login(request):
         request.app[KEY_BANNED_IPS].append(new_ban)
 
         hass = request.app['hass']
-        yield from hass.async_add_job(
-            update_ip_bans_config, hass.config.path(IP_BANS_FILE), new_ban)
+        writer = request.app.get(KEY_BAN_WRITER)
+        if writer is None:
+            writer = request.app[KEY_BAN_WRITER] = IpBanWriter(
+                hass, hass.config.path(IP_BANS_FILE))
+        yield from writer.async_add(new_ban)
 
         _LOGGER.warning(
             "Banned IP %s for too many login attempts", remote_addr)
@@ -101,17 +104,109 @@ def process_wrong_login(request):
 
 
 class IpBan(object):
-    """Represents banned IP address."""
+    """Represents banned IP address or network."""
 
     def __init__(self, ip_ban: str, banned_at: datetime=None) -> None:
         """Initialize IP Ban object."""
-        self.ip_address = ip_address(ip_ban)
+        try:
+            self.ip_address = ip_address(ip_ban)
+        except ValueError:
+            self.ip_address = ip_network(ip_ban, strict=False)
         self.banned_at = banned_at or datetime.utcnow()
 
 
+class IpBanList(object):
+    """List of bans that can be tested for containing an address."""
+
+    def __init__(self, ip_bans=()):
+        """Initialize the list."""
+        self._ip_bans = []
+        self._networks = IpNetworkSet()
+
+        for ip_ban in ip_bans:
+            self.append(ip_ban)
+
+    def append(self, ip_ban: IpBan):
+        """Add a ban."""
+        self._ip_bans.append(ip_ban)
+        self._networks.add(ip_ban.ip_address)
+
+    def is_banned(self, address):
+        """Return if an address is banned."""
+        return address in self._networks
+
+    def __iter__(self):
+        """Iterate over the bans."""
+        return iter(self._ip_bans)
+
+    def __len__(self):
+        """Return the number of bans."""
+        return len(self._ip_bans)
+
+
+class IpBanWriter(object):
+    """Append new bans to the ban file.
+
+    The first ban is written right away. Bans that follow within
+    BAN_SAVE_INTERVAL seconds are written together when it has passed, or
+    when Home Assistant stops.
+    """
+
+    def __init__(self, hass, path: str) -> None:
+        """Initialize the writer."""
+        self.hass = hass
+        self.path = path
+        self._pending = []
+        self._last_write = None
+        self._timer = None
+        hass.bus.async_listen_once(EVENT_HOMEASSISTANT_STOP, self._async_stop)
+
+    @asyncio.coroutine
+    def async_add(self, ip_ban: IpBan):
+        """Write a ban now, or with the next batch."""
+        self._pending.append(ip_ban)
+
+        if self._timer is not None:
+            return
+
+        if self._last_write is not None:
+            delay = self._last_write + BAN_SAVE_INTERVAL - \
+                self.hass.loop.time()
+            if delay > 0:
+                self._timer = self.hass.loop.call_later(
+                    delay, self._async_write_later)
+                return
+
+        yield from self._async_write()
+
+    @callback
+    def _async_write_later(self):
+        """Write the bans that were added since the last write."""
+        self._timer = None
+        self.hass.async_add_job(self._async_write())
+
+    @asyncio.coroutine
+    def _async_stop(self, event):
+        """Write pending bans before Home Assistant stops."""
+        if self._pending:
+            yield from self._async_write()
+
+    @asyncio.coroutine
+    def _async_write(self):
+        """Write the pending bans."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        ip_bans, self._pending = self._pending, []
+        self._last_write = self.hass.loop.time()
+        yield from self.hass.async_add_job(
+            update_ip_bans_config, self.path, ip_bans)
+
+
 def load_ip_bans_config(path: str):
     """Load list of banned IPs from config file."""
-    ip_list = []
+    ip_list = IpBanList()
 
     if not os.path.isfile(path):
         return ip_list
@@ -126,18 +221,19 @@ def load_ip_bans_config(path: str):
         try:
             ip_info = SCHEMA_IP_BAN_ENTRY(ip_info)
             ip_list.append(IpBan(ip_ban, ip_info['banned_at']))
-        except vol.Invalid as err:
+        except (ValueError, vol.Invalid) as err:
             _LOGGER.error("Failed to load IP ban %s: %s", ip_info, err)
             continue
 
     return ip_list
 
 
-def update_ip_bans_config(path: str, ip_ban: IpBan):
-    """Update config file with new banned IP address."""
+def update_ip_bans_config(path: str, ip_bans):
+    """Update config file with new banned IP addresses."""
     with open(path, 'a') as out:
-        ip_ = {str(ip_ban.ip_address): {
-            ATTR_BANNED_AT: ip_ban.banned_at.strftime("%Y-%m-%dT%H:%M:%S")
-        }}
-        out.write('\n')
-        out.write(dump(ip_))
+        for ip_ban in ip_bans:
+            ip_ = {str(ip_ban.ip_address): {
+                ATTR_BANNED_AT: ip_ban.banned_at.strftime("%Y-%m-%dT%H:%M:%S")
+            }}
+            out.write('\n')
+            out.write(dump(ip_))
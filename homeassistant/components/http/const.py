@@ -5,6 +5,7 @@ KEY_TRUSTED_NETWORKS = 'ha_trusted_networks'
 KEY_REAL_IP = 'ha_real_ip'
 KEY_BANS_ENABLED = 'ha_bans_enabled'
 KEY_BANNED_IPS = 'ha_banned_ips'
+KEY_BAN_WRITER = 'ha_ban_writer'
 KEY_FAILED_LOGIN_ATTEMPTS = 'ha_failed_login_attempts'
 KEY_LOGIN_THRESHOLD = 'ha_login_threshold'
 
@@ -1,22 +1,175 @@
 """Static file handling for HTTP component."""
 import asyncio
+import gzip
+import mimetypes
 import re
 
 from aiohttp import hdrs
-from aiohttp.web import FileResponse, middleware
+from aiohttp.web import FileResponse, Response, middleware
 from aiohttp.web_exceptions import HTTPNotFound
 from aiohttp.web_urldispatcher import StaticResource
 from yarl import unquote
 
 _FINGERPRINT = re.compile(r'^(.+)-[a-z0-9]{32}\.(\w+)$', re.IGNORECASE)
 
+CACHE_TIME = 31 * 86400  # = 1 month
+
+# Precompressed variants, in order of preference
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+# Files without a precompressed variant are gzipped in memory on the first
+# request if they are of one of these types and sizes.
+COMPRESS_TYPES = ('text/', 'application/javascript', 'application/json',
+                  'application/xml', 'image/svg+xml')
+COMPRESS_MIN_SIZE = 1024
+COMPRESS_MAX_SIZE = 4 * 1024 * 1024
+
+
+def _stat_etag(stat):
+    """Return the strong ETag of a file from its stat information."""
+    return '"{:x}-{:x}"'.format(stat.st_mtime_ns, stat.st_size)
+
+
+class StaticFile(object):
+    """Stat information of a static file and its encoded variants."""
+
+    def __init__(self, path):
+        """Initialize the static file. Raises OSError if it is missing."""
+        stat = path.stat()
+        self.path = path
+        self.content_type = \
+            mimetypes.guess_type(str(path))[0] or 'application/octet-stream'
+        self.etag = _stat_etag(stat)
+        self.variants = {}
+        self.compressed = None
+
+        for encoding, suffix in ENCODINGS:
+            variant = path.with_name(path.name + suffix)
+            if variant.is_file():
+                self.variants[encoding] = variant
+
+        self.compressible = (
+            not self.variants and
+            COMPRESS_MIN_SIZE <= stat.st_size <= COMPRESS_MAX_SIZE and
+            self.content_type.startswith(COMPRESS_TYPES))
+
+    def is_current(self):
+        """Return if the file is unchanged. Raises OSError if it is missing."""
+        return _stat_etag(self.path.stat()) == self.etag
+
+    def etag_for(self, encoding):
+        """Return the strong ETag of the file in an encoding."""
+        if encoding is None:
+            return self.etag
+
+        return '{}-{}"'.format(self.etag[:-1], encoding)
+
+    def select_encoding(self, accept_encoding):
+        """Return the best encoding the client accepts, or None."""
+        accepted = {
+            value.split(';')[0].strip().lower()
+            for value in accept_encoding.split(',')}
+
+        for encoding, _ in ENCODINGS:
+            if encoding in accepted and (
+                    encoding in self.variants or
+                    encoding == 'gzip' and self.compressible):
+                return encoding
+
+        return None
+
+    def compress(self):
+        """Gzip the file in memory."""
+        with self.path.open('rb') as fobj:
+            self.compressed = gzip.compress(fobj.read())
+        return self.compressed
+
+
+def etag_matches(request, etag):
+    """Return if the If-None-Match header of the request matches an ETag."""
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+
+    if if_none_match is None:
+        return False
+
+    for value in if_none_match.split(','):
+        value = value.strip()
+        if value == '*' or value == etag or value == 'W/' + etag:
+            return True
+
+    return False
+
+
+@asyncio.coroutine
+def async_static_response(request, static_file, chunk_size=256 * 1024):
+    """Return a response with cache headers for a static file.
+
+    The client gets a precompressed variant or a gzipped copy of the file if
+    it accepts one, and a 304 if it already has the file.
+    """
+    encoding = static_file.select_encoding(
+        request.headers.get(hdrs.ACCEPT_ENCODING, ''))
+    etag = static_file.etag_for(encoding)
+    headers = {
+        hdrs.CACHE_CONTROL: 'public, max-age={}'.format(CACHE_TIME),
+        hdrs.ETAG: etag,
+    }
+
+    if static_file.variants or static_file.compressible:
+        headers[hdrs.VARY] = hdrs.ACCEPT_ENCODING
+
+    if etag_matches(request, etag):
+        return Response(status=304, headers=headers)
+
+    headers[hdrs.CONTENT_TYPE] = static_file.content_type
+
+    if encoding is None:
+        return CachingFileResponse(
+            static_file.path, chunk_size=chunk_size, headers=headers)
+
+    headers[hdrs.CONTENT_ENCODING] = encoding
+
+    if encoding in static_file.variants:
+        return CachingFileResponse(
+            static_file.variants[encoding], chunk_size=chunk_size,
+            headers=headers)
+
+    body = static_file.compressed
+    if body is None:
+        body = yield from request.app.loop.run_in_executor(
+            None, static_file.compress)
+
+    return Response(body=body, headers=headers)
+
 
 class CachingStaticResource(StaticResource):
-    """Static Resource handler that will add cache headers."""
+    """Static Resource handler that will add cache headers.
+
+    Resolved files are kept in memory, so the directory is only checked on
+    the first request for a file. Later requests only check that the file
+    did not change, and resolve it again if it did.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """Initialize the static resource."""
+        super().__init__(*args, **kwargs)
+        self._files = {}
 
     @asyncio.coroutine
     def _handle(self, request):
         filename = unquote(request.match_info['filename'])
+        static_file = self._files.pop(filename, None)
+
+        try:
+            current = static_file is not None and static_file.is_current()
+        except OSError:
+            current = False
+
+        if current:
+            self._files[filename] = static_file
+            return (yield from async_static_response(
+                request, static_file, self._chunk_size))
+
         try:
             # PyLint is wrong about resolve not being a member.
             # pylint: disable=no-member
@@ -34,7 +187,9 @@ class CachingStaticResource(StaticResource):
         if filepath.is_dir():
             return (yield from super()._handle(request))
         elif filepath.is_file():
-            return CachingFileResponse(filepath, chunk_size=self._chunk_size)
+            static_file = self._files[filename] = StaticFile(filepath)
+            return (yield from async_static_response(
+                request, static_file, self._chunk_size))
         else:
             raise HTTPNotFound
 
@@ -51,9 +206,8 @@ class CachingFileResponse(FileResponse):
         @asyncio.coroutine
         def sendfile(request, fobj, count):
             """Sendfile that includes a cache header."""
-            cache_time = 31 * 86400  # = 1 month
             self.headers[hdrs.CACHE_CONTROL] = "public, max-age={}".format(
-                cache_time)
+                CACHE_TIME)
 
             yield from orig_sendfile(request, fobj, count)
 
@@ -1,5 +1,5 @@
 """HTTP utilities."""
-from ipaddress import ip_address
+from ipaddress import ip_address, ip_network
 
 from .const import (
     KEY_REAL_IP, KEY_USE_X_FORWARDED_FOR, HTTP_HEADER_X_FORWARDED_FOR)
@@ -23,3 +23,49 @@ def get_real_ip(request):
             request[KEY_REAL_IP] = None
 
     return request[KEY_REAL_IP]
+
+
+class IpNetworkSet(object):
+    """Set of IP networks that can be tested for containing an address.
+
+    Networks are hashed per IP version and prefix length, so a test does one
+    set lookup per prefix length in use instead of a comparison per network.
+    Single addresses are networks with the longest prefix.
+    """
+
+    def __init__(self, networks=()):
+        """Initialize the set."""
+        self._networks = []
+        self._prefixes = {4: {}, 6: {}}
+
+        for network in networks:
+            self.add(network)
+
+    def add(self, network):
+        """Add an address or network, given as a string or object."""
+        network = ip_network(network, strict=False)
+        shift = network.max_prefixlen - network.prefixlen
+        self._prefixes[network.version].setdefault(
+            network.prefixlen, set()).add(
+                int(network.network_address) >> shift)
+        self._networks.append(network)
+
+    def __contains__(self, address):
+        """Return if an address is in one of the networks."""
+        if address is None:
+            return False
+
+        value = int(address)
+        for prefixlen, prefixes in self._prefixes[address.version].items():
+            if value >> (address.max_prefixlen - prefixlen) in prefixes:
+                return True
+
+        return False
+
+    def __iter__(self):
+        """Iterate over the networks."""
+        return iter(self._networks)
+
+    def __len__(self):
+        """Return the number of networks."""
+        return len(self._networks)
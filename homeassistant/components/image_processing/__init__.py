@@ -5,6 +5,7 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/image_processing/
 """
 import asyncio
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
 import logging
 
@@ -12,12 +13,16 @@ import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import (
-    ATTR_ENTITY_ID, CONF_NAME, CONF_ENTITY_ID)
+    ATTR_ENTITY_ID, CONF_NAME, CONF_ENTITY_ID, EVENT_HOMEASSISTANT_STOP,
+    STATE_ON)
+from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.loader import bind_hass
 from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.entity_component import EntityComponent
+from homeassistant.helpers.event import async_track_state_change
 from homeassistant.loader import get_component
+import homeassistant.util.dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -38,19 +43,30 @@ ATTR_CONFIDENCE = 'confidence'
 
 CONF_SOURCE = 'source'
 CONF_CONFIDENCE = 'confidence'
+CONF_WORKERS = 'workers'
+CONF_MOTION_ENTITY_ID = 'motion_entity_id'
+CONF_FRAME_DIFFERENCE = 'frame_difference'
+CONF_MAX_INTERVAL = 'max_interval'
+
+DATA_PROCESS_POOLS = 'image_processing_pools'
 
 DEFAULT_TIMEOUT = 10
 DEFAULT_CONFIDENCE = 80
+DEFAULT_MAX_INTERVAL = timedelta(minutes=5)
 
 SOURCE_SCHEMA = vol.Schema({
     vol.Required(CONF_ENTITY_ID): cv.entity_id,
     vol.Optional(CONF_NAME): cv.string,
+    vol.Optional(CONF_MOTION_ENTITY_ID): cv.entity_ids,
+    vol.Optional(CONF_FRAME_DIFFERENCE):
+        vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
+    vol.Optional(CONF_MAX_INTERVAL): cv.time_period,
 })
 
 PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend({
     vol.Optional(CONF_SOURCE): vol.All(cv.ensure_list, [SOURCE_SCHEMA]),
     vol.Optional(CONF_CONFIDENCE, default=DEFAULT_CONFIDENCE):
-        vol.All(vol.Coerce(float), vol.Range(min=0, max=100))
+        vol.All(vol.Coerce(float), vol.Range(min=0, max=100)),
 })
 
 SERVICE_SCAN_SCHEMA = vol.Schema({
@@ -65,6 +81,39 @@ def scan(hass, entity_id=None):
     hass.services.call(DOMAIN, SERVICE_SCAN, data)
 
 
+def get_process_pool(hass, name, workers):
+    """Return the process pool of a platform, or None without workers.
+
+    Platforms that support worker processes call this from setup with the
+    configured number of workers. Can be called from any thread.
+    """
+    if not workers:
+        return None
+
+    pools = hass.data.setdefault(DATA_PROCESS_POOLS, {})
+    if name not in pools:
+        pools[name] = ImageProcessingPool(hass, workers)
+
+    return pools[name]
+
+
+def get_schedule(hass, source):
+    """Return the schedule of a source, or None without schedule options.
+
+    Platforms call this with the config of each source and set the result
+    as the schedule of the entity that processes the source.
+    """
+    if (CONF_MOTION_ENTITY_ID not in source and
+            CONF_FRAME_DIFFERENCE not in source and
+            CONF_MAX_INTERVAL not in source):
+        return None
+
+    return ImageProcessingSchedule(
+        hass, source.get(CONF_MOTION_ENTITY_ID),
+        source.get(CONF_FRAME_DIFFERENCE),
+        source.get(CONF_MAX_INTERVAL, DEFAULT_MAX_INTERVAL))
+
+
 @asyncio.coroutine
 def async_setup(hass, config):
     """Set up image processing."""
@@ -77,6 +126,10 @@ def async_setup(hass, config):
         """Service handler for scan."""
         image_entities = component.async_extract_from_service(service)
 
+        for entity in image_entities:
+            if entity.schedule is not None:
+                entity.schedule.async_trigger()
+
         update_task = [entity.async_update_ha_state(True) for
                        entity in image_entities]
         if update_task:
@@ -89,11 +142,161 @@ def async_setup(hass, config):
     return True
 
 
+class ImageProcessingPool(object):
+    """Run the analysis of images in worker processes.
+
+    Images are handed to the workers as bytes objects. Each entity has at
+    most one image waiting for a worker, so when a worker falls behind a
+    waiting image is dropped in favor of a newer one.
+    """
+
+    def __init__(self, hass, workers):
+        """Initialize the pool."""
+        self.hass = hass
+        self.executor = ProcessPoolExecutor(max_workers=workers)
+        self.stats = {
+            'processed': 0,
+            'dropped': 0,
+        }
+        self._running = set()
+        self._waiting = {}
+        hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, self._stop)
+
+    @asyncio.coroutine
+    def async_run(self, key, func, *args):
+        """Run func in a worker process for the entity with key.
+
+        Returns the result of func, or None if the image was dropped.
+
+        This method is a coroutine.
+        """
+        future = asyncio.Future(loop=self.hass.loop)
+
+        if key not in self._running:
+            self._async_start(key, func, args, future)
+        else:
+            waiting = self._waiting.pop(key, None)
+            if waiting is not None:
+                self.stats['dropped'] += 1
+                if not waiting[2].done():
+                    waiting[2].set_result(None)
+            self._waiting[key] = (func, args, future)
+
+        return (yield from future)
+
+    @callback
+    def _async_start(self, key, func, args, future):
+        """Start a job in a worker process."""
+        self._running.add(key)
+        job = self.hass.loop.run_in_executor(self.executor, func, *args)
+        job.add_done_callback(
+            lambda job: self._async_job_done(key, job, future))
+
+    @callback
+    def _async_job_done(self, key, job, future):
+        """Report the result of a job and start the waiting one."""
+        self._running.discard(key)
+
+        if job.cancelled():
+            future.cancel()
+        elif job.exception() is not None:
+            if not future.done():
+                future.set_exception(job.exception())
+        else:
+            self.stats['processed'] += 1
+            if not future.done():
+                future.set_result(job.result())
+
+        waiting = self._waiting.pop(key, None)
+        if waiting is not None:
+            self._async_start(key, *waiting)
+
+    def _stop(self, event):
+        """Stop the worker processes."""
+        self.executor.shutdown(wait=False)
+
+
+class ImageProcessingSchedule(object):
+    """Decide when the image of a camera is worth processing.
+
+    An image is processed when one of the motion entities turned on or is
+    still on, when the size of the encoded frame changed by at least
+    frame_difference percent since the last processed frame, or when the
+    last image was processed more than max_interval ago. A static scene
+    compresses to nearly the same size, so comparing sizes is a cheap check
+    that does not need to decode the frames.
+    """
+
+    def __init__(self, hass, motion_entity_ids=None, frame_difference=None,
+                 max_interval=DEFAULT_MAX_INTERVAL):
+        """Initialize the schedule."""
+        self.hass = hass
+        self.motion_entity_ids = motion_entity_ids or []
+        self.frame_difference = frame_difference
+        self.max_interval = max_interval
+        self.stats = {
+            'processed': 0,
+            'skipped': 0,
+        }
+        self._triggered = False
+        self._last_processed = None
+        self._last_size = None
+
+    @callback
+    def async_trigger(self):
+        """Process the next image."""
+        self._triggered = True
+
+    @callback
+    def async_is_due(self, now):
+        """Return if the next image has to be processed without a check."""
+        return (
+            self._triggered or self._last_processed is None or
+            now - self._last_processed >= self.max_interval or
+            any(self.hass.states.is_state(entity_id, STATE_ON)
+                for entity_id in self.motion_entity_ids))
+
+    @callback
+    def async_frame_changed(self, image):
+        """Return if an image differs enough from the last processed one."""
+        if self.frame_difference is None:
+            return False
+
+        if self._last_size is None:
+            return True
+
+        difference = abs(len(image) - self._last_size)
+        return difference * 100 >= \
+            self.frame_difference * max(self._last_size, 1)
+
+    @callback
+    def async_processed(self, image, now):
+        """Remember the image that is processed."""
+        self.stats['processed'] += 1
+        self._triggered = False
+        self._last_processed = now
+        self._last_size = len(image)
+
+    @callback
+    def async_skipped(self):
+        """Count a skipped image."""
+        self.stats['skipped'] += 1
+
+
 class ImageProcessingEntity(Entity):
     """Base entity class for image processing."""
 
     timeout = DEFAULT_TIMEOUT
 
+    # Platforms that support worker processes set this to the pool of the
+    # platform and implement analyze_job and process_result.
+    process_pool = None
+
+    # Platforms set this to the result of get_schedule for the source.
+    schedule = None
+
+    _remove_motion_listener = None
+
     @property
     def camera_entity(self):
         """Return camera entity id from process pictures."""
@@ -108,13 +311,64 @@ class ImageProcessingEntity(Entity):
         """Process image."""
         raise NotImplementedError()
 
+    def analyze_job(self, image):
+        """Return a function and its arguments that analyze the image.
+
+        The function is run in a worker process, so it and its arguments
+        have to be picklable. Its result is passed to process_result.
+        """
+        raise NotImplementedError()
+
+    def process_result(self, result):
+        """Process the result of analyze_job."""
+        raise NotImplementedError()
+
     def async_process_image(self, image):
         """Process image.
 
         This method must be run in the event loop and returns a coroutine.
         """
+        if self.process_pool is not None:
+            return self._async_process_in_pool(image)
+
         return self.hass.async_add_job(self.process_image, image)
 
+    @asyncio.coroutine
+    def _async_process_in_pool(self, image):
+        """Analyze the image in a worker process and process the result."""
+        result = yield from self.process_pool.async_run(
+            self.entity_id, *self.analyze_job(image))
+
+        if result is not None:
+            yield from self.hass.async_add_job(self.process_result, result)
+
+    @asyncio.coroutine
+    def async_added_to_hass(self):
+        """Listen to the motion entities of the schedule."""
+        if self.schedule is None or not self.schedule.motion_entity_ids:
+            return
+
+        self._remove_motion_listener = async_track_state_change(
+            self.hass, self.schedule.motion_entity_ids,
+            self._async_motion_listener, to_state=STATE_ON)
+
+    def async_remove(self):
+        """Remove the entity and stop listening to the motion entities.
+
+        This method must be run in the event loop and returns a coroutine.
+        """
+        if self._remove_motion_listener is not None:
+            self._remove_motion_listener()
+            self._remove_motion_listener = None
+
+        return super().async_remove()
+
+    @callback
+    def _async_motion_listener(self, entity_id, old_state, new_state):
+        """Process the next image as soon as motion is detected."""
+        self.schedule.async_trigger()
+        self.async_schedule_update_ha_state(True)
+
     @asyncio.coroutine
     def async_update(self):
         """Update image and process it.
@@ -123,6 +377,14 @@ class ImageProcessingEntity(Entity):
         """
         camera = get_component('camera')
         image = None
+        schedule = self.schedule
+        now = dt_util.utcnow()
+        due = schedule is None or schedule.async_is_due(now)
+
+        # Without a frame check there is no need to fetch the image
+        if not due and schedule.frame_difference is None:
+            schedule.async_skipped()
+            return
 
         try:
             image = yield from camera.async_get_image(
@@ -132,5 +394,12 @@ class ImageProcessingEntity(Entity):
             _LOGGER.error("Error on receive image from entity: %s", err)
             return
 
+        if schedule is not None:
+            if not due and not schedule.async_frame_changed(image):
+                schedule.async_skipped()
+                return
+
+            schedule.async_processed(image, now)
+
         # process image data
         yield from self.async_process_image(image)
@@ -7,13 +7,15 @@ https://home-assistant.io/components/image_processing.dlib_face_detect/
 import logging
 import io
 
+import voluptuous as vol
+
 from homeassistant.core import split_entity_id
-# pylint: disable=unused-import
-from homeassistant.components.image_processing import PLATFORM_SCHEMA  # noqa
 from homeassistant.components.image_processing import (
-    CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME)
+    PLATFORM_SCHEMA, CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME, CONF_WORKERS,
+    get_process_pool, get_schedule)
 from homeassistant.components.image_processing.microsoft_face_identify import (
     ImageProcessingFaceEntity)
+import homeassistant.helpers.config_validation as cv
 
 REQUIREMENTS = ['face_recognition==1.0.0']
 
@@ -21,26 +23,53 @@ _LOGGER = logging.getLogger(__name__)
 
 ATTR_LOCATION = 'location'
 
+PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
+    vol.Optional(CONF_WORKERS): cv.positive_int,
+})
+
 
 def setup_platform(hass, config, add_devices, discovery_info=None):
     """Set up the Dlib Face detection platform."""
+    process_pool = get_process_pool(
+        hass, 'dlib_face_detect', config.get(CONF_WORKERS))
+
     entities = []
     for camera in config[CONF_SOURCE]:
-        entities.append(DlibFaceDetectEntity(
-            camera[CONF_ENTITY_ID], camera.get(CONF_NAME)
-        ))
+        entity = DlibFaceDetectEntity(
+            camera[CONF_ENTITY_ID], camera.get(CONF_NAME), process_pool)
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     add_devices(entities)
 
 
+def detect_faces(image):
+    """Return the locations of the faces in an image.
+
+    Runs in a worker process if the platform has workers.
+    """
+    # pylint: disable=import-error
+    import face_recognition
+
+    fak_file = io.BytesIO(image)
+    fak_file.name = 'snapshot.jpg'
+    fak_file.seek(0)
+
+    image = face_recognition.load_image_file(fak_file)
+    face_locations = face_recognition.face_locations(image)
+
+    return [{ATTR_LOCATION: location} for location in face_locations]
+
+
 class DlibFaceDetectEntity(ImageProcessingFaceEntity):
     """Dlib Face API entity for identify."""
 
-    def __init__(self, camera_entity, name=None):
+    def __init__(self, camera_entity, name=None, process_pool=None):
         """Initialize Dlib face entity."""
         super().__init__()
 
         self._camera = camera_entity
+        self.process_pool = process_pool
 
         if name:
             self._name = name
@@ -58,19 +87,14 @@ class DlibFaceDetectEntity(ImageProcessingFaceEntity):
         """Return the name of the entity."""
         return self._name
 
-    def process_image(self, image):
-        """Process image."""
-        # pylint: disable=import-error
-        import face_recognition
-
-        fak_file = io.BytesIO(image)
-        fak_file.name = 'snapshot.jpg'
-        fak_file.seek(0)
+    def analyze_job(self, image):
+        """Return the function and arguments that detect the faces."""
+        return detect_faces, (image,)
 
-        image = face_recognition.load_image_file(fak_file)
-        face_locations = face_recognition.face_locations(image)
+    def process_result(self, result):
+        """Process the detected faces."""
+        self.process_faces(result, len(result))
 
-        face_locations = [{ATTR_LOCATION: location}
-                          for location in face_locations]
-
-        self.process_faces(face_locations, len(face_locations))
+    def process_image(self, image):
+        """Process image."""
+        self.process_result(detect_faces(image))
@@ -11,7 +11,8 @@ import voluptuous as vol
 
 from homeassistant.core import split_entity_id
 from homeassistant.components.image_processing import (
-    PLATFORM_SCHEMA, CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME)
+    PLATFORM_SCHEMA, CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME, CONF_WORKERS,
+    get_process_pool, get_schedule)
 from homeassistant.components.image_processing.microsoft_face_identify import (
     ImageProcessingFaceEntity)
 import homeassistant.helpers.config_validation as cv
@@ -25,30 +26,64 @@ CONF_FACES = 'faces'
 
 PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
     vol.Required(CONF_FACES): {cv.string: cv.isfile},
+    vol.Optional(CONF_WORKERS): cv.positive_int,
 })
 
 
 def setup_platform(hass, config, add_devices, discovery_info=None):
     """Set up the Dlib Face detection platform."""
+    process_pool = get_process_pool(
+        hass, 'dlib_face_identify', config.get(CONF_WORKERS))
+
     entities = []
     for camera in config[CONF_SOURCE]:
-        entities.append(DlibFaceIdentifyEntity(
-            camera[CONF_ENTITY_ID], config[CONF_FACES], camera.get(CONF_NAME)
-        ))
+        entity = DlibFaceIdentifyEntity(
+            camera[CONF_ENTITY_ID], config[CONF_FACES], camera.get(CONF_NAME),
+            process_pool)
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     add_devices(entities)
 
 
+def identify_faces(image, faces):
+    """Return the known faces in an image and the number of faces.
+
+    Runs in a worker process if the platform has workers.
+    """
+    # pylint: disable=import-error
+    import face_recognition
+
+    fak_file = io.BytesIO(image)
+    fak_file.name = 'snapshot.jpg'
+    fak_file.seek(0)
+
+    image = face_recognition.load_image_file(fak_file)
+    unknowns = face_recognition.face_encodings(image)
+
+    found = []
+    for unknown_face in unknowns:
+        for name, face in faces.items():
+            result = face_recognition.compare_faces([face], unknown_face)
+            if result[0]:
+                found.append({
+                    ATTR_NAME: name
+                })
+
+    return found, len(unknowns)
+
+
 class DlibFaceIdentifyEntity(ImageProcessingFaceEntity):
     """Dlib Face API entity for identify."""
 
-    def __init__(self, camera_entity, faces, name=None):
+    def __init__(self, camera_entity, faces, name=None, process_pool=None):
         """Initialize Dlib face identify entry."""
         # pylint: disable=import-error
         import face_recognition
         super().__init__()
 
         self._camera = camera_entity
+        self.process_pool = process_pool
 
         if name:
             self._name = name
@@ -75,25 +110,14 @@ class DlibFaceIdentifyEntity(ImageProcessingFaceEntity):
         """Return the name of the entity."""
         return self._name
 
-    def process_image(self, image):
-        """Process image."""
-        # pylint: disable=import-error
-        import face_recognition
+    def analyze_job(self, image):
+        """Return the function and arguments that identify the faces."""
+        return identify_faces, (image, self._faces)
 
-        fak_file = io.BytesIO(image)
-        fak_file.name = 'snapshot.jpg'
-        fak_file.seek(0)
+    def process_result(self, result):
+        """Process the identified faces."""
+        self.process_faces(*result)
 
-        image = face_recognition.load_image_file(fak_file)
-        unknowns = face_recognition.face_encodings(image)
-
-        found = []
-        for unknown_face in unknowns:
-            for name, face in self._faces.items():
-                result = face_recognition.compare_faces([face], unknown_face)
-                if result[0]:
-                    found.append({
-                        ATTR_NAME: name
-                    })
-
-        self.process_faces(found, len(unknowns))
+    def process_image(self, image):
+        """Process image."""
+        self.process_result(identify_faces(image, self._faces))
@@ -13,7 +13,7 @@ from homeassistant.core import split_entity_id
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.components.microsoft_face import DATA_MICROSOFT_FACE
 from homeassistant.components.image_processing import (
-    PLATFORM_SCHEMA, CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME)
+    PLATFORM_SCHEMA, CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME, get_schedule)
 from homeassistant.components.image_processing.microsoft_face_identify import (
     ImageProcessingFaceEntity, ATTR_GENDER, ATTR_AGE, ATTR_GLASSES)
 import homeassistant.helpers.config_validation as cv
@@ -54,9 +54,10 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
 
     entities = []
     for camera in config[CONF_SOURCE]:
-        entities.append(MicrosoftFaceDetectEntity(
-            camera[CONF_ENTITY_ID], api, attributes, camera.get(CONF_NAME)
-        ))
+        entity = MicrosoftFaceDetectEntity(
+            camera[CONF_ENTITY_ID], api, attributes, camera.get(CONF_NAME))
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     async_add_devices(entities)
 
@@ -15,7 +15,7 @@ from homeassistant.exceptions import HomeAssistantError
 from homeassistant.components.microsoft_face import DATA_MICROSOFT_FACE
 from homeassistant.components.image_processing import (
     PLATFORM_SCHEMA, ImageProcessingEntity, CONF_CONFIDENCE, CONF_SOURCE,
-    CONF_ENTITY_ID, CONF_NAME, ATTR_ENTITY_ID, ATTR_CONFIDENCE)
+    CONF_ENTITY_ID, CONF_NAME, ATTR_ENTITY_ID, ATTR_CONFIDENCE, get_schedule)
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util.async import run_callback_threadsafe
 
@@ -49,10 +49,11 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
 
     entities = []
     for camera in config[CONF_SOURCE]:
-        entities.append(MicrosoftFaceIdentifyEntity(
+        entity = MicrosoftFaceIdentifyEntity(
             camera[CONF_ENTITY_ID], api, face_group, confidence,
-            camera.get(CONF_NAME)
-        ))
+            camera.get(CONF_NAME))
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     async_add_devices(entities)
 
@@ -16,7 +16,8 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.core import split_entity_id
 from homeassistant.const import CONF_API_KEY
 from homeassistant.components.image_processing import (
-    PLATFORM_SCHEMA, CONF_CONFIDENCE, CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME)
+    PLATFORM_SCHEMA, CONF_CONFIDENCE, CONF_SOURCE, CONF_ENTITY_ID, CONF_NAME,
+    get_schedule)
 from homeassistant.components.image_processing.openalpr_local import (
     ImageProcessingAlprEntity)
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
@@ -61,9 +62,10 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
 
     entities = []
     for camera in config[CONF_SOURCE]:
-        entities.append(OpenAlprCloudEntity(
-            camera[CONF_ENTITY_ID], params, confidence, camera.get(CONF_NAME)
-        ))
+        entity = OpenAlprCloudEntity(
+            camera[CONF_ENTITY_ID], params, confidence, camera.get(CONF_NAME))
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     async_add_devices(entities)
 
@@ -16,7 +16,7 @@ from homeassistant.core import split_entity_id, callback
 from homeassistant.const import STATE_UNKNOWN, CONF_REGION
 from homeassistant.components.image_processing import (
     PLATFORM_SCHEMA, ImageProcessingEntity, CONF_CONFIDENCE, CONF_SOURCE,
-    CONF_ENTITY_ID, CONF_NAME, ATTR_ENTITY_ID, ATTR_CONFIDENCE)
+    CONF_ENTITY_ID, CONF_NAME, ATTR_ENTITY_ID, ATTR_CONFIDENCE, get_schedule)
 from homeassistant.util.async import run_callback_threadsafe
 
 _LOGGER = logging.getLogger(__name__)
@@ -63,9 +63,10 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
 
     entities = []
     for camera in config[CONF_SOURCE]:
-        entities.append(OpenAlprLocalEntity(
-            camera[CONF_ENTITY_ID], command, confidence, camera.get(CONF_NAME)
-        ))
+        entity = OpenAlprLocalEntity(
+            camera[CONF_ENTITY_ID], command, confidence, camera.get(CONF_NAME))
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     async_add_devices(entities)
 
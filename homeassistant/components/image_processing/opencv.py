@@ -11,8 +11,8 @@ import requests
 import voluptuous as vol
 
 from homeassistant.components.image_processing import (
-    CONF_ENTITY_ID, CONF_NAME, CONF_SOURCE, PLATFORM_SCHEMA,
-    ImageProcessingEntity)
+    CONF_ENTITY_ID, CONF_NAME, CONF_SOURCE, CONF_WORKERS, PLATFORM_SCHEMA,
+    ImageProcessingEntity, get_process_pool, get_schedule)
 from homeassistant.core import split_entity_id
 import homeassistant.helpers.config_validation as cv
 
@@ -54,7 +54,8 @@ PLATFORM_SCHEMA = PLATFORM_SCHEMA.extend({
                     vol.Schema((int, int))
             })
         )
-    }
+    },
+    vol.Optional(CONF_WORKERS): cv.positive_int,
 })
 
 
@@ -100,20 +101,71 @@ def setup_platform(hass, config, add_devices, discovery_info=None):
             'Face': dest_path
         }
 
+    process_pool = get_process_pool(hass, 'opencv', config.get(CONF_WORKERS))
+
     for camera in config[CONF_SOURCE]:
-        entities.append(OpenCVImageProcessor(
+        entity = OpenCVImageProcessor(
             hass, camera[CONF_ENTITY_ID], camera.get(CONF_NAME),
-            config[CONF_CLASSIFIER]))
+            config[CONF_CLASSIFIER], process_pool)
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     add_devices(entities)
 
 
+def classify_image(image, classifiers):
+    """Return the matches of the classifiers in an image.
+
+    Runs in a worker process if the platform has workers.
+    """
+    import cv2  # pylint: disable=import-error
+    import numpy
+
+    # pylint: disable=no-member
+    cv_image = cv2.imdecode(
+        numpy.asarray(bytearray(image)), cv2.IMREAD_UNCHANGED)
+
+    for name, classifier in classifiers.items():
+        scale = DEFAULT_SCALE
+        neighbors = DEFAULT_NEIGHBORS
+        min_size = DEFAULT_MIN_SIZE
+        if isinstance(classifier, dict):
+            path = classifier[CONF_FILE]
+            scale = classifier.get(CONF_SCALE, scale)
+            neighbors = classifier.get(CONF_NEIGHBORS, neighbors)
+            min_size = classifier.get(CONF_MIN_SIZE, min_size)
+        else:
+            path = classifier
+
+        # pylint: disable=no-member
+        cascade = cv2.CascadeClassifier(path)
+
+        detections = cascade.detectMultiScale(
+            cv_image,
+            scaleFactor=scale,
+            minNeighbors=neighbors,
+            minSize=min_size)
+        matches = {}
+        total_matches = 0
+        regions = []
+        # pylint: disable=invalid-name
+        for (x, y, w, h) in detections:
+            regions.append((int(x), int(y), int(w), int(h)))
+            total_matches += 1
+
+        matches[name] = regions
+
+    return matches, total_matches
+
+
 class OpenCVImageProcessor(ImageProcessingEntity):
     """Representation of an OpenCV image processor."""
 
-    def __init__(self, hass, camera_entity, name, classifiers):
+    def __init__(self, hass, camera_entity, name, classifiers,
+                 process_pool=None):
         """Initialize the OpenCV entity."""
         self.hass = hass
+        self.process_pool = process_pool
         self._camera_entity = camera_entity
         if name:
             self._name = name
@@ -147,44 +199,14 @@ class OpenCVImageProcessor(ImageProcessingEntity):
             ATTR_TOTAL_MATCHES: self._total_matches
         }
 
+    def analyze_job(self, image):
+        """Return the function and arguments that run the classifiers."""
+        return classify_image, (image, self._classifiers)
+
+    def process_result(self, result):
+        """Process the matches of the classifiers."""
+        self._matches, self._total_matches = result
+
     def process_image(self, image):
         """Process the image."""
-        import cv2  # pylint: disable=import-error
-        import numpy
-
-        # pylint: disable=no-member
-        cv_image = cv2.imdecode(
-            numpy.asarray(bytearray(image)), cv2.IMREAD_UNCHANGED)
-
-        for name, classifier in self._classifiers.items():
-            scale = DEFAULT_SCALE
-            neighbors = DEFAULT_NEIGHBORS
-            min_size = DEFAULT_MIN_SIZE
-            if isinstance(classifier, dict):
-                path = classifier[CONF_FILE]
-                scale = classifier.get(CONF_SCALE, scale)
-                neighbors = classifier.get(CONF_NEIGHBORS, neighbors)
-                min_size = classifier.get(CONF_MIN_SIZE, min_size)
-            else:
-                path = classifier
-
-            # pylint: disable=no-member
-            cascade = cv2.CascadeClassifier(path)
-
-            detections = cascade.detectMultiScale(
-                cv_image,
-                scaleFactor=scale,
-                minNeighbors=neighbors,
-                minSize=min_size)
-            matches = {}
-            total_matches = 0
-            regions = []
-            # pylint: disable=invalid-name
-            for (x, y, w, h) in detections:
-                regions.append((int(x), int(y), int(w), int(h)))
-                total_matches += 1
-
-            matches[name] = regions
-
-        self._matches = matches
-        self._total_matches = total_matches
+        self.process_result(classify_image(image, self._classifiers))
@@ -15,7 +15,7 @@ import homeassistant.helpers.config_validation as cv
 from homeassistant.core import split_entity_id
 from homeassistant.components.image_processing import (
     PLATFORM_SCHEMA, ImageProcessingEntity, CONF_SOURCE, CONF_ENTITY_ID,
-    CONF_NAME)
+    CONF_NAME, get_schedule)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -49,9 +49,10 @@ def async_setup_platform(hass, config, async_add_devices, discovery_info=None):
     """Set up the Seven segments OCR platform."""
     entities = []
     for camera in config[CONF_SOURCE]:
-        entities.append(ImageProcessingSsocr(
-            hass, camera[CONF_ENTITY_ID], config, camera.get(CONF_NAME)
-        ))
+        entity = ImageProcessingSsocr(
+            hass, camera[CONF_ENTITY_ID], config, camera.get(CONF_NAME))
+        entity.schedule = get_schedule(hass, camera)
+        entities.append(entity)
 
     async_add_devices(entities)
 
@@ -5,10 +5,13 @@ For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/logbook/
 """
 import asyncio
+import json
 import logging
 from datetime import timedelta
 from itertools import groupby
+import threading
 
+from aiohttp import web
 import voluptuous as vol
 
 from homeassistant.core import callback
@@ -19,8 +22,10 @@ from homeassistant.components.http import HomeAssistantView
 from homeassistant.const import (
     EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
     STATE_NOT_HOME, STATE_OFF, STATE_ON, ATTR_HIDDEN, HTTP_BAD_REQUEST,
-    EVENT_LOGBOOK_ENTRY)
+    EVENT_LOGBOOK_ENTRY, CONTENT_TYPE_JSON, HTTP_INTERNAL_SERVER_ERROR)
 from homeassistant.core import State, split_entity_id, DOMAIN as HA_DOMAIN
+from homeassistant.remote import JSONEncoder
+from homeassistant.util.async import run_coroutine_threadsafe
 
 DOMAIN = 'logbook'
 DEPENDENCIES = ['recorder', 'frontend']
@@ -49,6 +54,24 @@ CONFIG_SCHEMA = vol.Schema({
 
 GROUP_BY_MINUTES = 15
 
+# Maximum number of days that can be requested at once
+MAX_PERIOD = 31
+
+# Rows fetched from the database per session
+QUERY_BATCH_SIZE = 500
+
+# Entries per chunk of the JSON response, and chunks buffered for a client
+JSON_CHUNK_SIZE = 100
+JSON_CHUNK_QUEUE_SIZE = 4
+
+# Queued instead of a chunk when reading the entries failed
+_READ_ERROR = object()
+
+# The only events that result in entries
+LOGBOOK_EVENTS = [
+    EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED,
+    EVENT_LOGBOOK_ENTRY]
+
 CONTINUOUS_DOMAINS = ['proximity', 'sensor']
 
 ATTR_NAME = 'name'
@@ -121,7 +144,13 @@ class LogbookView(HomeAssistantView):
 
     @asyncio.coroutine
     def get(self, request, datetime=None):
-        """Retrieve logbook entries."""
+        """Retrieve logbook entries.
+
+        The entity query parameter limits the entries to one entity, and
+        period sets the number of days to return. The entries are streamed,
+        so an error after the first chunk truncates the list instead of
+        returning an error status.
+        """
         if datetime:
             datetime = dt_util.parse_datetime(datetime)
 
@@ -130,13 +159,78 @@ class LogbookView(HomeAssistantView):
         else:
             datetime = dt_util.start_of_local_day()
 
+        try:
+            period = int(request.query.get('period', 1))
+        except ValueError:
+            period = 0
+
+        if not 0 < period <= MAX_PERIOD:
+            return self.json_message('Invalid period', HTTP_BAD_REQUEST)
+
+        entity_id = request.query.get('entity')
+        if entity_id is not None:
+            entity_id = entity_id.lower()
+
         start_day = dt_util.as_utc(datetime)
-        end_day = start_day + timedelta(days=1)
+        end_day = start_day + timedelta(days=period)
         hass = request.app['hass']
+        queue = asyncio.Queue(maxsize=JSON_CHUNK_QUEUE_SIZE, loop=hass.loop)
+        cancelled = threading.Event()
+
+        def put(chunk):
+            """Hand a chunk to the response, return if it is still wanted."""
+            if cancelled.is_set():
+                return False
+            run_coroutine_threadsafe(queue.put(chunk), hass.loop).result()
+            return True
+
+        def write_events():
+            """Read and encode the entries of the day."""
+            try:
+                for chunk in _json_chunks(_stream_events(
+                        hass, self.config, start_day, end_day, entity_id)):
+                    if not put(chunk):
+                        break
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error reading logbook")
+                put(_READ_ERROR)
+            finally:
+                run_coroutine_threadsafe(queue.put(None), hass.loop).result()
+
+        job = hass.async_add_job(write_events)
+        chunk = yield from queue.get()
+
+        try:
+            # Nothing is sent yet, so an early failure can still be reported
+            if chunk is _READ_ERROR:
+                return self.json_message(
+                    'Error reading logbook', HTTP_INTERNAL_SERVER_ERROR)
+
+            response = web.StreamResponse()
+            response.content_type = CONTENT_TYPE_JSON
+            yield from response.prepare(request)
+            closed = False
+
+            while chunk is not None:
+                if chunk is _READ_ERROR:
+                    # Close the list so the response stays valid JSON
+                    if not closed:
+                        response.write(b']')
+                        closed = True
+                else:
+                    response.write(chunk)
+                    closed = chunk.endswith(b']')
+                yield from response.drain()
+                chunk = yield from queue.get()
+        finally:
+            # Unblock the reader if the client went away
+            cancelled.set()
+            while chunk is not None:
+                chunk = yield from queue.get()
+            yield from job
 
-        events = yield from hass.async_add_job(
-            _get_events, hass, self.config, start_day, end_day)
-        return self.json(events)
+        yield from response.write_eof()
+        return response
 
 
 class Entry(object):
@@ -273,23 +367,105 @@ def humanify(events):
                     entity_id)
 
 
-def _get_events(hass, config, start_day, end_day):
+def _get_events(hass, config, start_day, end_day, entity_id=None):
     """Get events for a period of time."""
-    from homeassistant.components.recorder.models import Events
-    from homeassistant.components.recorder.util import (
-        execute, session_scope)
+    return list(_stream_events(hass, config, start_day, end_day, entity_id))
 
-    with session_scope(hass=hass) as session:
-        query = session.query(Events).order_by(
-            Events.time_fired).filter(
-                (Events.time_fired > start_day) &
-                (Events.time_fired < end_day))
-        events = execute(query)
-    return humanify(_exclude_events(events, config))
 
+def _stream_events(hass, config, start_day, end_day, entity_id=None):
+    """Generate the entries of a period of time as they are read."""
+    return humanify(_exclude_events(
+        _read_events(hass, config, start_day, end_day, entity_id), config))
 
-def _exclude_events(events, config):
-    """Get lists of excluded entities and platforms."""
+
+def _read_events(hass, config, start_day, end_day, entity_id=None):
+    """Generate the events of a period of time, a page at a time.
+
+    Event types and the include and exclude filters are applied by the
+    database. With an entity_id, only the events of that entity are read,
+    using the entity_id column of the events. Pages of QUERY_BATCH_SIZE
+    rows are read in order of time_fired and event_id, each in a new
+    session that is closed before its events are generated, so a slow
+    consumer never holds a session or cursor of the recorder database.
+    """
+    from homeassistant.components.recorder.models import Events, States
+    from homeassistant.components.recorder.util import session_scope
+
+    last = None
+
+    while True:
+        with session_scope(hass=hass) as session:
+            query = session.query(Events).outerjoin(
+                States, Events.event_id == States.event_id).filter(
+                    (Events.time_fired > start_day) &
+                    (Events.time_fired < end_day) &
+                    Events.event_type.in_(LOGBOOK_EVENTS) &
+                    ((Events.event_type != EVENT_STATE_CHANGED) |
+                     States.state_id.is_(None) |
+                     (_entity_filter(States, config) &
+                      (States.last_changed == States.last_updated))))
+
+            if entity_id is not None:
+                query = query.filter(Events.entity_id == entity_id)
+
+            if last is not None:
+                last_fired, last_id = last
+                query = query.filter(
+                    (Events.time_fired > last_fired) |
+                    ((Events.time_fired == last_fired) &
+                     (Events.event_id > last_id)))
+
+            rows = query.order_by(
+                Events.time_fired, Events.event_id).limit(
+                    QUERY_BATCH_SIZE).all()
+
+            if rows:
+                last = (rows[-1].time_fired, rows[-1].event_id)
+            events = [row.to_native() for row in rows]
+
+        for event in events:
+            if event is not None:
+                yield event
+
+        if len(rows) < QUERY_BATCH_SIZE:
+            return
+
+
+def _entity_filter(states, config):
+    """Return the include and exclude filters as an SQL expression.
+
+    This matches the entities that _exclude_events keeps.
+    """
+    from sqlalchemy import false, true
+
+    excluded_entities, excluded_domains, included_entities, \
+        included_domains = _get_filters(config)
+
+    if included_entities:
+        entity_included = states.entity_id.in_(included_entities)
+    else:
+        entity_included = false()
+
+    if excluded_domains and not included_domains:
+        keep = ~states.domain.in_(excluded_domains) | entity_included
+    elif included_domains and not excluded_domains:
+        keep = states.domain.in_(included_domains) | entity_included
+    elif included_domains and excluded_domains:
+        keep = ~states.domain.in_(excluded_domains) & (
+            states.domain.in_(included_domains) | entity_included)
+    elif included_entities:
+        keep = entity_included
+    else:
+        keep = true()
+
+    if excluded_entities:
+        keep = keep & ~states.entity_id.in_(excluded_entities)
+
+    return keep
+
+
+def _get_filters(config):
+    """Return the excluded and included entities and domains."""
     excluded_entities = []
     excluded_domains = []
     included_entities = []
@@ -303,7 +479,32 @@ def _exclude_events(events, config):
         included_entities = include[CONF_ENTITIES]
         included_domains = include[CONF_DOMAINS]
 
-    filtered_events = []
+    return (excluded_entities, excluded_domains, included_entities,
+            included_domains)
+
+
+def _json_chunks(entries):
+    """Encode entries as a JSON list, JSON_CHUNK_SIZE entries at a time."""
+    prefix = '['
+    batch = []
+
+    for entry in entries:
+        batch.append(json.dumps(
+            entry.as_dict(), sort_keys=True, cls=JSONEncoder))
+
+        if len(batch) == JSON_CHUNK_SIZE:
+            yield (prefix + ','.join(batch)).encode('UTF-8')
+            prefix = ','
+            batch = []
+
+    yield (prefix + ','.join(batch) + ']').encode('UTF-8')
+
+
+def _exclude_events(events, config):
+    """Generate the events that are not excluded."""
+    excluded_entities, excluded_domains, included_entities, \
+        included_domains = _get_filters(config)
+
     for event in events:
         domain, entity_id = None, None
 
@@ -356,8 +557,7 @@ def _exclude_events(events, config):
             # check if logbook entry is excluded for this entity
             if entity_id in excluded_entities:
                 continue
-        filtered_events.append(event)
-    return filtered_events
+        yield event
 
 
 # pylint: disable=too-many-return-statements
@@ -4,15 +4,23 @@ Support for sending data to Logentries webhook endpoint.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/logentries/
 """
+import asyncio
 import json
 import logging
-import requests
 
+import aiohttp
+import async_timeout
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
-from homeassistant.const import (CONF_TOKEN, EVENT_STATE_CHANGED)
+from homeassistant.const import CONF_TOKEN
 from homeassistant.helpers import state as state_helper
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.entityfilter import (
+    FILTER_SCHEMA, generate_filter)
+from homeassistant.helpers.export import (
+    CONF_FILTER, EXPORT_SCHEMA, ExportPipeline)
+from homeassistant.remote import JSONEncoder
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -20,10 +28,15 @@ DOMAIN = 'logentries'
 
 DEFAULT_HOST = 'https://webhook.logentries.com/noformat/logs/'
 
+TIMEOUT = 10
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Required(CONF_TOKEN): cv.string,
-    }),
+        vol.Optional(
+            CONF_FILTER, default=lambda: generate_filter([], [], [], [])
+        ): FILTER_SCHEMA,
+    }).extend(EXPORT_SCHEMA),
 }, extra=vol.ALLOW_EXTRA)
 
 
@@ -33,11 +46,9 @@ def setup(hass, config):
     token = conf.get(CONF_TOKEN)
     le_wh = '{}{}'.format(DEFAULT_HOST, token)
 
-    def logentries_event_listener(event):
-        """Listen for new messages on the bus and sends them to Logentries."""
-        state = event.data.get('new_state')
-        if state is None:
-            return
+    def logentries_event(event):
+        """Encode a state change as a log line."""
+        state = event.data['new_state']
         try:
             _state = state_helper.state_as_number(state)
         except ValueError:
@@ -51,15 +62,31 @@ def setup(hass, config):
                 'value': _state,
             }
         ]
+        payload = {
+            "host": le_wh,
+            "event": json_body
+        }
+        return json.dumps(payload, cls=JSONEncoder)
+
+    @asyncio.coroutine
+    def async_send_lines(lines):
+        """Send a batch of log lines to Logentries."""
+        session = async_get_clientsession(hass)
         try:
-            payload = {
-                "host": le_wh,
-                "event": json_body
-            }
-            requests.post(le_wh, data=json.dumps(payload), timeout=10)
-        except requests.exceptions.RequestException as error:
-            _LOGGER.exception("Error sending to Logentries: %s", error)
+            with async_timeout.timeout(TIMEOUT, loop=hass.loop):
+                response = yield from session.post(
+                    le_wh, data='\n'.join(lines))
+                yield from response.release()
+        except (asyncio.TimeoutError, aiohttp.ClientError) as error:
+            raise IOError("Error sending to Logentries: {}".format(error))
+
+        if response.status >= 400:
+            raise IOError("Error sending to Logentries: {}".format(
+                response.status))
 
-    hass.bus.listen(EVENT_STATE_CHANGED, logentries_event_listener)
+    pipeline = hass.data[DOMAIN] = ExportPipeline(
+        hass, DOMAIN, logentries_event, async_send_lines, conf[CONF_FILTER],
+        conf)
+    pipeline.start()
 
     return True
@@ -7,7 +7,6 @@ https://home-assistant.io/components/media_player/
 import asyncio
 from datetime import timedelta
 import functools as ft
-import collections
 import hashlib
 import logging
 from random import SystemRandom
@@ -26,6 +25,7 @@ from homeassistant.const import (
     SERVICE_VOLUME_DOWN, SERVICE_VOLUME_MUTE, SERVICE_MEDIA_NEXT_TRACK,
     SERVICE_MEDIA_PLAY_PAUSE, SERVICE_MEDIA_PREVIOUS_TRACK)
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.cache import ByteCache
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.config_validation import PLATFORM_SCHEMA  # noqa
 from homeassistant.helpers.entity import Entity
@@ -43,15 +43,8 @@ SCAN_INTERVAL = timedelta(seconds=10)
 ENTITY_ID_FORMAT = DOMAIN + '.{}'
 
 ENTITY_IMAGE_URL = '/api/media_player_proxy/{0}?token={1}&cache={2}'
-CACHE_IMAGES = 'images'
-CACHE_MAXSIZE = 'maxsize'
-CACHE_LOCK = 'lock'
-CACHE_URL = 'url'
-CACHE_CONTENT = 'content'
-ENTITY_IMAGE_CACHE = {
-    CACHE_IMAGES: collections.OrderedDict(),
-    CACHE_MAXSIZE: 16
-}
+DATA_IMAGE_CACHE = 'media_player_image_cache'
+IMAGE_CACHE_SIZE = 4 * 1024 * 1024
 
 SERVICE_PLAY_MEDIA = 'play_media'
 SERVICE_SELECT_SOURCE = 'select_source'
@@ -890,36 +883,34 @@ def _async_fetch_image(hass, url):
 
     Images are cached in memory (the images are typically 10-100kB in size).
     """
-    cache_images = ENTITY_IMAGE_CACHE[CACHE_IMAGES]
-    cache_maxsize = ENTITY_IMAGE_CACHE[CACHE_MAXSIZE]
-
-    if url not in cache_images:
-        cache_images[url] = {CACHE_LOCK: asyncio.Lock(loop=hass.loop)}
+    cache = hass.data.get(DATA_IMAGE_CACHE)
 
-    with (yield from cache_images[url][CACHE_LOCK]):
-        if CACHE_CONTENT in cache_images[url]:
-            return cache_images[url][CACHE_CONTENT]
+    if cache is None:
+        cache = hass.data[DATA_IMAGE_CACHE] = ByteCache(
+            hass, IMAGE_CACHE_SIZE, size_of=lambda image: len(image[0]))
 
-        content, content_type = (None, None)
+    @asyncio.coroutine
+    def async_fetch():
+        """Download the image."""
         websession = async_get_clientsession(hass)
         try:
             with async_timeout.timeout(10, loop=hass.loop):
                 response = yield from websession.get(url)
 
-                if response.status == 200:
-                    content = yield from response.read()
-                    content_type = response.headers.get(CONTENT_TYPE)
-                    if content_type:
-                        content_type = content_type.split(';')[0]
-                    cache_images[url][CACHE_CONTENT] = content, content_type
+                if response.status != 200:
+                    return None
 
-        except asyncio.TimeoutError:
-            pass
+                content = yield from response.read()
+                content_type = response.headers.get(CONTENT_TYPE)
+                if content_type:
+                    content_type = content_type.split(';')[0]
+                return content, content_type
 
-        while len(cache_images) > cache_maxsize:
-            cache_images.popitem(last=False)
+        except asyncio.TimeoutError:
+            return None
 
-        return content, content_type
+    image = yield from cache.async_get(url, async_fetch)
+    return image or (None, None)
 
 
 class MediaPlayerImageView(HomeAssistantView):
@@ -6,6 +6,7 @@ https://home-assistant.io/components/prometheus/
 """
 import asyncio
 import logging
+import re
 
 import voluptuous as vol
 from aiohttp import web
@@ -17,7 +18,9 @@ from homeassistant.const import (
     EVENT_STATE_CHANGED, TEMP_FAHRENHEIT, CONTENT_TYPE_TEXT_PLAIN,
     ATTR_TEMPERATURE, ATTR_UNIT_OF_MEASUREMENT)
 from homeassistant import core as hacore
+from homeassistant.core import callback
 from homeassistant.helpers import state as state_helper
+import homeassistant.helpers.config_validation as cv
 from homeassistant.util.temperature import fahrenheit_to_celsius
 
 REQUIREMENTS = ['prometheus_client==0.1.0']
@@ -29,38 +32,68 @@ API_ENDPOINT = '/api/prometheus'
 DOMAIN = 'prometheus'
 DEPENDENCIES = ['http']
 
+CONF_ATTRIBUTES = 'attributes'
+
 CONFIG_SCHEMA = vol.Schema({
-    DOMAIN: recorder.FILTER_SCHEMA,
+    DOMAIN: recorder.FILTER_SCHEMA.extend({
+        vol.Optional(CONF_ATTRIBUTES, default=False): cv.boolean,
+    }),
 }, extra=vol.ALLOW_EXTRA)
 
+INVALID_METRIC_CHARS = re.compile(r'[^a-zA-Z0-9_]')
+
 
 def setup(hass, config):
     """Activate Prometheus component."""
     import prometheus_client
 
-    hass.http.register_view(PrometheusView(prometheus_client))
-
     conf = config.get(DOMAIN, {})
     exclude = conf.get(CONF_EXCLUDE, {})
     include = conf.get(CONF_INCLUDE, {})
-    metrics = Metrics(prometheus_client, exclude, include)
+    metrics = Metrics(prometheus_client, exclude, include,
+                      conf.get(CONF_ATTRIBUTES, False))
+
+    hass.http.register_view(PrometheusView(metrics))
 
     hass.bus.listen(EVENT_STATE_CHANGED, metrics.handle_event)
     return True
 
 
 class Metrics(object):
-    """Model all of the metrics which should be exposed to Prometheus."""
+    """Model all of the metrics which should be exposed to Prometheus.
+
+    The metrics are not registered in the default registry of the Prometheus
+    client. The exposition text of every metric is kept, and only the
+    metrics that changed since the last scrape are rendered again.
+    """
 
-    def __init__(self, prometheus_client, exclude, include):
+    def __init__(self, prometheus_client, exclude, include,
+                 attributes=False):
         """Initialize Prometheus Metrics."""
         self.prometheus_client = prometheus_client
-        self.exclude = exclude.get(CONF_ENTITIES, []) + \
-            exclude.get(CONF_DOMAINS, [])
-        self.include_domains = include.get(CONF_DOMAINS, [])
-        self.include_entities = include.get(CONF_ENTITIES, [])
+        self.exclude = set(exclude.get(CONF_ENTITIES, []) +
+                           exclude.get(CONF_DOMAINS, []))
+        self.include_domains = set(include.get(CONF_DOMAINS, []))
+        self.include_entities = set(include.get(CONF_ENTITIES, []))
+        self.attributes = attributes
         self._metrics = {}
+        self._children = {}
+        self._attribute_metrics = {}
+        self._exposition = {}
+        self._changed = set()
+        self._handlers = {
+            'automation': self._handle_automation,
+            'binary_sensor': self._handle_binary_sensor,
+            'climate': self._handle_climate,
+            'device_tracker': self._handle_device_tracker,
+            'light': self._handle_light,
+            'lock': self._handle_lock,
+            'sensor': self._handle_sensor,
+            'switch': self._handle_switch,
+            'zwave': self._handle_zwave,
+        }
 
+    @callback
     def handle_event(self, event):
         """Listen for new messages on the bus, and add them to Prometheus."""
         state = event.data.get('new_state')
@@ -81,27 +114,48 @@ class Metrics(object):
                                  entity_id not in self.include_entities):
             return
 
-        handler = '_handle_{}'.format(domain)
+        handler = self._handlers.get(domain)
+
+        if handler is not None:
+            handler(state)
+
+        if self.attributes:
+            self._handle_attributes(state)
 
-        if hasattr(self, handler):
-            getattr(self, handler)(state)
+    def exposition(self):
+        """Return the metrics in the Prometheus text format."""
+        for metric in self._changed:
+            self._exposition[metric] = self.prometheus_client.generate_latest(
+                self._metrics[metric])
+        self._changed.clear()
+
+        return self.prometheus_client.generate_latest() + \
+            b''.join(self._exposition.values())
 
     def _metric(self, metric, factory, documentation, labels=None):
         if labels is None:
             labels = ['entity', 'friendly_name']
 
         try:
-            return self._metrics[metric]
+            _metric = self._metrics[metric]
         except KeyError:
-            self._metrics[metric] = factory(metric, documentation, labels)
-            return self._metrics[metric]
-
-    @staticmethod
-    def _labels(state):
-        return {
-            'entity': state.entity_id,
-            'friendly_name': state.attributes.get('friendly_name'),
-        }
+            _metric = self._metrics[metric] = factory(
+                metric, documentation, labels, registry=None)
+
+        self._changed.add(metric)
+        return _metric
+
+    def _child(self, metric, state):
+        """Return the child of a metric with the labels of a state."""
+        friendly_name = state.attributes.get('friendly_name')
+        key = (metric, state.entity_id, friendly_name)
+
+        try:
+            return self._children[key]
+        except KeyError:
+            child = self._children[key] = metric.labels(
+                entity=state.entity_id, friendly_name=friendly_name)
+            return child
 
     def _battery(self, state):
         if 'battery_level' in state.attributes:
@@ -112,7 +166,7 @@ class Metrics(object):
             )
             try:
                 value = float(state.attributes['battery_level'])
-                metric.labels(**self._labels(state)).set(value)
+                self._child(metric, state).set(value)
             except ValueError:
                 pass
 
@@ -123,7 +177,7 @@ class Metrics(object):
             'State of the binary sensor (0/1)',
         )
         value = state_helper.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_device_tracker(self, state):
         metric = self._metric(
@@ -132,7 +186,7 @@ class Metrics(object):
             'State of the device tracker (0/1)',
         )
         value = state_helper.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_light(self, state):
         metric = self._metric(
@@ -147,7 +201,7 @@ class Metrics(object):
             else:
                 value = state_helper.state_as_number(state)
             value = value * 100
-            metric.labels(**self._labels(state)).set(value)
+            self._child(metric, state).set(value)
         except ValueError:
             pass
 
@@ -158,7 +212,7 @@ class Metrics(object):
             'State of the lock (0/1)',
         )
         value = state_helper.state_as_number(state)
-        metric.labels(**self._labels(state)).set(value)
+        self._child(metric, state).set(value)
 
     def _handle_climate(self, state):
         temp = state.attributes.get(ATTR_TEMPERATURE)
@@ -169,14 +223,14 @@ class Metrics(object):
             metric = self._metric(
                 'temperature_c', self.prometheus_client.Gauge,
                 'Temperature in degrees Celsius')
-            metric.labels(**self._labels(state)).set(temp)
+            self._child(metric, state).set(temp)
 
         metric = self._metric(
             'climate_state', self.prometheus_client.Gauge,
             'State of the thermostat (0/1)')
         try:
             value = state_helper.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            self._child(metric, state).set(value)
         except ValueError:
             pass
 
@@ -198,7 +252,7 @@ class Metrics(object):
             value = state_helper.state_as_number(state)
             if unit == TEMP_FAHRENHEIT:
                 value = fahrenheit_to_celsius(value)
-            _metric.labels(**self._labels(state)).set(value)
+            self._child(_metric, state).set(value)
         except ValueError:
             pass
 
@@ -213,7 +267,7 @@ class Metrics(object):
 
         try:
             value = state_helper.state_as_number(state)
-            metric.labels(**self._labels(state)).set(value)
+            self._child(metric, state).set(value)
         except ValueError:
             pass
 
@@ -227,7 +281,24 @@ class Metrics(object):
             'Count of times an automation has been triggered',
         )
 
-        metric.labels(**self._labels(state)).inc()
+        self._child(metric, state).inc()
+
+    def _handle_attributes(self, state):
+        for key, value in state.attributes.items():
+            if isinstance(value, bool) or \
+                    not isinstance(value, (int, float)):
+                continue
+
+            name = self._attribute_metrics.get((state.domain, key))
+            if name is None:
+                name = self._attribute_metrics[(state.domain, key)] = \
+                    '{}_attr_{}'.format(
+                        state.domain, INVALID_METRIC_CHARS.sub('_', key))
+
+            metric = self._metric(
+                name, self.prometheus_client.Gauge,
+                'Attribute {} of {} entities'.format(key, state.domain))
+            self._child(metric, state).set(value)
 
 
 class PrometheusView(HomeAssistantView):
@@ -236,9 +307,9 @@ class PrometheusView(HomeAssistantView):
     url = API_ENDPOINT
     name = 'api:prometheus'
 
-    def __init__(self, prometheus_client):
+    def __init__(self, metrics):
         """Initialize Prometheus view."""
-        self.prometheus_client = prometheus_client
+        self.metrics = metrics
 
     @asyncio.coroutine
     def get(self, request):
@@ -246,5 +317,5 @@ class PrometheusView(HomeAssistantView):
         _LOGGER.debug("Received Prometheus metrics request")
 
         return web.Response(
-            body=self.prometheus_client.generate_latest(),
+            body=self.metrics.exposition(),
             content_type=CONTENT_TYPE_TEXT_PLAIN)
@@ -316,6 +316,8 @@ class Recorder(threading.Thread):
                         session.add(dbevent)
 
                         if event.event_type == EVENT_STATE_CHANGED:
+                            # Assign the event id to link the state to it
+                            session.flush()
                             dbstate = States.from_event(event)
                             dbstate.event_id = dbevent.event_id
                             session.add(dbstate)
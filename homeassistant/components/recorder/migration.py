@@ -114,6 +114,24 @@ def _drop_index(engine, table_name, index_name):
                         "critical operation.", index_name, table_name)
 
 
+def _add_columns(engine, table_name, columns_def):
+    """Add columns to a table.
+
+    Existing rows get NULL as value of the new columns.
+    """
+    from sqlalchemy import text
+
+    _LOGGER.info("Adding columns %s to table %s. Note: this can take several "
+                 "minutes on large databases and slow computers. Please "
+                 "be patient!",
+                 ', '.join(column.split(' ')[0] for column in columns_def),
+                 table_name)
+
+    for column_def in columns_def:
+        engine.execute(text("ALTER TABLE {table} ADD COLUMN {column_def}"
+                            .format(table=table_name, column_def=column_def)))
+
+
 def _apply_update(engine, new_version, old_version):
     """Perform operations to bring schema up to date."""
     if new_version == 1:
@@ -143,6 +161,13 @@ def _apply_update(engine, new_version, old_version):
         _drop_index(engine, "states", "ix_states_entity_id_created")
 
         _create_index(engine, "states", "ix_states_entity_id_last_updated")
+    elif new_version == 5:
+        # Create supporting index for States.event_id foreign key
+        _create_index(engine, "states", "ix_states_event_id")
+    elif new_version == 6:
+        # Add the entity_id of events, to query the events of an entity
+        _add_columns(engine, "events", ["entity_id VARCHAR(255)"])
+        _create_index(engine, "events", "ix_events_entity_id_time_fired")
     else:
         raise ValueError("No schema migration defined for version {}"
                          .format(new_version))
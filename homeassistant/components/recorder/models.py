@@ -16,7 +16,7 @@ from homeassistant.remote import JSONEncoder
 # pylint: disable=invalid-name
 Base = declarative_base()
 
-SCHEMA_VERSION = 4
+SCHEMA_VERSION = 6
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -31,14 +31,24 @@ class Events(Base):  # type: ignore
     origin = Column(String(32))
     time_fired = Column(DateTime(timezone=True), index=True)
     created = Column(DateTime(timezone=True), default=datetime.utcnow)
+    # Copy of the entity_id in event_data, to query events of an entity
+    entity_id = Column(String(255))
+
+    __table_args__ = (
+        # Used for fetching the events of an entity (logbook)
+        Index('ix_events_entity_id_time_fired', 'entity_id', 'time_fired'),)
 
     @staticmethod
     def from_event(event):
         """Create an event database object from a native event."""
+        entity_id = event.data.get('entity_id')
+
         return Events(event_type=event.event_type,
                       event_data=json.dumps(event.data, cls=JSONEncoder),
                       origin=str(event.origin),
-                      time_fired=event.time_fired)
+                      time_fired=event.time_fired,
+                      entity_id=entity_id if isinstance(entity_id, str)
+                      else None)
 
     def to_native(self):
         """Convert to a natve HA Event."""
@@ -64,7 +74,8 @@ class States(Base):   # type: ignore
     entity_id = Column(String(255))
     state = Column(String(255))
     attributes = Column(Text)
-    event_id = Column(Integer, ForeignKey('events.event_id'))
+    event_id = Column(
+        Integer, ForeignKey('events.event_id'), index=True)
     last_changed = Column(DateTime(timezone=True), default=datetime.utcnow)
     last_updated = Column(DateTime(timezone=True), default=datetime.utcnow,
                           index=True)
@@ -17,6 +17,7 @@ from homeassistant.const import (
     SERVICE_TOGGLE, SERVICE_RELOAD, STATE_ON, CONF_ALIAS)
 from homeassistant.core import split_entity_id
 from homeassistant.loader import bind_hass
+from homeassistant.helpers import config_hash
 from homeassistant.helpers.entity import ToggleEntity
 from homeassistant.helpers.entity_component import EntityComponent
 import homeassistant.helpers.config_validation as cv
@@ -108,7 +109,7 @@ def async_setup(hass, config):
     @asyncio.coroutine
     def reload_service(service):
         """Call a service to reload scripts."""
-        conf = yield from component.async_prepare_reload()
+        conf = yield from component.async_prepare_reload(skip_reset=True)
         if conf is None:
             return
 
@@ -151,7 +152,11 @@ def async_setup(hass, config):
 
 @asyncio.coroutine
 def _async_process_config(hass, config, component):
-    """Process group configuration."""
+    """Process script configuration.
+
+    Scripts that are already set up with the same config are kept, so
+    running scripts are not stopped.
+    """
     @asyncio.coroutine
     def service_handler(service):
         """Execute a service call to script.<script name>."""
@@ -163,10 +168,19 @@ def _async_process_config(hass, config, component):
         yield from script.async_turn_on(variables=service.data)
 
     scripts = []
+    hashes = {object_id: config_hash(cfg)
+              for object_id, cfg in config[DOMAIN].items()}
+
+    for entity_id, script in list(component.entities.items()):
+        if script.conf_hash != hashes.get(script.object_id):
+            yield from component.async_remove_entity(entity_id)
 
     for object_id, cfg in config[DOMAIN].items():
+        if ENTITY_ID_FORMAT.format(object_id) in component.entities:
+            continue
         alias = cfg.get(CONF_ALIAS, object_id)
-        script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE])
+        script = ScriptEntity(hass, object_id, alias, cfg[CONF_SEQUENCE],
+                              hashes[object_id])
         scripts.append(script)
         hass.services.async_register(
             DOMAIN, object_id, service_handler, schema=SCRIPT_SERVICE_SCHEMA)
@@ -177,8 +191,9 @@ def _async_process_config(hass, config, component):
 class ScriptEntity(ToggleEntity):
     """Representation of a script entity."""
 
-    def __init__(self, hass, object_id, name, sequence):
+    def __init__(self, hass, object_id, name, sequence, conf_hash=None):
         """Initialize the script."""
+        self.conf_hash = conf_hash
         self.object_id = object_id
         self.entity_id = ENTITY_ID_FORMAT.format(object_id)
         self.script = Script(hass, sequence, name, self.async_update_ha_state)
@@ -4,17 +4,24 @@ Support to send data to an Splunk instance.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/splunk/
 """
+import asyncio
 import json
 import logging
 
+import aiohttp
 from aiohttp.hdrs import AUTHORIZATION
-import requests
+import async_timeout
 import voluptuous as vol
 
 from homeassistant.const import (
-    CONF_SSL, CONF_HOST, CONF_NAME, CONF_PORT, CONF_TOKEN, EVENT_STATE_CHANGED)
+    CONF_SSL, CONF_HOST, CONF_NAME, CONF_PORT, CONF_TOKEN)
 from homeassistant.helpers import state as state_helper
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
 import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entityfilter import (
+    FILTER_SCHEMA, generate_filter)
+from homeassistant.helpers.export import (
+    CONF_FILTER, EXPORT_SCHEMA, ExportPipeline)
 from homeassistant.remote import JSONEncoder
 
 _LOGGER = logging.getLogger(__name__)
@@ -26,6 +33,8 @@ DEFAULT_PORT = 8088
 DEFAULT_SSL = False
 DEFAULT_NAME = 'HASS'
 
+TIMEOUT = 10
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Required(CONF_TOKEN): cv.string,
@@ -33,7 +42,10 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_PORT, default=DEFAULT_PORT): cv.port,
         vol.Optional(CONF_SSL, default=False): cv.boolean,
         vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
-    }),
+        vol.Optional(
+            CONF_FILTER, default=lambda: generate_filter([], [], [], [])
+        ): FILTER_SCHEMA,
+    }).extend(EXPORT_SCHEMA),
 }, extra=vol.ALLOW_EXTRA)
 
 
@@ -55,12 +67,9 @@ def setup(hass, config):
         uri_scheme, host, port)
     headers = {AUTHORIZATION: 'Splunk {}'.format(token)}
 
-    def splunk_event_listener(event):
-        """Listen for new messages on the bus and sends them to Splunk."""
-        state = event.data.get('new_state')
-
-        if state is None:
-            return
+    def splunk_event(event):
+        """Encode a state change as a Splunk event."""
+        state = event.data['new_state']
 
         try:
             _state = state_helper.state_as_number(state)
@@ -78,17 +87,35 @@ def setup(hass, config):
             }
         ]
 
-        try:
-            payload = {
-                "host": event_collector,
-                "event": json_body,
-            }
-            requests.post(event_collector,
-                          data=json.dumps(payload, cls=JSONEncoder),
-                          headers=headers, timeout=10)
-        except requests.exceptions.RequestException as error:
-            _LOGGER.exception("Error saving event to Splunk: %s", error)
+        payload = {
+            "host": event_collector,
+            "event": json_body,
+        }
+        return json.dumps(payload, cls=JSONEncoder)
 
-    hass.bus.listen(EVENT_STATE_CHANGED, splunk_event_listener)
+    @asyncio.coroutine
+    def async_send_events(events):
+        """Send a batch of events to the Splunk HTTP event collector."""
+        session = async_get_clientsession(hass)
+        try:
+            with async_timeout.timeout(TIMEOUT, loop=hass.loop):
+                response = yield from session.post(
+                    event_collector, data='\n'.join(events), headers=headers)
+                yield from response.release()
+        except (asyncio.TimeoutError, aiohttp.ClientError) as error:
+            raise IOError("Error saving events to Splunk: {}".format(error))
+
+        # The events were rejected, retrying will not help
+        if 400 <= response.status < 500:
+            _LOGGER.error("Error saving events to Splunk: %s",
+                          response.status)
+        elif response.status >= 500:
+            raise IOError("Error saving events to Splunk: {}".format(
+                response.status))
+
+    pipeline = hass.data[DOMAIN] = ExportPipeline(
+        hass, DOMAIN, splunk_event, async_send_events, conf[CONF_FILTER],
+        conf)
+    pipeline.start()
 
     return True
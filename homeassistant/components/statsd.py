@@ -4,29 +4,39 @@ A component which allows you to send data to StatsD.
 For more details about this component, please refer to the documentation at
 https://home-assistant.io/components/statsd/
 """
+import asyncio
+from datetime import timedelta
 import logging
 
 import voluptuous as vol
 
 from homeassistant.const import (
-    CONF_HOST, CONF_PORT, CONF_PREFIX, EVENT_STATE_CHANGED)
+    CONF_HOST, CONF_PORT, CONF_PREFIX, EVENT_HOMEASSISTANT_STOP,
+    EVENT_STATE_CHANGED)
+from homeassistant.core import callback
 import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers import state as state_helper
+from homeassistant.helpers.event import track_time_interval
 
 REQUIREMENTS = ['statsd==3.2.1']
 
 _LOGGER = logging.getLogger(__name__)
 
 CONF_ATTR = 'log_attributes'
+CONF_FLUSH_INTERVAL = 'flush_interval'
 CONF_RATE = 'rate'
 CONF_VALUE_MAP = 'value_mapping'
 
+DEFAULT_FLUSH_INTERVAL = timedelta(seconds=1)
 DEFAULT_HOST = 'localhost'
 DEFAULT_PORT = 8125
 DEFAULT_PREFIX = 'hass'
 DEFAULT_RATE = 1
 DOMAIN = 'statsd'
 
+# Maximum number of metrics waiting to be sent.
+MAX_PENDING = 10000
+
 CONFIG_SCHEMA = vol.Schema({
     DOMAIN: vol.Schema({
         vol.Required(CONF_HOST, default=DEFAULT_HOST): cv.string,
@@ -36,6 +46,8 @@ CONFIG_SCHEMA = vol.Schema({
         vol.Optional(CONF_RATE, default=DEFAULT_RATE):
             vol.All(vol.Coerce(int), vol.Range(min=1)),
         vol.Optional(CONF_VALUE_MAP, default=None): dict,
+        vol.Optional(CONF_FLUSH_INTERVAL, default=DEFAULT_FLUSH_INTERVAL):
+            cv.time_period,
     }),
 }, extra=vol.ALLOW_EXTRA)
 
@@ -53,7 +65,9 @@ def setup(hass, config):
     show_attribute_flag = conf.get(CONF_ATTR)
 
     statsd_client = statsd.StatsClient(host=host, port=port, prefix=prefix)
+    batch = hass.data[DOMAIN] = StatsdBatch(hass, statsd_client)
 
+    @callback
     def statsd_event_listener(event):
         """Listen for new messages on the bus and sends them to StatsD."""
         state = event.data.get('new_state')
@@ -76,7 +90,7 @@ def setup(hass, config):
 
         if show_attribute_flag is True:
             if isinstance(_state, (float, int)):
-                statsd_client.gauge(
+                batch.gauge(
                     "%s.state" % state.entity_id,
                     _state,
                     sample_rate
@@ -86,15 +100,77 @@ def setup(hass, config):
             for key, value in states.items():
                 if isinstance(value, (float, int)):
                     stat = "%s.%s" % (state.entity_id, key.replace(' ', '_'))
-                    statsd_client.gauge(stat, value, sample_rate)
+                    batch.gauge(stat, value, sample_rate)
 
         else:
             if isinstance(_state, (float, int)):
-                statsd_client.gauge(state.entity_id, _state, sample_rate)
+                batch.gauge(state.entity_id, _state, sample_rate)
 
         # Increment the count
-        statsd_client.incr(state.entity_id, rate=sample_rate)
+        batch.incr(state.entity_id, rate=sample_rate)
 
     hass.bus.listen(EVENT_STATE_CHANGED, statsd_event_listener)
+    hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, batch.async_flush)
+    track_time_interval(hass, batch.async_flush, conf.get(CONF_FLUSH_INTERVAL))
 
     return True
+
+
+class StatsdBatch(object):
+    """Collect metrics in a pipeline that is sent every flush interval.
+
+    The pipeline packs the metrics into as few packets as possible.
+    """
+
+    def __init__(self, hass, client):
+        """Initialize the batch."""
+        self.hass = hass
+        self.client = client
+        self.pipeline = client.pipeline()
+        self.pending = 0
+        self.stats = {
+            'sent': 0,
+            'dropped': 0,
+            'flushes': 0,
+        }
+
+    def _reserve(self):
+        """Return if there is room for another metric."""
+        if self.pending >= MAX_PENDING:
+            self.stats['dropped'] += 1
+            return False
+        self.pending += 1
+        return True
+
+    @callback
+    def gauge(self, stat, value, rate=1):
+        """Add a gauge to the batch."""
+        if self._reserve():
+            self.pipeline.gauge(stat, value, rate)
+
+    @callback
+    def incr(self, stat, count=1, rate=1):
+        """Add a counter increment to the batch."""
+        if self._reserve():
+            self.pipeline.incr(stat, count, rate)
+
+    @asyncio.coroutine
+    def async_flush(self, *_):
+        """Send the collected metrics.
+
+        This method is a coroutine.
+        """
+        if not self.pending:
+            return
+
+        pipeline, self.pipeline = self.pipeline, self.client.pipeline()
+        count, self.pending = self.pending, 0
+        self.stats['flushes'] += 1
+
+        try:
+            yield from self.hass.async_add_job(pipeline.send)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error sending %d metrics to StatsD", count)
+            self.stats['dropped'] += count
+        else:
+            self.stats['sent'] += count
@@ -14,7 +14,8 @@ from homeassistant.helpers.entity import Entity
 from homeassistant.helpers.event import (
     async_track_point_in_utc_time, async_track_utc_time_change)
 from homeassistant.helpers.sun import (
-    get_astral_location, get_astral_event_next)
+    async_precompute_astral_events, get_astral_location,
+    get_astral_event_next, get_astral_position)
 from homeassistant.util import dt as dt_util
 
 _LOGGER = logging.getLogger(__name__)
@@ -118,8 +119,8 @@ class Sun(Entity):
     @callback
     def update_sun_position(self, utc_point_in_time):
         """Calculate the position of the sun."""
-        self.solar_azimuth = self.location.solar_azimuth(utc_point_in_time)
-        self.solar_elevation = self.location.solar_elevation(utc_point_in_time)
+        self.solar_elevation, self.solar_azimuth = get_astral_position(
+            self.hass, utc_point_in_time)
 
     @callback
     def point_in_time_listener(self, now):
@@ -127,6 +128,7 @@ class Sun(Entity):
         self.update_sun_position(now)
         self.update_as_of(now)
         self.async_schedule_update_ha_state()
+        self.hass.async_add_job(async_precompute_astral_events(self.hass))
 
         # Schedule next update at next_change+1 second so sun state has changed
         async_track_point_in_utc_time(
@@ -13,7 +13,7 @@ from homeassistant.const import (
     CONF_API_KEY, CONF_ID, CONF_WHITELIST, STATE_UNAVAILABLE, STATE_UNKNOWN)
 from homeassistant.helpers import state as state_helper
 import homeassistant.helpers.config_validation as cv
-import homeassistant.helpers.event as event
+from homeassistant.helpers.export import ExportPipeline
 
 REQUIREMENTS = ['thingspeak==0.4.1']
 
@@ -51,23 +51,27 @@ def setup(hass, config):
                       "API key is correct.")
         return False
 
-    def thingspeak_listener(entity_id, old_state, new_state):
-        """Listen for new events and send them to Thingspeak."""
-        if new_state is None or new_state.state in (
-                STATE_UNKNOWN, '', STATE_UNAVAILABLE):
+    def thingspeak_value(event):
+        """Return the value of a state change."""
+        new_state = event.data['new_state']
+        if new_state.state in (STATE_UNKNOWN, '', STATE_UNAVAILABLE):
             return
         try:
-            if new_state.entity_id != entity:
-                return
-            _state = state_helper.state_as_number(new_state)
+            return state_helper.state_as_number(new_state)
         except ValueError:
             return
+
+    def send_value(values):
+        """Send the latest value to Thingspeak."""
         try:
-            channel.update({'field1': _state})
+            channel.update({'field1': values[-1]})
         except RequestException:
             _LOGGER.error(
-                "Error while sending value '%s' to Thingspeak", _state)
+                "Error while sending value '%s' to Thingspeak", values[-1])
 
-    event.track_state_change(hass, entity, thingspeak_listener)
+    pipeline = hass.data[DOMAIN] = ExportPipeline(
+        hass, DOMAIN, thingspeak_value, send_value,
+        lambda entity_id: entity_id == entity)
+    pipeline.start()
 
     return True
@@ -22,10 +22,11 @@ from homeassistant.components.media_player import (
     ATTR_MEDIA_CONTENT_ID, ATTR_MEDIA_CONTENT_TYPE, MEDIA_TYPE_MUSIC,
     SERVICE_PLAY_MEDIA)
 from homeassistant.components.media_player import DOMAIN as DOMAIN_MP
-from homeassistant.const import ATTR_ENTITY_ID
+from homeassistant.const import ATTR_ENTITY_ID, EVENT_HOMEASSISTANT_START
 from homeassistant.core import callback
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.helpers import config_per_platform
+from homeassistant.helpers.cache import ByteCache
 import homeassistant.helpers.config_validation as cv
 from homeassistant.setup import async_prepare_setup_platform
 
@@ -40,30 +41,53 @@ ATTR_OPTIONS = 'options'
 
 CONF_CACHE = 'cache'
 CONF_CACHE_DIR = 'cache_dir'
+CONF_CACHE_SIZE = 'cache_size'
 CONF_LANG = 'language'
+CONF_MEMORY_SIZE = 'memory_size'
+CONF_PRELOAD = 'preload'
 CONF_TIME_MEMORY = 'time_memory'
 
 DEFAULT_CACHE = True
 DEFAULT_CACHE_DIR = 'tts'
+DEFAULT_CACHE_SIZE = 256
+DEFAULT_MEMORY_SIZE = 16
 DEFAULT_TIME_MEMORY = 300
 DEPENDENCIES = ['http']
 DOMAIN = 'tts'
 
-MEM_CACHE_FILENAME = 'filename'
-MEM_CACHE_VOICE = 'voice'
-
 SERVICE_CLEAR_CACHE = 'clear_cache'
+SERVICE_PRELOAD = 'preload'
 SERVICE_SAY = 'say'
 
 _RE_VOICE_FILE = re.compile(
     r"([a-f0-9]{40})_([^_]+)_([^_]+)_([a-z_]+)\.[a-z0-9]{3,4}")
 KEY_PATTERN = '{0}_{1}_{2}_{3}'
 
+PRELOAD_SCHEMA = vol.Schema({
+    vol.Required(ATTR_MESSAGE): cv.string,
+    vol.Optional(ATTR_LANGUAGE): cv.string,
+    vol.Optional(ATTR_OPTIONS): dict,
+})
+
+
+def _preload_message(value):
+    """Validate a message to preload, which can be a plain string."""
+    if isinstance(value, str):
+        value = {ATTR_MESSAGE: value}
+    return PRELOAD_SCHEMA(value)
+
+
 PLATFORM_SCHEMA = cv.PLATFORM_SCHEMA.extend({
     vol.Optional(CONF_CACHE, default=DEFAULT_CACHE): cv.boolean,
     vol.Optional(CONF_CACHE_DIR, default=DEFAULT_CACHE_DIR): cv.string,
     vol.Optional(CONF_TIME_MEMORY, default=DEFAULT_TIME_MEMORY):
         vol.All(vol.Coerce(int), vol.Range(min=60, max=57600)),
+    vol.Optional(CONF_MEMORY_SIZE, default=DEFAULT_MEMORY_SIZE):
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(CONF_CACHE_SIZE, default=DEFAULT_CACHE_SIZE):
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(CONF_PRELOAD, default=[]):
+        vol.All(cv.ensure_list, [_preload_message]),
 })
 
 SCHEMA_SERVICE_SAY = vol.Schema({
@@ -74,6 +98,12 @@ SCHEMA_SERVICE_SAY = vol.Schema({
     vol.Optional(ATTR_OPTIONS): dict,
 })
 
+SCHEMA_SERVICE_PRELOAD = vol.Schema({
+    vol.Required(ATTR_MESSAGE): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional(ATTR_LANGUAGE): cv.string,
+    vol.Optional(ATTR_OPTIONS): dict,
+})
+
 SCHEMA_SERVICE_CLEAR_CACHE = vol.Schema({})
 
 
@@ -87,8 +117,11 @@ def async_setup(hass, config):
         use_cache = conf.get(CONF_CACHE, DEFAULT_CACHE)
         cache_dir = conf.get(CONF_CACHE_DIR, DEFAULT_CACHE_DIR)
         time_memory = conf.get(CONF_TIME_MEMORY, DEFAULT_TIME_MEMORY)
+        memory_size = conf.get(CONF_MEMORY_SIZE, DEFAULT_MEMORY_SIZE)
+        cache_size = conf.get(CONF_CACHE_SIZE, DEFAULT_CACHE_SIZE)
 
-        yield from tts.async_init_cache(use_cache, cache_dir, time_memory)
+        yield from tts.async_init_cache(
+            use_cache, cache_dir, time_memory, memory_size, cache_size)
     except (HomeAssistantError, KeyError) as err:
         _LOGGER.error("Error on cache init %s", err)
         return False
@@ -153,6 +186,49 @@ def async_setup(hass, config):
             DOMAIN, "{}_{}".format(p_type, SERVICE_SAY), async_say_handle,
             schema=SCHEMA_SERVICE_SAY)
 
+        @asyncio.coroutine
+        def async_preload(messages):
+            """Store the speech of messages in the cache, one at a time."""
+            for item in messages:
+                try:
+                    yield from tts.async_preload(
+                        p_type, item[ATTR_MESSAGE], item.get(ATTR_LANGUAGE),
+                        item.get(ATTR_OPTIONS))
+                except HomeAssistantError as err:
+                    _LOGGER.error("Error on preload tts: %s", err)
+
+        @asyncio.coroutine
+        def async_preload_handle(service):
+            """Service handle for preload."""
+            language = service.data.get(ATTR_LANGUAGE)
+            options = service.data.get(ATTR_OPTIONS)
+
+            yield from async_preload([{
+                ATTR_MESSAGE: message,
+                ATTR_LANGUAGE: language,
+                ATTR_OPTIONS: options,
+            } for message in service.data[ATTR_MESSAGE]])
+
+        hass.services.async_register(
+            DOMAIN, "{}_{}".format(p_type, SERVICE_PRELOAD),
+            async_preload_handle, schema=SCHEMA_SERVICE_PRELOAD)
+
+        # Preload in the background once Home Assistant is started
+        preload = p_config.get(CONF_PRELOAD)
+        if not preload:
+            return
+
+        @callback
+        def async_start_preload(event=None):
+            """Start to preload the messages."""
+            hass.async_add_job(async_preload(preload))
+
+        if hass.is_running:
+            async_start_preload()
+        else:
+            hass.bus.async_listen_once(
+                EVENT_HOMEASSISTANT_START, async_start_preload)
+
     setup_tasks = [async_setup_platform(p_type, p_config) for p_type, p_config
                    in config_per_platform(config, DOMAIN)]
 
@@ -182,12 +258,18 @@ class SpeechManager(object):
         self.use_cache = DEFAULT_CACHE
         self.cache_dir = DEFAULT_CACHE_DIR
         self.time_memory = DEFAULT_TIME_MEMORY
-        self.file_cache = {}
-        self.mem_cache = {}
+        self.preloaded = set()
+        self.cache = ByteCache(
+            hass, DEFAULT_MEMORY_SIZE * 1024 * 1024, DEFAULT_TIME_MEMORY)
 
     @asyncio.coroutine
-    def async_init_cache(self, use_cache, cache_dir, time_memory):
-        """Init config folder and load file cache."""
+    def async_init_cache(self, use_cache, cache_dir, time_memory,
+                         memory_size=DEFAULT_MEMORY_SIZE,
+                         cache_size=DEFAULT_CACHE_SIZE):
+        """Init config folder and load file cache.
+
+        The sizes of the memory and file cache are in MB.
+        """
         self.use_cache = use_cache
         self.time_memory = time_memory
 
@@ -206,45 +288,31 @@ class SpeechManager(object):
         except OSError as err:
             raise HomeAssistantError("Can't init cache dir {}".format(err))
 
-        def get_cache_files():
-            """Return a dict of given engine files."""
-            cache = {}
-
-            folder_data = os.listdir(self.cache_dir)
-            for file_data in folder_data:
-                record = _RE_VOICE_FILE.match(file_data)
-                if record:
-                    key = KEY_PATTERN.format(
-                        record.group(1), record.group(2), record.group(3),
-                        record.group(4)
-                    )
-                    cache[key.lower()] = file_data.lower()
-            return cache
+        def file_key(file_data):
+            """Return the key of a cached file."""
+            record = _RE_VOICE_FILE.match(file_data)
+            if not record:
+                return None
+
+            return KEY_PATTERN.format(
+                record.group(1), record.group(2), record.group(3),
+                record.group(4)).lower()
+
+        self.cache = ByteCache(
+            self.hass, memory_size * 1024 * 1024, time_memory, self.cache_dir,
+            cache_size * 1024 * 1024)
+        for key in self.preloaded:
+            self.cache.async_pin(key)
 
         try:
-            cache_files = yield from self.hass.async_add_job(get_cache_files)
+            yield from self.cache.async_load_directory(file_key)
         except OSError as err:
             raise HomeAssistantError("Can't read cache dir {}".format(err))
 
-        if cache_files:
-            self.file_cache.update(cache_files)
-
     @asyncio.coroutine
     def async_clear_cache(self):
         """Read file cache and delete files."""
-        self.mem_cache = {}
-
-        def remove_files():
-            """Remove files from filesystem."""
-            for _, filename in self.file_cache.items():
-                try:
-                    os.remove(os.path.join(self.cache_dir, filename))
-                except OSError as err:
-                    _LOGGER.warning(
-                        "Can't remove cache file '%s': %s", filename, err)
-
-        yield from self.hass.async_add_job(remove_files)
-        self.file_cache = {}
+        yield from self.cache.async_clear()
 
     @callback
     def async_register_engine(self, engine, provider, config):
@@ -254,16 +322,20 @@ class SpeechManager(object):
             provider.name = engine
         self.providers[engine] = provider
 
-    @asyncio.coroutine
-    def async_get_url(self, engine, message, cache=None, language=None,
-                      options=None):
-        """Get URL for play message.
+    @callback
+    def async_get_key(self, engine, message, language=None, options=None):
+        """Return the cache key of a message.
 
-        This method is a coroutine.
+        The speech of a cached message can be played without waiting for
+        the provider from the URL of async_get_url.
         """
+        return self._async_resolve(engine, message, language, options)[0]
+
+    @callback
+    def _async_resolve(self, engine, message, language, options):
+        """Return the cache key, language and options of a message."""
         provider = self.providers[engine]
         msg_hash = hashlib.sha1(bytes(message, 'utf-8')).hexdigest()
-        use_cache = cache if cache is not None else self.use_cache
 
         # Languages
         language = language or provider.default_language
@@ -292,109 +364,88 @@ class SpeechManager(object):
         key = KEY_PATTERN.format(
             msg_hash, language, options_key, engine).lower()
 
-        # Is speech already in memory
-        if key in self.mem_cache:
-            filename = self.mem_cache[key][MEM_CACHE_FILENAME]
-        # Is file store in file cache
-        elif use_cache and key in self.file_cache:
-            filename = self.file_cache[key]
-            self.hass.async_add_job(self.async_file_to_mem(key))
-        # Load speech from provider into memory
-        else:
-            filename = yield from self.async_get_tts_audio(
-                engine, key, message, use_cache, language, options)
-
-        return "{}/api/tts_proxy/{}".format(
-            self.hass.config.api.base_url, filename)
+        return key, language, options
 
     @asyncio.coroutine
-    def async_get_tts_audio(self, engine, key, message, cache, language,
-                            options):
-        """Receive TTS and store for view in cache.
+    def async_get_url(self, engine, message, cache=None, language=None,
+                      options=None):
+        """Get URL for play message.
 
         This method is a coroutine.
         """
-        provider = self.providers[engine]
-        extension, data = yield from provider.async_get_tts_audio(
-            message, language, options)
-
-        if data is None or extension is None:
-            raise HomeAssistantError(
-                "No TTS from {} for '{}'".format(engine, message))
-
-        # Create file infos
-        filename = ("{}.{}".format(key, extension)).lower()
-
-        data = self.write_tags(
-            filename, data, provider, message, language, options)
+        key, language, options = self._async_resolve(
+            engine, message, language, options)
+        use_cache = cache if cache is not None else self.use_cache
 
-        # Save to memory
-        self._async_store_to_memcache(key, filename, data)
+        # Is speech already in memory or in the file cache
+        filename = self.cache.async_filename(
+            key, disk=use_cache or key in self.preloaded)
 
-        if cache:
-            self.hass.async_add_job(
-                self.async_save_tts_audio(key, filename, data))
+        if filename is not None:
+            # Load it from the file cache before the player requests it
+            if self.cache.async_filename(key, disk=False) is None:
+                self.hass.async_add_job(self.cache.async_get(key))
+        # Load speech from provider into memory
+        else:
+            filename = yield from self.async_get_tts_audio(
+                engine, key, message, use_cache, language, options)
 
-        return filename
+        return "{}/api/tts_proxy/{}".format(
+            self.hass.config.api.base_url, filename)
 
     @asyncio.coroutine
-    def async_save_tts_audio(self, key, filename, data):
-        """Store voice data to file and file_cache.
+    def async_preload(self, engine, message, language=None, options=None):
+        """Store the speech of a message in the file cache.
+
+        Preloaded messages are played from the file cache even if the cache
+        is turned off, and are never evicted from it. Returns the cache key.
 
         This method is a coroutine.
         """
-        voice_file = os.path.join(self.cache_dir, filename)
+        key, language, options = self._async_resolve(
+            engine, message, language, options)
+        self.preloaded.add(key)
+        self.cache.async_pin(key)
 
-        def save_speech():
-            """Store speech to filesystem."""
-            with open(voice_file, 'wb') as speech:
-                speech.write(data)
+        if self.cache.async_filename(key) is None:
+            yield from self.async_get_tts_audio(
+                engine, key, message, True, language, options)
 
-        try:
-            yield from self.hass.async_add_job(save_speech)
-            self.file_cache[key] = filename
-        except OSError:
-            _LOGGER.error("Can't write %s", filename)
+        return key
 
     @asyncio.coroutine
-    def async_file_to_mem(self, key):
-        """Load voice from file cache into memory.
+    def async_get_tts_audio(self, engine, key, message, cache, language,
+                            options):
+        """Receive TTS and store for view in cache.
+
+        Concurrent requests for the same speech share one request to the
+        provider.
 
         This method is a coroutine.
         """
-        filename = self.file_cache.get(key)
-        if not filename:
-            raise HomeAssistantError("Key {} not in file cache!".format(key))
-
-        voice_file = os.path.join(self.cache_dir, filename)
+        provider = self.providers[engine]
 
-        def load_speech():
-            """Load a speech from filesystem."""
-            with open(voice_file, 'rb') as speech:
-                return speech.read()
+        @asyncio.coroutine
+        def async_fetch():
+            """Receive TTS from the provider and store it."""
+            extension, data = yield from provider.async_get_tts_audio(
+                message, language, options)
 
-        try:
-            data = yield from self.hass.async_add_job(load_speech)
-        except OSError:
-            del self.file_cache[key]
-            raise HomeAssistantError("Can't read {}".format(voice_file))
+            if data is None or extension is None:
+                raise HomeAssistantError(
+                    "No TTS from {} for '{}'".format(engine, message))
 
-        self._async_store_to_memcache(key, filename, data)
+            # Create file infos
+            filename = ("{}.{}".format(key, extension)).lower()
 
-    @callback
-    def _async_store_to_memcache(self, key, filename, data):
-        """Store data to memcache and set timer to remove it."""
-        self.mem_cache[key] = {
-            MEM_CACHE_FILENAME: filename,
-            MEM_CACHE_VOICE: data,
-        }
+            data = self.write_tags(
+                filename, data, provider, message, language, options)
 
-        @callback
-        def async_remove_from_mem():
-            """Cleanup memcache."""
-            self.mem_cache.pop(key)
+            self.cache.async_set(key, data, filename, persist=cache)
+            return data
 
-        self.hass.loop.call_later(self.time_memory, async_remove_from_mem)
+        yield from self.cache.async_get(key, async_fetch)
+        return self.cache.async_filename(key)
 
     @asyncio.coroutine
     def async_read_tts(self, filename):
@@ -409,13 +460,12 @@ class SpeechManager(object):
         key = KEY_PATTERN.format(
             record.group(1), record.group(2), record.group(3), record.group(4))
 
-        if key not in self.mem_cache:
-            if key not in self.file_cache:
-                raise HomeAssistantError("%s not in cache!", key)
-            yield from self.async_file_to_mem(key)
+        data = yield from self.cache.async_get(key)
+        if data is None:
+            raise HomeAssistantError("{} not in cache!".format(key))
 
         content, _ = mimetypes.guess_type(filename)
-        return (content, self.mem_cache[key][MEM_CACHE_VOICE])
+        return (content, data)
 
     @staticmethod
     def write_tags(filename, data, provider, message, language, options):
@@ -6,13 +6,15 @@ https://home-assistant.io/components/zone/
 """
 import asyncio
 import logging
+import math
 
 import voluptuous as vol
 
 import homeassistant.helpers.config_validation as cv
 from homeassistant.const import (
     ATTR_HIDDEN, ATTR_LATITUDE, ATTR_LONGITUDE, CONF_NAME, CONF_LATITUDE,
-    CONF_LONGITUDE, CONF_ICON, CONF_RADIUS)
+    CONF_LONGITUDE, CONF_ICON, CONF_RADIUS, EVENT_STATE_CHANGED)
+from homeassistant.core import callback
 from homeassistant.loader import bind_hass
 from homeassistant.helpers import config_per_platform
 from homeassistant.helpers.entity import Entity, async_generate_entity_id
@@ -31,6 +33,8 @@ DEFAULT_PASSIVE = False
 DEFAULT_RADIUS = 100
 DOMAIN = 'zone'
 
+DATA_ZONE_INDEX = 'zone_index'
+
 ENTITY_ID_FORMAT = 'zone.{}'
 ENTITY_ID_HOME = ENTITY_ID_FORMAT.format('home')
 
@@ -39,6 +43,13 @@ ICON_IMPORT = 'mdi:import'
 
 STATE = 'zoning'
 
+# Size of a grid cell of the zone index in degrees (about 11 km).
+GRID_SIZE = 0.1
+# Zones or lookups spanning more cells than this are not indexed.
+GRID_MAX_CELLS = 64
+# Lower bound of meters per degree latitude, with a margin of safety.
+METERS_PER_DEGREE = 110000
+
 # The config that zone accepts is the same as if it has platforms.
 PLATFORM_SCHEMA = vol.Schema({
     vol.Optional(CONF_NAME, default=DEFAULT_NAME): cv.string,
@@ -64,17 +75,15 @@ def async_active_zone(hass, latitude, longitude, radius=0):
 
     This method must be run in the event loop.
     """
-    # Sort entity IDs so that we are deterministic if equal distance to 2 zones
-    zones = (hass.states.get(entity_id) for entity_id
-             in sorted(hass.states.async_entity_ids(DOMAIN)))
+    index = hass.data.get(DATA_ZONE_INDEX)
+
+    if index is None:
+        index = hass.data[DATA_ZONE_INDEX] = ZoneIndex(hass)
 
     min_dist = None
     closest = None
 
-    for zone in zones:
-        if zone.attributes.get(ATTR_PASSIVE):
-            continue
-
+    for zone in index.async_candidates(latitude, longitude, radius):
         zone_dist = distance(
             latitude, longitude,
             zone.attributes[ATTR_LATITUDE], zone.attributes[ATTR_LONGITUDE])
@@ -170,3 +179,104 @@ class Zone(Entity):
         if self._passive:
             data[ATTR_PASSIVE] = self._passive
         return data
+
+
+def _grid_cells(latitude, longitude, radius):
+    """Return the grid cells covering a circle, or None if too many.
+
+    Async friendly.
+    """
+    lat_span = radius / METERS_PER_DEGREE
+    lat_min = latitude - lat_span
+    lat_max = latitude + lat_span
+
+    if lat_min < -89 or lat_max > 89:
+        return None
+
+    cos_lat = math.cos(math.radians(max(abs(lat_min), abs(lat_max))))
+    lon_span = lat_span / cos_lat
+
+    rows = range(math.floor(lat_min / GRID_SIZE),
+                 math.floor(lat_max / GRID_SIZE) + 1)
+    cols = range(math.floor((longitude - lon_span) / GRID_SIZE),
+                 math.floor((longitude + lon_span) / GRID_SIZE) + 1)
+
+    if len(rows) * len(cols) > GRID_MAX_CELLS:
+        return None
+
+    # Wrap the longitude around the antimeridian.
+    columns = round(360 / GRID_SIZE)
+    return [(row, col % columns) for row in rows for col in cols]
+
+
+class ZoneIndex(object):
+    """Grid index over the active zones.
+
+    Zones are added to every grid cell their bounding box overlaps, so a
+    lookup only has to compute the distance to the zones in the cells its
+    own bounding box overlaps. The index is rebuilt on the next lookup
+    after a zone changes.
+    """
+
+    def __init__(self, hass):
+        """Initialize the zone index."""
+        self.hass = hass
+        self._grid = None
+        self._unindexed = None
+        self._zones = None
+
+        hass.bus.async_listen(EVENT_STATE_CHANGED, self._async_state_changed)
+
+    @callback
+    def _async_state_changed(self, event):
+        """Invalidate the index when a zone changes."""
+        if event.data['entity_id'].startswith(DOMAIN + '.'):
+            self._grid = None
+
+    @callback
+    def _async_build(self):
+        """Build the grid from the current zone states."""
+        self._grid = {}
+        self._unindexed = []
+        self._zones = []
+
+        # Sort entity IDs so that we are deterministic if equal distance to 2
+        # zones.
+        for entity_id in sorted(self.hass.states.async_entity_ids(DOMAIN)):
+            zone = self.hass.states.get(entity_id)
+
+            if zone.attributes.get(ATTR_PASSIVE):
+                continue
+
+            self._zones.append(zone)
+            cells = _grid_cells(
+                zone.attributes[ATTR_LATITUDE],
+                zone.attributes[ATTR_LONGITUDE], zone.attributes[ATTR_RADIUS])
+
+            if cells is None:
+                self._unindexed.append(zone)
+                continue
+
+            for cell in cells:
+                self._grid.setdefault(cell, []).append(zone)
+
+    @callback
+    def async_candidates(self, latitude, longitude, radius=0):
+        """Return the active zones that may contain the given location.
+
+        Zones are returned sorted by entity ID.
+        """
+        if self._grid is None:
+            self._async_build()
+
+        cells = _grid_cells(latitude, longitude, radius)
+
+        if cells is None:
+            return list(self._zones)
+
+        candidates = {zone.entity_id: zone for zone in self._unindexed}
+        for cell in cells:
+            for zone in self._grid.get(cell, ()):
+                candidates[zone.entity_id] = zone
+
+        return [candidates[entity_id] for entity_id in sorted(candidates)]
@@ -22,7 +22,7 @@ from homeassistant.const import (
     CONF_WHITELIST_EXTERNAL_DIRS)
 from homeassistant.core import callback, DOMAIN as CONF_CORE
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.loader import get_component, get_platform
+from homeassistant.loader import get_component, get_manifest, get_platform
 from homeassistant.util.yaml import load_yaml, SECRET_YAML
 import homeassistant.helpers.config_validation as cv
 from homeassistant.util import dt as date_util, location as loc_util
@@ -533,19 +533,20 @@ def merge_packages_config(config, packages):
         for comp_name, comp_conf in pack_conf.items():
             if comp_name == CONF_CORE:
                 continue
-            component = get_component(comp_name)
+            manifest = get_manifest(comp_name)
 
-            if component is None:
+            if manifest is None:
                 _log_pkg_error(pack_name, comp_name, config, "does not exist")
                 continue
 
-            if hasattr(component, 'PLATFORM_SCHEMA'):
+            if manifest['platform_schema']:
                 config[comp_name] = cv.ensure_list(config.get(comp_name))
                 config[comp_name].extend(cv.ensure_list(comp_conf))
                 continue
 
-            if hasattr(component, 'CONFIG_SCHEMA'):
-                merge_type, _ = _identify_config_schema(component)
+            if manifest['config_schema']:
+                merge_type, _ = _identify_config_schema(
+                    get_component(comp_name))
 
                 if merge_type == 'list':
                     config[comp_name] = cv.ensure_list(config.get(comp_name))
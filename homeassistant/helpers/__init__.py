@@ -1,7 +1,7 @@
 """Helper methods for components within Home Assistant."""
 import re
 
-from typing import Any, Iterable, Tuple, Sequence, Dict
+from typing import Any, Iterable, Tuple, Sequence, Dict, Hashable
 
 from homeassistant.const import CONF_PLATFORM
 
@@ -46,3 +46,30 @@ def extract_domain_configs(config: ConfigType, domain: str) -> Sequence[str]:
     """
     pattern = re.compile(r'^{}(| .+)$'.format(domain))
     return [key for key in config.keys() if pattern.match(key)]
+
+
+def config_hash(config: Any) -> Hashable:
+    """Return a hashable representation of a validated config.
+
+    Two configs have an equal representation if they are equal. Values
+    that can't be compared, like functions, never compare equal.
+    Async friendly.
+    """
+    if isinstance(config, dict):
+        return tuple(sorted(
+            ((str(key), config_hash(value)) for key, value in config.items()),
+            key=lambda item: item[0]))
+    elif isinstance(config, (list, tuple)):
+        return tuple(config_hash(value) for value in config)
+    elif isinstance(config, (set, frozenset)):
+        return frozenset(config_hash(value) for value in config)
+    elif hasattr(config, 'template'):
+        # Templates only compare equal to templates
+        return (config.__class__.__name__, config.template)
+
+    try:
+        hash(config)
+    except TypeError:
+        return (config.__class__.__name__, id(config))
+
+    return config
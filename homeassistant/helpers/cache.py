@@ -0,0 +1,309 @@
+"""Helpers to cache binary data in memory and on disk."""
+import asyncio
+from collections import OrderedDict
+import hashlib
+import logging
+import os
+
+from homeassistant.core import callback
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class ByteCache(object):
+    """Least recently used cache of binary data bounded by size.
+
+    Values are kept in memory until max_memory bytes are used, then the
+    least recently used values are evicted. Values that are older than
+    max_age seconds are not returned anymore.
+
+    With a directory, values stored with persist=True are also written to
+    disk, where they are kept until max_disk bytes are used, and loaded
+    back into memory when they are requested again. Values written to disk
+    have to be bytes.
+
+    The value that was stored last and pinned values are never evicted, so
+    they can be used even if they are larger than the budget. Concurrent
+    requests for a value that has to be loaded or fetched share a single
+    load or fetch.
+    """
+
+    def __init__(self, hass, max_memory, max_age=None, directory=None,
+                 max_disk=None, size_of=len):
+        """Initialize the cache."""
+        self.hass = hass
+        self.max_memory = max_memory
+        self.max_age = max_age
+        self.directory = directory
+        self.max_disk = max_disk
+        self.size_of = size_of
+        self.stats = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'coalesced': 0,
+            'evictions': 0,
+        }
+        # key: (value, size, time stored, filename)
+        self._memory = OrderedDict()
+        self._memory_size = 0
+        # key: (filename, size)
+        self._disk = OrderedDict()
+        self._disk_size = 0
+        self._pinned = set()
+        self._pending = {}
+
+    @property
+    def hit_rate(self):
+        """Return the share of requests that did not need a fetch."""
+        hits = (self.stats['hits'] + self.stats['disk_hits'] +
+                self.stats['coalesced'])
+        total = hits + self.stats['misses']
+        return hits / total if total else None
+
+    @asyncio.coroutine
+    def async_load_directory(self, file_key):
+        """Index the files in the directory that are already cached.
+
+        file_key returns the key of a file name, or None to ignore the
+        file. The files that were modified last are evicted last.
+
+        This method is a coroutine.
+        """
+        entries = yield from self.hass.async_add_job(
+            self._scan_directory, file_key)
+
+        for key, filename, size in entries:
+            self._async_add_disk(key, filename, size)
+
+        self._async_evict_disk()
+
+    @callback
+    def async_pin(self, key):
+        """Exempt a value from eviction, also before it is stored."""
+        self._pinned.add(key)
+
+    @callback
+    def async_filename(self, key, disk=True):
+        """Return the file name of a cached value, or None."""
+        entry = self._async_memory_entry(key)
+
+        if entry is not None and entry[3] is not None:
+            return entry[3]
+
+        if disk and key in self._disk:
+            return self._disk[key][0]
+
+        return None
+
+    @asyncio.coroutine
+    def async_get(self, key, fetch=None):
+        """Return a cached value, or load or fetch it.
+
+        fetch is a coroutine function that returns the value, or None if
+        there is none. Its value is stored, unless fetch stores it itself.
+        Returns None if the value is not cached and there is no fetch.
+
+        This method is a coroutine.
+        """
+        entry = self._async_memory_entry(key)
+
+        if entry is not None:
+            self._memory.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+
+        pending = self._pending.get(key)
+
+        if pending is not None:
+            self.stats['coalesced'] += 1
+        elif key not in self._disk and fetch is None:
+            self.stats['misses'] += 1
+            return None
+        else:
+            pending = self._pending[key] = self.hass.async_add_job(
+                self._async_load(key, fetch))
+
+        return (yield from asyncio.shield(pending, loop=self.hass.loop))
+
+    @callback
+    def async_set(self, key, value, filename=None, persist=False):
+        """Store a value, and write it to disk if persist is set."""
+        entry = self._async_pop_memory(key)
+
+        if filename is None and entry is not None:
+            filename = entry[3]
+        if filename is None and key in self._disk:
+            filename = self._disk[key][0]
+        if filename is None and persist:
+            filename = hashlib.sha1(str(key).encode('utf-8')).hexdigest()
+
+        size = self.size_of(value)
+        self._memory[key] = (value, size, self.hass.loop.time(), filename)
+        self._memory_size += size
+
+        for old_key in self._async_evictable(self._memory):
+            if self._memory_size <= self.max_memory:
+                break
+            self._async_pop_memory(old_key)
+            self.stats['evictions'] += 1
+
+        if persist and self.directory is not None:
+            self.hass.async_add_job(self._async_write(key, filename, value))
+
+    @asyncio.coroutine
+    def async_clear(self):
+        """Remove all values from memory and disk.
+
+        This method is a coroutine.
+        """
+        self._memory.clear()
+        self._memory_size = 0
+        filenames = [filename for filename, _ in self._disk.values()]
+        self._disk.clear()
+        self._disk_size = 0
+
+        yield from self.hass.async_add_job(self._remove_files, filenames)
+
+    @callback
+    def _async_memory_entry(self, key):
+        """Return the memory entry of a key if it did not expire."""
+        entry = self._memory.get(key)
+
+        if entry is None or self.max_age is None or \
+                self.hass.loop.time() - entry[2] < self.max_age:
+            return entry
+
+        self._async_pop_memory(key)
+        return None
+
+    @callback
+    def _async_pop_memory(self, key):
+        """Remove a value from memory."""
+        entry = self._memory.pop(key, None)
+
+        if entry is not None:
+            self._memory_size -= entry[1]
+
+        return entry
+
+    @callback
+    def _async_add_disk(self, key, filename, size):
+        """Add a file to the disk index."""
+        self._async_pop_disk(key)
+        self._disk[key] = (filename, size)
+        self._disk_size += size
+
+    @callback
+    def _async_pop_disk(self, key):
+        """Remove a file from the disk index."""
+        entry = self._disk.pop(key, None)
+
+        if entry is not None:
+            self._disk_size -= entry[1]
+
+        return entry
+
+    @callback
+    def _async_evictable(self, entries):
+        """Return the keys that may be evicted, least recently used first."""
+        return [key for key in list(entries)[:-1] if key not in self._pinned]
+
+    @callback
+    def _async_evict_disk(self):
+        """Remove the least recently used files above the disk budget."""
+        if self.max_disk is None:
+            return
+
+        filenames = []
+        for old_key in self._async_evictable(self._disk):
+            if self._disk_size <= self.max_disk:
+                break
+            filenames.append(self._async_pop_disk(old_key)[0])
+            self.stats['evictions'] += 1
+
+        if filenames:
+            self.hass.async_add_job(self._remove_files, filenames)
+
+    @asyncio.coroutine
+    def _async_load(self, key, fetch):
+        """Load a value from disk or fetch it."""
+        try:
+            if key in self._disk:
+                filename = self._disk[key][0]
+                try:
+                    value = yield from self.hass.async_add_job(
+                        self._read_file, filename)
+                except OSError as err:
+                    _LOGGER.warning("Can't read %s: %s", filename, err)
+                    self._async_pop_disk(key)
+                else:
+                    self.stats['disk_hits'] += 1
+                    self._disk.move_to_end(key)
+                    self.async_set(key, value, filename)
+                    return value
+
+            self.stats['misses'] += 1
+            if fetch is None:
+                return None
+
+            value = yield from fetch()
+
+            if value is not None and key not in self._memory:
+                self.async_set(key, value)
+
+            return value
+        finally:
+            self._pending.pop(key, None)
+
+    @asyncio.coroutine
+    def _async_write(self, key, filename, value):
+        """Write a value to disk."""
+        try:
+            yield from self.hass.async_add_job(
+                self._write_file, filename, value)
+        except OSError as err:
+            _LOGGER.error("Can't write %s: %s", filename, err)
+            return
+
+        self._async_add_disk(key, filename, len(value))
+        self._async_evict_disk()
+
+    def _scan_directory(self, file_key):
+        """Return key, file name and size of the cached files."""
+        entries = []
+
+        for filename in os.listdir(self.directory):
+            key = file_key(filename)
+            if key is None:
+                continue
+
+            stat = os.stat(os.path.join(self.directory, filename))
+            entries.append((stat.st_mtime, key, filename, stat.st_size))
+
+        entries.sort()
+        return [entry[1:] for entry in entries]
+
+    def _read_file(self, filename):
+        """Read a file and mark it as recently used."""
+        path = os.path.join(self.directory, filename)
+
+        with open(path, 'rb') as fil:
+            value = fil.read()
+
+        os.utime(path)
+        return value
+
+    def _write_file(self, filename, value):
+        """Write a file."""
+        with open(os.path.join(self.directory, filename), 'wb') as fil:
+            fil.write(value)
+
+    def _remove_files(self, filenames):
+        """Remove files from the directory."""
+        for filename in filenames:
+            try:
+                os.remove(os.path.join(self.directory, filename))
+            except OSError as err:
+                _LOGGER.warning("Can't remove cache file %s: %s",
+                                filename, err)
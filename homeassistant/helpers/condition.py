@@ -3,6 +3,7 @@ from datetime import timedelta
 import functools as ft
 import logging
 import sys
+import weakref
 
 from homeassistant.helpers.typing import ConfigType
 
@@ -13,16 +14,31 @@ from homeassistant.const import (
     CONF_ENTITY_ID, CONF_VALUE_TEMPLATE, CONF_CONDITION,
     WEEKDAYS, CONF_STATE, CONF_ZONE, CONF_BEFORE,
     CONF_AFTER, CONF_WEEKDAY, SUN_EVENT_SUNRISE, SUN_EVENT_SUNSET,
-    CONF_BELOW, CONF_ABOVE)
+    CONF_BELOW, CONF_ABOVE, MATCH_ALL)
 from homeassistant.exceptions import TemplateError, HomeAssistantError
 import homeassistant.helpers.config_validation as cv
-from homeassistant.helpers.sun import get_astral_event_date
+from homeassistant.helpers.sun import (
+    get_astral_event_date, get_astral_location)
 import homeassistant.util.dt as dt_util
 from homeassistant.util.async import run_callback_threadsafe
 
 FROM_CONFIG_FORMAT = '{}_from_config'
 ASYNC_FROM_CONFIG_FORMAT = 'async_{}_from_config'
 
+DATA_SUN_TIMES = 'condition_sun_times'
+
+# Relative cost of evaluating each kind of condition. And/or conditions
+# evaluate their cheapest sub-conditions first.
+COST_TIME = 0
+COST_STATE = 1
+COST_SUN = 1
+COST_NUMERIC_STATE = 2
+COST_ZONE = 2
+COST_TEMPLATE = 5
+
+# Compiled conditions, shared between all users of the same config
+_COMPILED = weakref.WeakValueDictionary()
+
 _LOGGER = logging.getLogger(__name__)
 
 # PyLint does not like the use of _threaded_factory
@@ -42,16 +58,54 @@ def _threaded_factory(async_factory):
                 hass.loop, async_check, hass, variables,
             ).result()
 
+        condition_if.entity_ids = async_check.entity_ids
+        condition_if.cost = async_check.cost
         return condition_if
 
     return factory
 
 
+def _freeze(value):
+    """Return a hashable version of a condition configuration.
+
+    Templates are bound to the instance that renders them first and are not
+    hashable, so conditions using them are not shared.
+    """
+    if isinstance(value, dict):
+        return tuple(sorted(
+            (key, _freeze(val)) for key, val in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(val) for val in value)
+    return value
+
+
+def _compiled(check, entity_ids, cost):
+    """Attach the metadata of a compiled condition to its check."""
+    check.entity_ids = entity_ids
+    check.cost = cost
+    return check
+
+
 def async_from_config(config: ConfigType, config_validation: bool=True):
     """Turn a condition configuration into a method.
 
+    Identical configurations share the same compiled condition. Each
+    condition has an entity_ids attribute with the entities it depends on,
+    or None if they are not known or it also depends on the time, and a
+    cost attribute that is used to evaluate the cheapest sub-conditions
+    first.
+
     Should be run on the event loop.
     """
+    try:
+        key = (config_validation, _freeze(config))
+        check = _COMPILED.get(key)
+    except TypeError:
+        key = check = None
+
+    if check is not None:
+        return check
+
     for fmt in (ASYNC_FROM_CONFIG_FORMAT, FROM_CONFIG_FORMAT):
         factory = getattr(
             sys.modules[__name__],
@@ -64,27 +118,41 @@ def async_from_config(config: ConfigType, config_validation: bool=True):
         raise HomeAssistantError('Invalid condition "{}" specified {}'.format(
             config.get(CONF_CONDITION), config))
 
-    return factory(config, config_validation)
+    check = factory(config, config_validation)
+
+    if key is not None:
+        _COMPILED[key] = check
+
+    return check
 
 
 from_config = _threaded_factory(async_from_config)
 
 
+def _async_sub_conditions(config):
+    """Compile sub-conditions, cheapest first, and their entity ids."""
+    checks = sorted((async_from_config(entry, False) for entry
+                     in config['conditions']), key=lambda check: check.cost)
+    entity_ids = set()
+
+    for check in checks:
+        if check.entity_ids is None:
+            entity_ids = None
+            break
+        entity_ids |= check.entity_ids
+
+    return checks, entity_ids, sum(check.cost for check in checks)
+
+
 def async_and_from_config(config: ConfigType, config_validation: bool=True):
     """Create multi condition matcher using 'AND'."""
     if config_validation:
         config = cv.AND_CONDITION_SCHEMA(config)
-    checks = None
+    checks, entity_ids, cost = _async_sub_conditions(config)
 
     def if_and_condition(hass: HomeAssistant,
                          variables=None) -> bool:
         """Test and condition."""
-        nonlocal checks
-
-        if checks is None:
-            checks = [async_from_config(entry, False) for entry
-                      in config['conditions']]
-
         try:
             for check in checks:
                 if not check(hass, variables):
@@ -95,7 +163,7 @@ def async_and_from_config(config: ConfigType, config_validation: bool=True):
 
         return True
 
-    return if_and_condition
+    return _compiled(if_and_condition, entity_ids, cost)
 
 
 and_from_config = _threaded_factory(async_and_from_config)
@@ -105,17 +173,11 @@ def async_or_from_config(config: ConfigType, config_validation: bool=True):
     """Create multi condition matcher using 'OR'."""
     if config_validation:
         config = cv.OR_CONDITION_SCHEMA(config)
-    checks = None
+    checks, entity_ids, cost = _async_sub_conditions(config)
 
     def if_or_condition(hass: HomeAssistant,
                         variables=None) -> bool:
         """Test and condition."""
-        nonlocal checks
-
-        if checks is None:
-            checks = [async_from_config(entry, False) for entry
-                      in config['conditions']]
-
         try:
             for check in checks:
                 if check(hass, variables):
@@ -125,7 +187,7 @@ def async_or_from_config(config: ConfigType, config_validation: bool=True):
 
         return False
 
-    return if_or_condition
+    return _compiled(if_or_condition, entity_ids, cost)
 
 
 or_from_config = _threaded_factory(async_or_from_config)
@@ -192,7 +254,7 @@ def async_numeric_state_from_config(config, config_validation=True):
         return async_numeric_state(
             hass, entity_id, below, above, value_template, variables)
 
-    return if_numeric_state
+    return _compiled(if_numeric_state, {entity_id}, COST_NUMERIC_STATE)
 
 
 numeric_state_from_config = _threaded_factory(async_numeric_state_from_config)
@@ -229,7 +291,20 @@ def state_from_config(config, config_validation=True):
         """Test if condition."""
         return state(hass, entity_id, req_state, for_period)
 
-    return if_state
+    return _compiled(if_state, {entity_id}, COST_STATE)
+
+
+def _sun_times(hass, date):
+    """Return sunrise and sunset for a date, cached for the current day."""
+    location = get_astral_location(hass)
+    cached = hass.data.get(DATA_SUN_TIMES)
+
+    if cached is None or cached[0] is not location or cached[1] != date:
+        cached = hass.data[DATA_SUN_TIMES] = (
+            location, date, get_astral_event_date(hass, 'sunrise', date),
+            get_astral_event_date(hass, 'sunset', date))
+
+    return cached[2], cached[3]
 
 
 def sun(hass, before=None, after=None, before_offset=None, after_offset=None):
@@ -239,8 +314,7 @@ def sun(hass, before=None, after=None, before_offset=None, after_offset=None):
     before_offset = before_offset or timedelta(0)
     after_offset = after_offset or timedelta(0)
 
-    sunrise = get_astral_event_date(hass, 'sunrise', today)
-    sunset = get_astral_event_date(hass, 'sunset', today)
+    sunrise, sunset = _sun_times(hass, today)
 
     if sunrise is None and (before == SUN_EVENT_SUNRISE or
                             after == SUN_EVENT_SUNRISE):
@@ -280,7 +354,7 @@ def sun_from_config(config, config_validation=True):
         """Validate time based if-condition."""
         return sun(hass, before, after, before_offset, after_offset)
 
-    return time_if
+    return _compiled(time_if, None, COST_SUN)
 
 
 def template(hass, value_template, variables=None):
@@ -313,7 +387,13 @@ def async_template_from_config(config, config_validation=True):
 
         return async_template(hass, value_template, variables)
 
-    return template_if
+    entity_ids = value_template.extract_entities()
+    if entity_ids == MATCH_ALL:
+        entity_ids = None
+    else:
+        entity_ids = set(entity_ids)
+
+    return _compiled(template_if, entity_ids, COST_TEMPLATE)
 
 
 template_from_config = _threaded_factory(async_template_from_config)
@@ -364,7 +444,7 @@ def time_from_config(config, config_validation=True):
         """Validate time based if-condition."""
         return time(before, after, weekday)
 
-    return time_if
+    return _compiled(time_if, None, COST_TIME)
 
 
 def zone(hass, zone_ent, entity):
@@ -405,4 +485,4 @@ def zone_from_config(config, config_validation=True):
         """Test if condition."""
         return zone(hass, zone_entity_id, entity_id)
 
-    return if_in_zone
+    return _compiled(if_in_zone, {entity_id, zone_entity_id}, COST_ZONE)
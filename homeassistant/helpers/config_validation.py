@@ -12,12 +12,13 @@ from typing import Any, Union, TypeVar, Callable, Sequence, Dict
 
 import voluptuous as vol
 
-from homeassistant.loader import get_platform
+from homeassistant.loader import get_manifest
 from homeassistant.const import (
     CONF_PLATFORM, CONF_SCAN_INTERVAL, TEMP_CELSIUS, TEMP_FAHRENHEIT,
     CONF_ALIAS, CONF_ENTITY_ID, CONF_VALUE_TEMPLATE, WEEKDAYS,
     CONF_CONDITION, CONF_BELOW, CONF_ABOVE, CONF_TIMEOUT, SUN_EVENT_SUNSET,
-    SUN_EVENT_SUNRISE, CONF_UNIT_SYSTEM_IMPERIAL, CONF_UNIT_SYSTEM_METRIC)
+    SUN_EVENT_SUNRISE, CONF_UNIT_SYSTEM_IMPERIAL, CONF_UNIT_SYSTEM_METRIC,
+    PLATFORM_FORMAT)
 from homeassistant.core import valid_entity_id
 from homeassistant.exceptions import TemplateError
 import homeassistant.util.dt as dt_util
@@ -265,7 +266,7 @@ def platform_validator(domain):
         """Test if platform exists."""
         if value is None:
             raise vol.Invalid('platform cannot be None')
-        if get_platform(domain, str(value)):
+        if get_manifest(PLATFORM_FORMAT.format(domain, value)):
             return value
         raise vol.Invalid(
             'platform {} does not exist for {}'.format(value, domain))
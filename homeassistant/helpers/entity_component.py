@@ -300,9 +300,30 @@ class EntityComponent(object):
             self.async_prepare_reload(), loop=self.hass.loop).result()
 
     @asyncio.coroutine
-    def async_prepare_reload(self):
+    def async_remove_entity(self, entity_id):
+        """Remove an entity from this component.
+
+        This method must be run in the event loop.
+        """
+        entity = self.entities.pop(entity_id, None)
+
+        if entity is None:
+            return
+
+        for platform in self._platforms.values():
+            if entity in platform.platform_entities:
+                platform.platform_entities.remove(entity)
+
+        yield from entity.async_remove()
+        self.async_update_group()
+
+    @asyncio.coroutine
+    def async_prepare_reload(self, skip_reset=False):
         """Prepare reloading this entity component.
 
+        If skip_reset is True, the entities are kept and the caller is
+        responsible for removing the entities that are no longer configured.
+
         This method must be run in the event loop.
         """
         try:
@@ -318,7 +339,8 @@ class EntityComponent(object):
         if conf is None:
             return None
 
-        yield from self.async_reset()
+        if not skip_reset:
+            yield from self.async_reset()
         return conf
 
 
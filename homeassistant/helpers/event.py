@@ -165,6 +165,141 @@ def async_track_same_state(hass, period, action, async_check_same_func,
 
 track_same_state = threaded_listener_factory(async_track_same_state)
 
+DATA_HELD_STATE = 'held_state_tracker'
+
+
+class _HeldState(object):
+    """A state that has to be held for a period."""
+
+    def __init__(self, key, start_state, check_func):
+        """Initialize the held state."""
+        self.key = key
+        self.start_state = start_state
+        self.check_func = check_func
+        self.actions = {}
+        self.remove_timer = None
+
+
+class _HeldStateTracker(object):
+    """Track states held for a period with one state change listener.
+
+    Held states are indexed by entity id, so a state change only checks the
+    held states of the entity that changed. Callers with the same entity,
+    predicate key and period that start from the same state share one timer.
+    """
+
+    def __init__(self, hass):
+        """Initialize the tracker."""
+        self.hass = hass
+        self.held = {}
+        self._remove_listener = None
+
+    @callback
+    def async_track(self, period, action, check_func, entity_id, key,
+                    start_state):
+        """Run action when check_func holds for the entity during period."""
+        entity_id = entity_id.lower()
+        key = (key, period)
+
+        for held in self.held.get(entity_id, ()):
+            if held.key == key and held.start_state is start_state:
+                break
+        else:
+            held = _HeldState(key, start_state, check_func)
+
+            @callback
+            def async_period_passed(now):
+                """Fire the actions when the period passed."""
+                self._async_fire(entity_id, held)
+
+            held.remove_timer = async_track_point_in_utc_time(
+                self.hass, async_period_passed, dt_util.utcnow() + period)
+            self.held.setdefault(entity_id, []).append(held)
+
+        if self._remove_listener is None:
+            self._remove_listener = self.hass.bus.async_listen(
+                EVENT_STATE_CHANGED, self._async_state_listener)
+
+        token = object()
+        held.actions[token] = action
+
+        @callback
+        def async_remove():
+            """Stop tracking for this action."""
+            if held.actions.pop(token, None) is not None:
+                if not held.actions:
+                    self._async_remove(entity_id, held)
+
+        return async_remove
+
+    @callback
+    def _async_fire(self, entity_id, held):
+        """Run the actions of a state that was held for its period."""
+        held.remove_timer = None
+        self._async_remove(entity_id, held)
+
+        for action in held.actions.values():
+            self.hass.async_run_job(action)
+
+    @callback
+    def _async_state_listener(self, event):
+        """Cancel held states of the entity that no longer match."""
+        entity_id = event.data.get('entity_id')
+        if entity_id not in self.held:
+            return
+
+        from_state = event.data.get('old_state')
+        to_state = event.data.get('new_state')
+
+        for held in list(self.held[entity_id]):
+            if to_state is None or \
+                    not held.check_func(entity_id, from_state, to_state):
+                self._async_remove(entity_id, held)
+
+    @callback
+    def _async_remove(self, entity_id, held):
+        """Stop tracking a held state."""
+        if held.remove_timer is not None:
+            held.remove_timer()
+            held.remove_timer = None
+
+        entity_held = self.held.get(entity_id)
+        if entity_held is None or held not in entity_held:
+            return
+
+        entity_held.remove(held)
+        if not entity_held:
+            del self.held[entity_id]
+
+        if not self.held and self._remove_listener is not None:
+            self._remove_listener()
+            self._remove_listener = None
+
+
+@callback
+@bind_hass
+def async_track_held_state(hass, period, action, check_func, entity_id, key,
+                           start_state):
+    """Track that the state of an entity keeps matching for a period.
+
+    check_func is called with the entity id, old and new state on every state
+    change of the entity. When it keeps returning True for the period, action
+    is called without arguments. Calls with the same entity, key and period
+    that start from the same state object share their tracking, so the key
+    has to describe what check_func tests.
+
+    Returns a function that can be called to stop tracking.
+    """
+    tracker = hass.data.get(DATA_HELD_STATE)
+    if tracker is None:
+        tracker = hass.data[DATA_HELD_STATE] = _HeldStateTracker(hass)
+
+    return tracker.async_track(
+        period, action, check_func, entity_id, key, start_state)
+
+
+track_held_state = threaded_listener_factory(async_track_held_state)
+
 
 @callback
 @bind_hass
@@ -0,0 +1,343 @@
+"""Helpers to forward state changes to external services."""
+import asyncio
+from collections import deque
+import json
+import logging
+import os
+
+import voluptuous as vol
+
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED)
+from homeassistant.core import callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.remote import JSONEncoder
+
+_LOGGER = logging.getLogger(__name__)
+
+CONF_BATCH_SIZE = 'batch_size'
+CONF_BATCH_TIMEOUT = 'batch_timeout'
+CONF_FILTER = 'filter'
+CONF_MAX_RETRIES = 'max_retries'
+CONF_QUEUE_SIZE = 'queue_size'
+CONF_SPOOL_SIZE = 'spool_size'
+
+DEFAULT_BATCH_SIZE = 100
+DEFAULT_BATCH_TIMEOUT = 0
+DEFAULT_MAX_RETRIES = 0
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_SPOOL_SIZE = 0
+
+RETRY_DELAY = 20
+STOP_TIMEOUT = 10
+SPOOL_DIR = '.export_spool'
+
+DATA_EXPORT_PIPELINES = 'export_pipelines'
+
+EXPORT_SCHEMA = {
+    vol.Optional(CONF_BATCH_SIZE, default=DEFAULT_BATCH_SIZE):
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(CONF_BATCH_TIMEOUT, default=DEFAULT_BATCH_TIMEOUT):
+        vol.All(vol.Coerce(float), vol.Range(min=0)),
+    vol.Optional(CONF_MAX_RETRIES, default=DEFAULT_MAX_RETRIES):
+        cv.positive_int,
+    vol.Optional(CONF_QUEUE_SIZE, default=DEFAULT_QUEUE_SIZE):
+        vol.All(vol.Coerce(int), vol.Range(min=1)),
+    vol.Optional(CONF_SPOOL_SIZE, default=DEFAULT_SPOOL_SIZE):
+        cv.positive_int,
+}
+
+
+def _state_changed_dispatcher(pipelines):
+    """Return a listener that hands state changes to the pipelines."""
+    @callback
+    def async_dispatch(event):
+        """Hand a state change to every pipeline."""
+        if event.data.get('new_state') is None:
+            return
+
+        for pipeline in pipelines:
+            pipeline.async_event_listener(event)
+
+    return async_dispatch
+
+
+class ExportPipeline(object):
+    """Forward state changes to an external service in batches.
+
+    The convert function is called in the event loop with every state
+    changed event that passes the entity filter. It returns the item to
+    export, or None to skip the event. Items are queued and handed to the
+    send function in batches of up to batch_size items, one batch at a time.
+    While a batch is being sent, new items collect in the queue, so a busy
+    pipeline sends larger batches. A batch timeout makes the pipeline wait
+    for more items before it starts sending.
+
+    The send function can be a coroutine function or a function that will
+    be run in the executor. When it raises, the batch is retried after
+    RETRY_DELAY seconds, up to max_retries times. Batches that still fail
+    are written to a spool file if a spool size is configured, and queued
+    again after the next batch that is sent successfully, also after a
+    restart. Items must be JSON serializable to be spooled.
+
+    When Home Assistant stops, the queued items are sent without retries.
+    After the first failure, or when they are not sent within STOP_TIMEOUT
+    seconds, the remaining items are spooled or dropped. A batch that is
+    still being sent at that point is counted as dropped, because its send
+    can still succeed.
+
+    All pipelines share one state changed listener.
+    """
+
+    def __init__(self, hass, name, convert, send, entity_filter=None,
+                 config=None):
+        """Initialize the pipeline."""
+        config = config or {}
+        self.hass = hass
+        self.name = name
+        self.convert = convert
+        self.send = send
+        self.entity_filter = entity_filter
+        self.batch_size = config.get(CONF_BATCH_SIZE, DEFAULT_BATCH_SIZE)
+        self.batch_timeout = config.get(
+            CONF_BATCH_TIMEOUT, DEFAULT_BATCH_TIMEOUT)
+        self.max_retries = config.get(CONF_MAX_RETRIES, DEFAULT_MAX_RETRIES)
+        self.queue_size = config.get(CONF_QUEUE_SIZE, DEFAULT_QUEUE_SIZE)
+        self.spool_size = config.get(CONF_SPOOL_SIZE, DEFAULT_SPOOL_SIZE)
+        self.spool_path = hass.config.path(SPOOL_DIR, '{}.json'.format(name))
+        self.stats = {
+            'sent': 0,
+            'batches': 0,
+            'retries': 0,
+            'dropped': 0,
+            'spooled': 0,
+        }
+        self._queue = deque()
+        self._timer = None
+        self._task = None
+        self._retry_delay = None
+        self._stopping = False
+        self._spooled = False
+
+    def start(self):
+        """Start forwarding state changes."""
+        self._spooled = self.spool_size > 0 and \
+            os.path.isfile(self.spool_path)
+        pipelines = []
+        shared = self.hass.data.setdefault(DATA_EXPORT_PIPELINES, pipelines)
+        shared.append(self)
+        if shared is pipelines:
+            self.hass.bus.listen(
+                EVENT_STATE_CHANGED, _state_changed_dispatcher(pipelines))
+        self.hass.bus.listen_once(EVENT_HOMEASSISTANT_STOP, self.async_stop)
+
+    @callback
+    def async_event_listener(self, event):
+        """Convert and queue a state change."""
+        state = event.data.get('new_state')
+        if state is None or (self.entity_filter is not None and
+                             not self.entity_filter(state.entity_id)):
+            return
+
+        # pylint: disable=broad-except
+        try:
+            item = self.convert(event)
+        except Exception:
+            _LOGGER.exception("Error converting event %s for %s",
+                              event, self.name)
+            return
+
+        if item is not None:
+            self.async_add(item)
+
+    @callback
+    def async_add(self, item):
+        """Queue an item to export."""
+        if len(self._queue) >= self.queue_size:
+            self.stats['dropped'] += 1
+            return
+
+        self._queue.append(item)
+
+        if self._task is not None:
+            return
+
+        if self.batch_timeout == 0 or len(self._queue) >= self.batch_size:
+            self.async_flush()
+        elif self._timer is None:
+            self._timer = self.hass.loop.call_later(
+                self.batch_timeout, self.async_flush)
+
+    @callback
+    def async_flush(self):
+        """Start sending the queued items."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        if self._task is None and self._queue:
+            self._task = self.hass.async_add_job(self._async_send_queue())
+
+    @asyncio.coroutine
+    def async_stop(self, event):
+        """Send the queued items before Home Assistant stops."""
+        self._stopping = True
+        if self._retry_delay is not None:
+            self._retry_delay.cancel()
+
+        self.async_flush()
+        task = self._task
+        if task is None:
+            return
+
+        _, pending = yield from asyncio.wait(
+            [task], timeout=STOP_TIMEOUT, loop=self.hass.loop)
+
+        if pending:
+            task.cancel()
+            yield from asyncio.wait([task], loop=self.hass.loop)
+            _LOGGER.error("Timeout sending %d items to %s on stop",
+                          len(self._queue), self.name)
+            yield from self._async_discard(self._async_pop_batches())
+
+    @asyncio.coroutine
+    def _async_send_queue(self):
+        """Send batches until the queue is empty."""
+        try:
+            while self._queue:
+                batch = self._async_pop_batch()
+
+                try:
+                    sent = yield from self._async_send_batch(batch)
+                except asyncio.CancelledError:
+                    # The send keeps running in the executor, spooling the
+                    # batch would export it twice after a restart.
+                    _LOGGER.error("Dropping %d items still being sent to %s",
+                                  len(batch), self.name)
+                    self.stats['dropped'] += len(batch)
+                    raise
+
+                if sent:
+                    self.stats['sent'] += len(batch)
+                    self.stats['batches'] += 1
+                    if self._spooled:
+                        yield from self._async_load_spool()
+                    continue
+
+                batches = [batch]
+                if self._stopping:
+                    # Don't wait for a failing service while stopping
+                    batches.extend(self._async_pop_batches())
+                yield from self._async_discard(batches)
+        finally:
+            self._task = None
+
+    @callback
+    def _async_pop_batch(self):
+        """Remove the next batch from the queue."""
+        return [self._queue.popleft() for _ in range(
+            min(self.batch_size, len(self._queue)))]
+
+    @callback
+    def _async_pop_batches(self):
+        """Remove all queued items as batches."""
+        batches = []
+        while self._queue:
+            batches.append(self._async_pop_batch())
+        return batches
+
+    @asyncio.coroutine
+    def _async_discard(self, batches):
+        """Spool batches that could not be sent, or drop them."""
+        if not batches:
+            return
+
+        if self.spool_size:
+            yield from self.hass.async_add_job(self._spool_batches, batches)
+        else:
+            self.stats['dropped'] += sum(len(batch) for batch in batches)
+
+    @asyncio.coroutine
+    def _async_send_batch(self, batch):
+        """Send a batch, retrying on errors. Return if it succeeded."""
+        tries = 0
+        while True:
+            # pylint: disable=broad-except
+            try:
+                yield from self.hass.async_add_job(self.send, batch)
+                return True
+            except asyncio.CancelledError:
+                raise
+            except Exception as err:
+                if tries >= self.max_retries or self._stopping:
+                    _LOGGER.error("Error sending %d items to %s: %s",
+                                  len(batch), self.name, err)
+                    return False
+
+                _LOGGER.warning("Error sending %d items to %s, retrying: "
+                                "%s", len(batch), self.name, err)
+                tries += 1
+                self.stats['retries'] += 1
+
+                # Cancelled by async_stop
+                self._retry_delay = self.hass.async_add_job(
+                    asyncio.sleep(RETRY_DELAY, loop=self.hass.loop))
+                yield from asyncio.wait(
+                    [self._retry_delay], loop=self.hass.loop)
+                self._retry_delay = None
+
+                if self._stopping:
+                    _LOGGER.error("Not retrying %d items to %s on stop",
+                                  len(batch), self.name)
+                    return False
+
+    def _spool_batches(self, batches):
+        """Append batches that could not be sent to the spool file."""
+        for batch in batches:
+            data = json.dumps(batch, cls=JSONEncoder) + '\n'
+
+            try:
+                size = os.path.getsize(self.spool_path)
+            except OSError:
+                size = 0
+
+            if size + len(data) > self.spool_size:
+                _LOGGER.error("Spool of %s is full, dropping %d items",
+                              self.name, len(batch))
+                self.stats['dropped'] += len(batch)
+                continue
+
+            os.makedirs(os.path.dirname(self.spool_path), exist_ok=True)
+            with open(self.spool_path, 'a') as spool:
+                spool.write(data)
+
+            self._spooled = True
+            self.stats['spooled'] += len(batch)
+
+    @asyncio.coroutine
+    def _async_load_spool(self):
+        """Queue the spooled batches to be sent again."""
+        self._spooled = False
+        batches = yield from self.hass.async_add_job(self._read_spool)
+
+        for batch in reversed(batches):
+            self._queue.extendleft(reversed(batch))
+
+    def _read_spool(self):
+        """Read and remove the spool file."""
+        try:
+            with open(self.spool_path) as spool:
+                lines = spool.readlines()
+            os.remove(self.spool_path)
+        except OSError as err:
+            _LOGGER.error("Unable to read spool of %s: %s", self.name, err)
+            return []
+
+        batches = []
+        for line in lines:
+            try:
+                batches.append(json.loads(line))
+            except ValueError:
+                _LOGGER.warning("Skipping invalid line in spool of %s",
+                                self.name)
+        return batches
@@ -1,11 +1,28 @@
 """Helpers for sun events."""
+import asyncio
+from collections import OrderedDict
 import datetime
+import threading
 
 from homeassistant.core import callback
 from homeassistant.util import dt as dt_util
 from homeassistant.loader import bind_hass
 
 DATA_LOCATION_CACHE = 'astral_location_cache'
+DATA_EVENT_CACHE = 'astral_event_cache'
+
+# Number of solar events and position tables kept in the cache
+EVENT_CACHE_SIZE = 256
+# Number of days ahead that are calculated in the background
+PRECOMPUTE_DAYS = 3
+# Sync platforms look up solar events from executor threads
+_EVENT_CACHE_LOCK = threading.Lock()
+# Interval of the table that the position of the sun is interpolated from
+POSITION_STEP = datetime.timedelta(minutes=10)
+
+EVENT_POSITION = 'position'
+SOLAR_EVENTS = ('dawn', 'dusk', 'solar_midnight', 'solar_noon', 'sunrise',
+                'sunset')
 
 
 @callback
@@ -30,12 +47,102 @@ def get_astral_location(hass):
     return hass.data[DATA_LOCATION_CACHE][info]
 
 
+def _calculate_astral_event(location, event, date):
+    """Calculate a solar event, or the position table, for a date.
+
+    Dates of position tables are in UTC, other dates are local.
+    """
+    import astral
+
+    if event != EVENT_POSITION:
+        try:
+            return getattr(location, event)(date, local=False)
+        except astral.AstralError:
+            # Event never occurs for specified date.
+            return None
+
+    start = datetime.datetime.combine(date, datetime.time(tzinfo=dt_util.UTC))
+    table = []
+    for step in range(int(datetime.timedelta(days=1) / POSITION_STEP) + 1):
+        point_in_time = start + step * POSITION_STEP
+        table.append((location.solar_elevation(point_in_time),
+                      location.solar_azimuth(point_in_time)))
+    return table
+
+
+@callback
+def _async_get_event_cache(hass):
+    """Return the cache of calculated solar events."""
+    with _EVENT_CACHE_LOCK:
+        cache = hass.data.get(DATA_EVENT_CACHE)
+
+        if cache is None:
+            cache = hass.data[DATA_EVENT_CACHE] = OrderedDict()
+
+        return cache
+
+
+@callback
+def _async_cache_event(cache, key, value):
+    """Store a calculated solar event, dropping the least recently used."""
+    with _EVENT_CACHE_LOCK:
+        cache[key] = value
+        cache.move_to_end(key)
+
+        while len(cache) > EVENT_CACHE_SIZE:
+            cache.popitem(last=False)
+
+
+@callback
+def _get_astral_event(hass, location, event, date):
+    """Return a solar event for a date from the cache."""
+    cache = _async_get_event_cache(hass)
+    key = (location, event, date)
+
+    with _EVENT_CACHE_LOCK:
+        if key in cache:
+            cache.move_to_end(key)
+            return cache[key]
+
+    value = _calculate_astral_event(location, event, date)
+    _async_cache_event(cache, key, value)
+    return value
+
+
+@asyncio.coroutine
+@bind_hass
+def async_precompute_astral_events(hass, days=PRECOMPUTE_DAYS):
+    """Calculate the solar events of the coming days in the executor.
+
+    This method is a coroutine.
+    """
+    location = get_astral_location(hass)
+    cache = _async_get_event_cache(hass)
+    today = dt_util.now().date()
+    utc_today = dt_util.utcnow().date()
+
+    keys = [(location, event, today + datetime.timedelta(days=day))
+            for day in range(-1, days + 1) for event in SOLAR_EVENTS]
+    keys.extend((location, EVENT_POSITION,
+                 utc_today + datetime.timedelta(days=day))
+                for day in range(days + 1))
+    with _EVENT_CACHE_LOCK:
+        keys = [key for key in keys if key not in cache]
+
+    if not keys:
+        return
+
+    values = yield from hass.async_add_job(
+        lambda: [_calculate_astral_event(*key) for key in keys])
+
+    for key, value in zip(keys, values):
+        _async_cache_event(cache, key, value)
+
+
 @callback
 @bind_hass
 def get_astral_event_next(hass, event, utc_point_in_time=None, offset=None):
     """Calculate the next specified solar event."""
-    import astral
-
     location = get_astral_location(hass)
 
     if offset is None:
@@ -44,17 +151,13 @@ def get_astral_event_next(hass, event, utc_point_in_time=None, offset=None):
     if utc_point_in_time is None:
         utc_point_in_time = dt_util.utcnow()
 
+    today = dt_util.as_local(utc_point_in_time).date()
     mod = -1
     while True:
-        try:
-            next_dt = getattr(location, event)(
-                dt_util.as_local(utc_point_in_time).date() +
-                datetime.timedelta(days=mod),
-                local=False) + offset
-            if next_dt > utc_point_in_time:
-                return next_dt
-        except astral.AstralError:
-            pass
+        event_dt = _get_astral_event(
+            hass, location, event, today + datetime.timedelta(days=mod))
+        if event_dt is not None and event_dt + offset > utc_point_in_time:
+            return event_dt + offset
         mod += 1
 
 
@@ -62,8 +165,6 @@ def get_astral_event_next(hass, event, utc_point_in_time=None, offset=None):
 @bind_hass
 def get_astral_event_date(hass, event, date=None):
     """Calculate the astral event time for the specified date."""
-    import astral
-
     location = get_astral_location(hass)
 
     if date is None:
@@ -72,11 +173,7 @@ def get_astral_event_date(hass, event, date=None):
     if isinstance(date, datetime.datetime):
         date = dt_util.as_local(date).date()
 
-    try:
-        return getattr(location, event)(date, local=False)
-    except astral.AstralError:
-        # Event never occurs for specified date.
-        return None
+    return _get_astral_event(hass, location, event, date)
 
 
 @callback
@@ -90,3 +187,33 @@ def is_up(hass, utc_point_in_time=None):
     next_sunset = get_astral_event_next(hass, 'sunset', utc_point_in_time)
 
     return next_sunrise > next_sunset
+
+
+@callback
+@bind_hass
+def get_astral_position(hass, utc_point_in_time=None):
+    """Return the elevation and azimuth of the sun.
+
+    The position is interpolated from a table of positions for the day.
+    """
+    if utc_point_in_time is None:
+        utc_point_in_time = dt_util.utcnow()
+
+    utc_point_in_time = dt_util.as_utc(utc_point_in_time)
+    table = _get_astral_event(
+        hass, get_astral_location(hass), EVENT_POSITION,
+        utc_point_in_time.date())
+
+    offset = utc_point_in_time - datetime.datetime.combine(
+        utc_point_in_time.date(), datetime.time(tzinfo=dt_util.UTC))
+    index, remainder = divmod(offset, POSITION_STEP)
+    fraction = remainder / POSITION_STEP
+
+    elevation, azimuth = table[index]
+    next_elevation, next_azimuth = table[index + 1]
+
+    # The azimuth wraps around at north
+    azimuth_change = (next_azimuth - azimuth + 180) % 360 - 180
+
+    return (elevation + (next_elevation - elevation) * fraction,
+            (azimuth + azimuth_change * fraction) % 360)
@@ -9,7 +9,13 @@ If you want to retrieve a platform that is part of a component, you should
 call get_component('switch.your_platform'). In both cases the config directory
 is checked to see if it contains a user provided version. If not available it
 will check the built-in components and platforms.
+
+The dependencies, requirements and schemas of a component can be looked up
+with get_manifest(). The manifest is read from the source without importing
+the component and is cached in the configuration directory, so resolving
+dependencies does not import the component.
 """
+import ast
 import functools as ft
 import importlib
 import logging
@@ -19,10 +25,12 @@ import sys
 
 from types import ModuleType
 # pylint: disable=unused-import
-from typing import Optional, Sequence, Set, Dict  # NOQA
+from typing import Any, Optional, Sequence, Set, Dict, Tuple  # NOQA
 
 from homeassistant.const import PLATFORM_FORMAT
+from homeassistant.exceptions import HomeAssistantError
 from homeassistant.util import OrderedSet
+from homeassistant.util.json import load_json, save_json
 
 # Typing imports
 # pylint: disable=using-constant-test,unused-import
@@ -31,6 +39,9 @@ if False:
 
 PREPARED = False
 
+# Path of the custom_components directory, set by prepare()
+CUSTOM_COMPONENTS_PATH = None  # type: Optional[str]
+
 DEPENDENCY_BLACKLIST = set(('config',))
 
 # List of available components
@@ -39,6 +50,22 @@ AVAILABLE_COMPONENTS = []  # type: List[str]
 # Dict of loaded components mapped name => module
 _COMPONENT_CACHE = {}  # type: Dict[str, ModuleType]
 
+# File in the config dir that caches the manifests between restarts
+MANIFEST_FILE = '.component_manifest.json'
+
+# Dict of component manifests mapped name => manifest
+_MANIFEST_CACHE = {}  # type: Dict[str, Dict]
+
+# Set of components whose cached manifest was checked against the source
+_MANIFEST_CHECKED = set()  # type: Set[str]
+
+# Cached list of built-in components, keyed by the mtime of their directory
+_BUILTIN_CACHE = {}  # type: Dict[str, Any]
+
+# Module level constants that are stored in a manifest
+_MANIFEST_LISTS = ('DEPENDENCIES', 'REQUIREMENTS')
+_MANIFEST_FLAGS = ('CONFIG_SCHEMA', 'PLATFORM_SCHEMA')
+
 _LOGGER = logging.getLogger(__name__)
 
 
@@ -47,19 +74,30 @@ def prepare(hass: 'HomeAssistant'):
 
     This method needs to run in an executor.
     """
-    global PREPARED  # pylint: disable=global-statement
+    # pylint: disable=global-statement
+    global PREPARED, CUSTOM_COMPONENTS_PATH
 
     # Load the built-in components
     import homeassistant.components as components
 
+    _load_manifest_cache(hass)
+
     AVAILABLE_COMPONENTS.clear()
 
-    AVAILABLE_COMPONENTS.extend(
-        item[1] for item in
-        pkgutil.iter_modules(components.__path__, 'homeassistant.components.'))
+    components_path = components.__path__[0]
+    components_mtime = os.path.getmtime(components_path)
+
+    if _BUILTIN_CACHE.get('mtime') != components_mtime:
+        _BUILTIN_CACHE['mtime'] = components_mtime
+        _BUILTIN_CACHE['components'] = [
+            item[1] for item in pkgutil.iter_modules(
+                components.__path__, 'homeassistant.components.')]
+
+    AVAILABLE_COMPONENTS.extend(_BUILTIN_CACHE['components'])
 
     # Look for available custom components
-    custom_path = hass.config.path("custom_components")
+    custom_path = CUSTOM_COMPONENTS_PATH = hass.config.path(
+        "custom_components")
 
     if os.path.isdir(custom_path):
         # Ensure we can load custom components using Pythons import
@@ -171,6 +209,175 @@ def get_component(comp_name) -> Optional[ModuleType]:
     return None
 
 
+def get_manifest(comp_name: str) -> Optional[Dict]:
+    """Return the manifest of a component without importing it if possible.
+
+    The manifest contains the dependencies, the requirements and whether the
+    component has a config or platform schema. If these can't be determined
+    from the source, the component is imported. Returns None if the
+    component has no source file.
+
+    This method needs to run in an executor, unless the manifest was
+    already returned before.
+    """
+    if comp_name in _COMPONENT_CACHE:
+        return _module_manifest(_COMPONENT_CACHE[comp_name])
+
+    if comp_name in _MANIFEST_CHECKED:
+        return _MANIFEST_CACHE[comp_name]
+
+    _check_prepared()
+
+    source = _find_source(comp_name)
+
+    # Callers report missing components themselves
+    if source is None:
+        return None
+
+    path, mtime = source
+    manifest = _MANIFEST_CACHE.get(comp_name)
+
+    if manifest is not None and manifest['path'] == path and \
+            manifest['mtime'] == mtime:
+        _MANIFEST_CHECKED.add(comp_name)
+        return manifest
+
+    manifest = _parse_manifest(path)
+
+    if manifest is not None:
+        manifest['path'] = path
+        manifest['mtime'] = mtime
+        _MANIFEST_CACHE[comp_name] = manifest
+        _MANIFEST_CHECKED.add(comp_name)
+        return manifest
+
+    # Manifest can't be determined from the source, import it instead
+    return _module_manifest(get_component(comp_name))
+
+
+def save_manifest(hass: 'HomeAssistant') -> None:
+    """Save the manifests to the configuration directory.
+
+    This method needs to run in an executor.
+    """
+    try:
+        save_json(hass.config.path(MANIFEST_FILE), {
+            'builtin': _BUILTIN_CACHE,
+            'components': _MANIFEST_CACHE,
+        })
+    except HomeAssistantError:
+        pass
+
+
+def _load_manifest_cache(hass: 'HomeAssistant') -> None:
+    """Load the manifests saved in the configuration directory."""
+    try:
+        data = load_json(hass.config.path(MANIFEST_FILE))
+    except HomeAssistantError:
+        return
+
+    if not isinstance(data, dict):
+        return
+
+    _BUILTIN_CACHE.update(data.get('builtin', {}))
+    _MANIFEST_CACHE.update(data.get('components', {}))
+    _MANIFEST_CHECKED.clear()
+
+
+def _find_source(comp_name: str) -> Optional[Tuple[str, float]]:
+    """Return the path and mtime of the source file of a component.
+
+    Looks in the config dir first, then built-in components.
+    """
+    parts = comp_name.split('.')
+
+    for package in ('custom_components', 'homeassistant.components'):
+        path = '{}.{}'.format(package, comp_name)
+        root_comp = path.rsplit('.', 1)[0] if len(parts) > 1 else path
+
+        if root_comp not in AVAILABLE_COMPONENTS:
+            continue
+
+        if package == 'custom_components':
+            base = os.path.join(CUSTOM_COMPONENTS_PATH, *parts)
+        else:
+            base = os.path.join(os.path.dirname(__file__), 'components',
+                                *parts)
+
+        for source in (base + '.py', os.path.join(base, '__init__.py')):
+            try:
+                return source, os.path.getmtime(source)
+            except OSError:
+                continue
+
+    return None
+
+
+def _parse_manifest(path: str) -> Optional[Dict]:
+    """Parse the manifest of a component from its source.
+
+    Returns None if the manifest can only be determined by importing.
+    """
+    try:
+        with open(path, encoding='utf-8') as source:
+            tree = ast.parse(source.read(), path)
+    except (OSError, SyntaxError, ValueError):
+        return None
+
+    manifest = {
+        'dependencies': [],
+        'requirements': [],
+        'config_schema': False,
+        'platform_schema': False,
+    }  # type: Dict[str, Any]
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign):
+            names = [target.id for target in node.targets
+                     if isinstance(target, ast.Name)]
+        elif isinstance(node, ast.ImportFrom):
+            names = [alias.asname or alias.name for alias in node.names]
+        elif isinstance(node, (ast.If, ast.Try)):
+            names = [target.id for child in ast.walk(node)
+                     if isinstance(child, ast.Assign)
+                     for target in child.targets
+                     if isinstance(target, ast.Name)]
+            # Conditionally set lists can only be known by importing
+            if any(name in _MANIFEST_LISTS for name in names):
+                return None
+        else:
+            continue
+
+        for name in names:
+            if name in _MANIFEST_FLAGS:
+                manifest[name.lower()] = True
+            elif name in _MANIFEST_LISTS:
+                if not isinstance(node, ast.Assign):
+                    return None
+                try:
+                    value = ast.literal_eval(node.value)
+                except ValueError:
+                    return None
+                if not isinstance(value, (list, tuple)):
+                    return None
+                manifest[name.lower()] = list(value)
+
+    return manifest
+
+
+def _module_manifest(module: Optional[ModuleType]) -> Optional[Dict]:
+    """Return the manifest of an imported component."""
+    if module is None:
+        return None
+
+    return {
+        'dependencies': list(getattr(module, 'DEPENDENCIES', [])),
+        'requirements': list(getattr(module, 'REQUIREMENTS', [])),
+        'config_schema': hasattr(module, 'CONFIG_SCHEMA'),
+        'platform_schema': hasattr(module, 'PLATFORM_SCHEMA'),
+    }
+
+
 class Components:
     """Helper to load components."""
 
@@ -236,7 +443,7 @@ def load_order_component(comp_name: str) -> OrderedSet:
     Raises HomeAssistantError if a circular dependency is detected.
     Returns an empty list if component could not be loaded.
 
-    Async friendly.
+    This method needs to run in an executor.
     """
     return _load_order_component(comp_name, OrderedSet(), set())
 
@@ -245,17 +452,17 @@ def _load_order_component(comp_name: str, load_order: OrderedSet,
                           loading: Set) -> OrderedSet:
     """Recursive function to get load order of components.
 
-    Async friendly.
+    This method needs to run in an executor.
     """
-    component = get_component(comp_name)
+    manifest = get_manifest(comp_name)
 
-    # If None it does not exist, error already thrown by get_component.
-    if component is None:
+    # If None it does not exist, which the caller reports.
+    if manifest is None:
         return OrderedSet()
 
     loading.add(comp_name)
 
-    for dependency in getattr(component, 'DEPENDENCIES', []):
+    for dependency in manifest['dependencies']:
         # Check not already loaded
         if dependency in load_order:
             continue
@@ -33,9 +33,12 @@ MOCKS = {
 }
 SILENCE = (
     'homeassistant.bootstrap.clear_secret_cache',
+    'homeassistant.bootstrap.load_cache',
+    'homeassistant.bootstrap.save_cache',
     'homeassistant.bootstrap.async_register_signal_handling',
     'homeassistant.core._LOGGER.info',
     'homeassistant.loader._LOGGER.info',
+    'homeassistant.loader.save_manifest',
     'homeassistant.bootstrap._LOGGER.info',
     'homeassistant.bootstrap._LOGGER.warning',
     'homeassistant.util.yaml._LOGGER.debug',
@@ -244,7 +247,10 @@ def check(config_path):
     for pat in PATCHES.values():
         pat.start()
     # Ensure !secrets point to the patched function
-    yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
+    for loader_cls in yaml.CONSTRUCTOR_LOADERS:
+        loader_cls.add_constructor('!secret', yaml._secret_yaml)
+    # Ensure all files are parsed so all secrets are recorded
+    yaml.clear_cache()
 
     try:
         with patch('homeassistant.util.logging.AsyncHandler._process'):
@@ -258,7 +264,8 @@ def check(config_path):
         for pat in PATCHES.values():
             pat.stop()
         # Ensure !secrets point to the original function
-        yaml.yaml.SafeLoader.add_constructor('!secret', yaml._secret_yaml)
+        for loader_cls in yaml.CONSTRUCTOR_LOADERS:
+            loader_cls.add_constructor('!secret', yaml._secret_yaml)
         bootstrap.clear_secret_cache()
 
     return res
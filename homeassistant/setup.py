@@ -14,6 +14,7 @@ import homeassistant.util.package as pkg_util
 from homeassistant.config import async_notify_setup_error
 from homeassistant.const import (
     EVENT_COMPONENT_LOADED, PLATFORM_FORMAT, CONSTRAINT_FILE)
+from homeassistant.helpers import config_per_platform
 from homeassistant.util.async import run_coroutine_threadsafe
 
 _LOGGER = logging.getLogger(__name__)
@@ -21,6 +22,7 @@ _LOGGER = logging.getLogger(__name__)
 ATTR_COMPONENT = 'component'
 
 DATA_SETUP = 'setup_tasks'
+DATA_SETUP_TIMELINE = 'setup_timeline'
 DATA_PIP_LOCK = 'pip_lock'
 
 SLOW_SETUP_WARNING = 10
@@ -60,6 +62,18 @@ def async_setup_component(hass: core.HomeAssistant, domain: str,
     return (yield from task)
 
 
+def async_get_setup_timeline(hass: core.HomeAssistant) -> Dict[str, Dict]:
+    """Return the setup timeline of all components set up so far.
+
+    Maps each domain to a dictionary with the seconds spent waiting for
+    requirements and dependencies (wait), the seconds spent in the setup of
+    the component itself (setup) and whether the setup succeeded (success).
+
+    Async friendly.
+    """
+    return dict(hass.data.get(DATA_SETUP_TIMELINE, {}))
+
+
 @asyncio.coroutine
 def _async_process_requirements(hass: core.HomeAssistant, name: str,
                                 requirements) -> bool:
@@ -129,6 +143,16 @@ def _async_process_dependencies(hass, config, name, dependencies):
     return True
 
 
+def _resolve_platforms(domain: str, config: Dict) -> None:
+    """Resolve the manifests of the platforms configured for a component.
+
+    This method needs to run in an executor.
+    """
+    for p_name, _ in config_per_platform(config, domain):
+        if isinstance(p_name, str):
+            loader.get_manifest(PLATFORM_FORMAT.format(domain, p_name))
+
+
 @asyncio.coroutine
 def _async_setup_component(hass: core.HomeAssistant,
                            domain: str, config) -> bool:
@@ -141,6 +165,7 @@ def _async_setup_component(hass: core.HomeAssistant,
         _LOGGER.error("Setup failed for %s: %s", domain, msg)
         async_notify_setup_error(hass, domain, link)
 
+    requested = timer()
     component = loader.get_component(domain)
 
     if not component:
@@ -148,13 +173,17 @@ def _async_setup_component(hass: core.HomeAssistant,
         return False
 
     # Validate no circular dependencies
-    components = loader.load_order_component(domain)
+    components = yield from hass.async_add_job(
+        loader.load_order_component, domain)
 
     # OrderedSet is empty if component or dependencies could not be resolved
     if not components:
         log_error("Unable to resolve component or dependencies.")
         return False
 
+    # Config validation looks up the manifests of the platforms
+    yield from hass.async_add_job(_resolve_platforms, domain, config)
+
     processed_config = \
         conf_util.async_process_component_config(hass, config, domain)
 
@@ -205,6 +234,11 @@ def _async_setup_component(hass: core.HomeAssistant,
         end = timer()
         if warn_task:
             warn_task.cancel()
+        hass.data.setdefault(DATA_SETUP_TIMELINE, {})[domain] = {
+            'wait': start - requested,
+            'setup': end - start,
+            'success': False,
+        }
     _LOGGER.info("Setup of domain %s took %.1f seconds.", domain, end - start)
 
     if result is False:
@@ -217,6 +251,7 @@ def _async_setup_component(hass: core.HomeAssistant,
         return False
 
     hass.config.components.add(component.DOMAIN)
+    hass.data[DATA_SETUP_TIMELINE][domain]['success'] = True
 
     # Cleanup
     if domain in hass.data[DATA_SETUP]:
@@ -245,32 +280,39 @@ def async_prepare_setup_platform(hass: core.HomeAssistant, config, domain: str,
                       platform_path, msg)
         async_notify_setup_error(hass, platform_path)
 
-    platform = loader.get_platform(domain, platform_name)
+    manifest = yield from hass.async_add_job(
+        loader.get_manifest, platform_path)
 
     # Not found
-    if platform is None:
+    if manifest is None:
         log_error("Platform not found.")
         return None
 
     # Already loaded
     elif platform_path in hass.config.components:
-        return platform
+        return loader.get_component(platform_path)
 
     # Load dependencies
-    if hasattr(platform, 'DEPENDENCIES'):
+    if manifest['dependencies']:
         dep_success = yield from _async_process_dependencies(
-            hass, config, platform_path, platform.DEPENDENCIES)
+            hass, config, platform_path, manifest['dependencies'])
 
         if not dep_success:
             log_error("Could not setup all dependencies.")
             return None
 
-    if not hass.config.skip_pip and hasattr(platform, 'REQUIREMENTS'):
+    if not hass.config.skip_pip and manifest['requirements']:
         req_success = yield from _async_process_requirements(
-            hass, platform_path, platform.REQUIREMENTS)
+            hass, platform_path, manifest['requirements'])
 
         if not req_success:
             log_error("Could not install all requirements.")
             return None
 
+    # Only import the platform now that it is going to be set up
+    platform = loader.get_component(platform_path)
+
+    if platform is None:
+        log_error("Platform could not be loaded.")
+
     return platform
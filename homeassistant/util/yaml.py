@@ -1,10 +1,13 @@
 """YAML utility functions."""
+import json
 import logging
 import os
+import pickle
 import sys
 import fnmatch
+import threading
 from collections import OrderedDict
-from typing import Union, List, Dict
+from typing import Any, Union, List, Dict, Optional, Tuple  # NOQA
 
 import yaml
 try:
@@ -22,8 +25,26 @@ from homeassistant.exceptions import HomeAssistantError
 _LOGGER = logging.getLogger(__name__)
 _SECRET_NAMESPACE = 'homeassistant'
 SECRET_YAML = 'secrets.yaml'
+CACHE_FILE = '.yaml_cache'
 __SECRET_CACHE = {}  # type: Dict
 
+# Parsed files mapped filename => (dependencies, pickled data). The
+# dependencies map the filenames, directories and environment variables
+# the result was built from to their stamp when the file was parsed.
+# The pickled data never leaves memory, the cache file stores JSON.
+_YAML_CACHE = {}  # type: Dict[str, Tuple[Dict, bytes]]
+_YAML_CACHE_VERSION = 2
+# Dependency key for results that can't be cached, like keyring secrets
+_UNCACHEABLE = '!uncacheable'
+# Dependency key for results with secrets, which are not saved to disk
+_SECRET = '!secret'
+# Keys of the JSON objects that encode parsed nodes in the cache file
+_NODE_DICT = '!dict'
+_NODE_LIST = '!list'
+_NODE_STR = '!str'
+_NODE_REFERENCE = '!ref'
+_LOADING = threading.local()
+
 
 class NodeListClass(list):
     """Wrapper class to be able to add attributes on a list."""
@@ -61,13 +82,83 @@ class SafeLineLoader(yaml.SafeLoader):
         return node
 
 
+if getattr(yaml, '__with_libyaml__', False):
+    # pylint: disable=too-many-ancestors,no-member
+    class FastSafeLineLoader(yaml.CSafeLoader):
+        """Loader class using libyaml.
+
+        The line numbers are taken from the start marks of the nodes.
+        """
+
+        def __init__(self, stream) -> None:
+            """Initialize the loader."""
+            super().__init__(stream)
+            self.name = getattr(stream, 'name', '<file>')
+            self.stream = stream
+
+    LOADER = FastSafeLineLoader  # type: Any
+    CONSTRUCTOR_LOADERS = (yaml.SafeLoader, FastSafeLineLoader)  # type: Any
+else:
+    LOADER = SafeLineLoader
+    CONSTRUCTOR_LOADERS = (yaml.SafeLoader,)
+
+
 def load_yaml(fname: str) -> Union[List, Dict]:
-    """Load a YAML file."""
+    """Load a YAML file.
+
+    The result is cached until the file, or a file, directory or environment
+    variable used by it, changes.
+    """
+    stack = getattr(_LOADING, 'stack', None)
+    if stack is None:
+        stack = _LOADING.stack = []
+
+    cached = _YAML_CACHE.get(fname)
+
+    if cached is not None and _dependencies_valid(cached[0]):
+        if stack:
+            stack[-1].update(cached[0])
+        return pickle.loads(cached[1])
+
+    dependencies = {}  # type: Dict[str, Any]
+    stamp = _stamp(fname)
+
+    if stamp is None:
+        dependencies[_UNCACHEABLE] = True
+    else:
+        dependencies[fname] = stamp
+
+    if os.path.basename(fname) == SECRET_YAML:
+        dependencies[_SECRET] = True
+
+    stack.append(dependencies)
+    try:
+        result = _parse_yaml(fname)
+    finally:
+        stack.pop()
+
+    if stack:
+        stack[-1].update(dependencies)
+
+    if _UNCACHEABLE in dependencies:
+        _YAML_CACHE.pop(fname, None)
+    else:
+        try:
+            _YAML_CACHE[fname] = (dependencies, pickle.dumps(
+                result, pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError):
+            _YAML_CACHE.pop(fname, None)
+
+    return result
+
+
+def _parse_yaml(fname: str) -> Union[List, Dict]:
+    """Parse a YAML file, using libyaml if available."""
     try:
         with open(fname, encoding='utf-8') as conf_file:
             # If configuration file is empty YAML returns None
             # We convert that to an empty dict
-            return yaml.load(conf_file, Loader=SafeLineLoader) or OrderedDict()
+            return yaml.load(conf_file, Loader=LOADER) or OrderedDict()
     except yaml.YAMLError as exc:
         _LOGGER.error(exc)
         raise HomeAssistantError(exc)
@@ -76,6 +167,131 @@ def load_yaml(fname: str) -> Union[List, Dict]:
         raise HomeAssistantError(exc)
 
 
+def _stamp(path: str) -> Optional[List[int]]:
+    """Return the modification stamp of a file or directory."""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [stat.st_mtime_ns, stat.st_size]
+
+
+def _add_dependency(key: str, stamp: Any) -> None:
+    """Record a dependency of the file that is being loaded."""
+    stack = getattr(_LOADING, 'stack', None)
+    if stack:
+        stack[-1][key] = stamp
+
+
+def _dependencies_valid(dependencies: Dict[str, Any]) -> bool:
+    """Test if the dependencies of a cached file are unchanged."""
+    for key, stamp in dependencies.items():
+        if key == _SECRET:
+            continue
+        elif key.startswith('$'):
+            if os.environ.get(key[1:]) != stamp:
+                return False
+        elif _stamp(key) != stamp:
+            return False
+    return True
+
+
+def clear_cache() -> None:
+    """Clear the cache of parsed files."""
+    _YAML_CACHE.clear()
+
+
+def load_cache(fname: str) -> None:
+    """Load the cache of parsed files from disk."""
+    try:
+        with open(fname, encoding='utf-8') as cache_file:
+            data = json.load(cache_file, object_hook=_decode_node)
+    except FileNotFoundError:
+        return
+    except (OSError, TypeError, ValueError) as exc:
+        _LOGGER.warning("Unable to load YAML cache %s: %s", fname, exc)
+        return
+
+    if not isinstance(data, dict) or \
+            data.get('version') != _YAML_CACHE_VERSION:
+        return
+
+    try:
+        for name, (dependencies, result) in data['files'].items():
+            if isinstance(dependencies, dict):
+                _YAML_CACHE[name] = (dependencies, pickle.dumps(
+                    result, pickle.HIGHEST_PROTOCOL))
+    except (AttributeError, KeyError, TypeError, ValueError) as exc:
+        _LOGGER.warning("Unable to load YAML cache %s: %s", fname, exc)
+
+
+def save_cache(fname: str) -> None:
+    """Save the cache of parsed files without secrets to disk."""
+    files = {}
+    for name, (dependencies, data) in _YAML_CACHE.items():
+        if _SECRET in dependencies:
+            continue
+
+        try:
+            files[name] = (dependencies, _encode_node(pickle.loads(data)))
+        except TypeError:
+            # Values like dates have no JSON form, parse the file again
+            continue
+
+    tmp_fname = '{}.tmp'.format(fname)
+    try:
+        with open(tmp_fname, 'w', encoding='utf-8') as cache_file:
+            json.dump({
+                'version': _YAML_CACHE_VERSION,
+                'files': files,
+            }, cache_file)
+        os.replace(tmp_fname, fname)
+    except OSError as exc:
+        _LOGGER.warning("Unable to save YAML cache %s: %s", fname, exc)
+
+
+def _encode_node(node: Any) -> Any:
+    """Return the JSON form of a parsed node, keeping its file and line."""
+    if node is None or type(node) in (bool, int, float, str):
+        return node
+
+    if isinstance(node, dict):
+        encoded = {_NODE_DICT: [[_encode_node(key), _encode_node(value)]
+                                for key, value in node.items()]}
+    elif isinstance(node, list):
+        items = [_encode_node(item) for item in node]
+        if not hasattr(node, '__line__'):
+            return items
+        encoded = {_NODE_LIST: items}
+    elif isinstance(node, str):
+        encoded = {_NODE_STR: str(node)}
+    else:
+        raise TypeError("Unable to encode {}".format(type(node).__name__))
+
+    if hasattr(node, '__line__'):
+        encoded[_NODE_REFERENCE] = [node.__config_file__, node.__line__]
+
+    return encoded
+
+
+def _decode_node(obj: Dict) -> Any:
+    """Return the parsed node of a JSON object from the cache file."""
+    if _NODE_DICT in obj:
+        node = OrderedDict(
+            (key, value) for key, value in obj[_NODE_DICT])  # type: Any
+    elif _NODE_LIST in obj:
+        node = NodeListClass(obj[_NODE_LIST])
+    elif _NODE_STR in obj:
+        node = NodeStrClass(obj[_NODE_STR])
+    else:
+        return obj
+
+    if _NODE_REFERENCE in obj:
+        node.__config_file__, node.__line__ = obj[_NODE_REFERENCE]
+
+    return node
+
+
 def dump(_dict: dict) -> str:
     """Dump YAML to a string and remove null."""
     return yaml.safe_dump(
@@ -110,6 +326,7 @@ def _is_file_valid(name: str) -> bool:
 def _find_files(directory: str, pattern: str):
     """Recursively load files in a directory."""
     for root, dirs, files in os.walk(directory, topdown=True):
+        _add_dependency(root, _stamp(root))
         dirs[:] = [d for d in dirs if _is_file_valid(d)]
         for basename in files:
             if _is_file_valid(basename) and fnmatch.fnmatch(basename, pattern):
@@ -204,6 +421,7 @@ def _env_var_yaml(loader: SafeLineLoader,
                   node: yaml.nodes.Node):
     """Load environment variables and embed it into the configuration YAML."""
     args = node.value.split()
+    _add_dependency('$' + args[0], os.environ.get(args[0]))
 
     # Check for a default value
     if len(args) > 1:
@@ -242,8 +460,12 @@ def _load_secret_yaml(secret_path: str) -> Dict:
 def _secret_yaml(loader: SafeLineLoader,
                  node: yaml.nodes.Node):
     """Load secrets and embed it into the configuration YAML."""
+    _add_dependency(_SECRET, True)
+
     secret_path = os.path.dirname(loader.name)
     while True:
+        secret_file = os.path.join(secret_path, SECRET_YAML)
+        _add_dependency(secret_file, _stamp(secret_file))
         secrets = _load_secret_yaml(secret_path)
 
         if node.value in secrets:
@@ -258,6 +480,9 @@ def _secret_yaml(loader: SafeLineLoader,
         if not os.path.exists(secret_path) or len(secret_path) < 5:
             break  # Somehow we got past the .homeassistant config folder
 
+    # Secrets from keyring or credstash can change at any time
+    _add_dependency(_UNCACHEABLE, True)
+
     if keyring:
         # do some keyring stuff
         pwd = keyring.get_password(_SECRET_NAMESPACE, node.value)
@@ -283,19 +508,20 @@ def _secret_yaml(loader: SafeLineLoader,
     raise HomeAssistantError(node.value)
 
 
-yaml.SafeLoader.add_constructor('!include', _include_yaml)
-yaml.SafeLoader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
-                                _ordered_dict)
-yaml.SafeLoader.add_constructor(
-    yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq)
-yaml.SafeLoader.add_constructor('!env_var', _env_var_yaml)
-yaml.SafeLoader.add_constructor('!secret', _secret_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_list', _include_dir_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_list',
-                                _include_dir_merge_list_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_named', _include_dir_named_yaml)
-yaml.SafeLoader.add_constructor('!include_dir_merge_named',
-                                _include_dir_merge_named_yaml)
+for _loader in CONSTRUCTOR_LOADERS:
+    _loader.add_constructor('!include', _include_yaml)
+    _loader.add_constructor(yaml.resolver.BaseResolver.DEFAULT_MAPPING_TAG,
+                            _ordered_dict)
+    _loader.add_constructor(
+        yaml.resolver.BaseResolver.DEFAULT_SEQUENCE_TAG, _construct_seq)
+    _loader.add_constructor('!env_var', _env_var_yaml)
+    _loader.add_constructor('!secret', _secret_yaml)
+    _loader.add_constructor('!include_dir_list', _include_dir_list_yaml)
+    _loader.add_constructor('!include_dir_merge_list',
+                            _include_dir_merge_list_yaml)
+    _loader.add_constructor('!include_dir_named', _include_dir_named_yaml)
+    _loader.add_constructor('!include_dir_merge_named',
+                            _include_dir_merge_named_yaml)
 
 
 # From: https://gist.github.com/miracle2k/3184458
@@ -527,6 +527,47 @@ class TestAutomation(unittest.TestCase):
         self.hass.block_till_done()
         assert len(self.calls) == 2
 
+    def test_reload_config_keeps_unchanged_automations(self):
+        """Test reloading only replaces the changed automations."""
+        hello = {
+            'alias': 'hello',
+            'trigger': {
+                'platform': 'state',
+                'entity_id': 'test.entity',
+                'to': 'world',
+                'for': {'seconds': 5},
+            },
+            'action': {'service': 'test.automation'},
+        }
+        bye = {
+            'alias': 'bye',
+            'trigger': {'platform': 'event', 'event_type': 'test_event'},
+            'action': {'service': 'test.automation'},
+        }
+        assert setup_component(self.hass, automation.DOMAIN, {
+            automation.DOMAIN: [hello, bye]
+        })
+
+        self.hass.states.set('test.entity', 'world')
+        self.hass.block_till_done()
+
+        changed_bye = dict(bye, trigger={
+            'platform': 'event', 'event_type': 'test_event2'})
+        with patch('homeassistant.config.load_yaml_config_file', autospec=True,
+                   return_value={automation.DOMAIN: [hello, changed_bye]}):
+            automation.reload(self.hass)
+            self.hass.block_till_done()
+
+        assert self.hass.states.get('automation.hello') is not None
+        listeners = self.hass.bus.listeners
+        assert listeners.get('test_event') is None
+        assert listeners.get('test_event2') == 1
+
+        # The pending 'for' of the unchanged automation is not reset
+        fire_time_changed(self.hass, dt_util.utcnow() + timedelta(seconds=10))
+        self.hass.block_till_done()
+        assert len(self.calls) == 1
+
 
 @asyncio.coroutine
 def test_automation_restore_state(hass):
@@ -100,25 +100,50 @@ class TestGetImage(object):
             run_coroutine_threadsafe(camera.async_get_image(
                 self.hass, 'camera.demo_camera'), self.hass.loop).result()
 
-    def test_get_image_with_timeout(self, aioclient_mock):
+    def test_get_image_with_timeout(self):
         """Try to get image with timeout."""
-        aioclient_mock.get(self.url, exc=asyncio.TimeoutError())
-
-        with pytest.raises(HomeAssistantError):
+        with patch('async_timeout.timeout',
+                   side_effect=asyncio.TimeoutError()), \
+                pytest.raises(HomeAssistantError):
             run_coroutine_threadsafe(camera.async_get_image(
                 self.hass, 'camera.demo_camera'), self.hass.loop).result()
 
-        assert len(aioclient_mock.mock_calls) == 1
-
-    def test_get_image_with_bad_http_state(self, aioclient_mock):
-        """Try to get image with bad http status."""
-        aioclient_mock.get(self.url, status=400)
-
+    @patch('homeassistant.components.camera.demo.DemoCamera.camera_image',
+           autospec=True, return_value=None)
+    def test_get_image_without_image(self, mock_camera):
+        """Try to get image when the camera returns none."""
         with pytest.raises(HomeAssistantError):
             run_coroutine_threadsafe(camera.async_get_image(
                 self.hass, 'camera.demo_camera'), self.hass.loop).result()
 
-        assert len(aioclient_mock.mock_calls) == 1
+        assert mock_camera.called
+
+    @patch('homeassistant.components.camera.demo.DemoCamera.camera_image',
+           autospec=True, return_value=b'Test')
+    def test_get_image_shared(self, mock_camera):
+        """Test concurrent and recent requests share one frame."""
+        @asyncio.coroutine
+        def get_images():
+            """Request images concurrently and then again."""
+            images = yield from asyncio.gather(*(
+                camera.async_get_image(self.hass, 'camera.demo_camera')
+                for _ in range(3)), loop=self.hass.loop)
+            images.append((yield from camera.async_get_image(
+                self.hass, 'camera.demo_camera')))
+            images.append((yield from camera.async_get_image(
+                self.hass, 'camera.demo_camera', max_age=0)))
+            return images
+
+        images = run_coroutine_threadsafe(
+            get_images(), self.hass.loop).result()
+
+        assert images == [b'Test'] * 5
+        assert len(mock_camera.mock_calls) == 2
+        assert self.hass.data[camera.DATA_FRAME_CACHE].stats == {
+            'hits': 1,
+            'misses': 2,
+            'coalesced': 2,
+        }
 
 
 @asyncio.coroutine
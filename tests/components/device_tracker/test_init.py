@@ -4,7 +4,7 @@ import asyncio
 import json
 import logging
 import unittest
-from unittest.mock import call, patch
+from unittest.mock import call, patch, MagicMock
 from datetime import datetime, timedelta
 import os
 
@@ -13,11 +13,13 @@ from homeassistant.core import callback, State
 from homeassistant.setup import setup_component
 from homeassistant.helpers import discovery
 from homeassistant.loader import get_component
-from homeassistant.util.async import run_coroutine_threadsafe
+from homeassistant.util.async import (
+    run_callback_threadsafe, run_coroutine_threadsafe)
 import homeassistant.util.dt as dt_util
 from homeassistant.const import (
     ATTR_ENTITY_ID, ATTR_ENTITY_PICTURE, ATTR_FRIENDLY_NAME, ATTR_HIDDEN,
-    STATE_HOME, STATE_NOT_HOME, CONF_PLATFORM, ATTR_ICON)
+    STATE_HOME, STATE_NOT_HOME, CONF_PLATFORM, ATTR_ICON,
+    EVENT_HOMEASSISTANT_STOP)
 import homeassistant.components.device_tracker as device_tracker
 from homeassistant.exceptions import HomeAssistantError
 from homeassistant.remote import JSONEncoder
@@ -48,11 +50,13 @@ class TestComponentsDeviceTracker(unittest.TestCase):
     # pylint: disable=invalid-name
     def tearDown(self):
         """Stop everything that was started."""
-        if os.path.isfile(self.yaml_devices):
-            os.remove(self.yaml_devices)
-
         self.hass.stop()
 
+        for path in (self.yaml_devices,
+                     self.hass.config.path(device_tracker.JSON_DEVICES)):
+            if os.path.isfile(path):
+                os.remove(path)
+
     def test_is_on(self):
         """Test is_on method."""
         entity_id = device_tracker.ENTITY_ID_FORMAT.format('test')
@@ -360,6 +364,38 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         self.assertEqual(STATE_NOT_HOME,
                          self.hass.states.get('device_tracker.dev1').state)
 
+    def test_update_stale_heap(self):
+        """Test only the devices that expire are updated."""
+        tracker = device_tracker.DeviceTracker(
+            self.hass, timedelta(seconds=60), True, {}, [])
+        start = datetime(2015, 9, 15, 23, tzinfo=dt_util.UTC)
+
+        for dev_id, offset in (('first', 0), ('second', 30), ('first', 20)):
+            with patch('homeassistant.components.device_tracker.dt_util.'
+                       'utcnow', return_value=start + timedelta(
+                           seconds=offset)):
+                run_coroutine_threadsafe(tracker.async_see(
+                    dev_id=dev_id, source_type='router'),
+                    self.hass.loop).result()
+        assert len(tracker._stale_heap) == 2
+
+        with patch.object(device_tracker.Device, 'async_update_ha_state',
+                          return_value=mock_coro()) as mock_update:
+            # first was seen again, so it is pushed back
+            run_callback_threadsafe(
+                self.hass.loop, tracker.async_update_stale,
+                start + timedelta(seconds=70)).result()
+            assert mock_update.call_count == 0
+            assert [dev_id for _, dev_id in tracker._stale_heap] == \
+                ['first', 'second']
+
+            run_callback_threadsafe(
+                self.hass.loop, tracker.async_update_stale,
+                start + timedelta(seconds=85)).result()
+            assert mock_update.call_count == 1
+            assert [dev_id for _, dev_id in tracker._stale_heap] == \
+                ['second']
+
     def test_entity_attributes(self):
         """Test the entity attributes."""
         dev_id = 'test_entity'
@@ -620,6 +656,186 @@ class TestComponentsDeviceTracker(unittest.TestCase):
         self.assertEqual(attrs.get('source_type'),
                          device_tracker.SOURCE_TYPE_ROUTER)
 
+    def test_see_many(self):
+        """Test that a batch of devices is seen at once."""
+        tracker = device_tracker.DeviceTracker(
+            self.hass, timedelta(seconds=60), True, {}, [])
+        tracker.group = MagicMock()
+        seen = [{'mac': 'mac_1', 'host_name': 'one'}, {'mac': 'mac_2'}]
+
+        with patch('homeassistant.components.device_tracker._LOGGER.error') \
+                as mock_error:
+            run_coroutine_threadsafe(
+                tracker.async_see_many(seen + [{}]), self.hass.loop).result()
+            self.hass.block_till_done()
+        assert mock_error.call_count == 1
+
+        assert tracker.group.async_set_group.call_count == 1
+        assert tracker.group.async_set_group.call_args[1]['add'] == [
+            'device_tracker.one', 'device_tracker.mac_2']
+        assert self.hass.states.get('device_tracker.one').state == STATE_HOME
+        config = device_tracker.load_config(self.yaml_devices, self.hass,
+                                            timedelta(seconds=0))
+        assert [device.dev_id for device in config] == ['one', 'mac_2']
+
+        seen = [{'mac': 'mac_1'}, {'mac': 'mac_2', 'location_name': 'Work'}]
+        with patch.object(device_tracker.Device, 'async_update_ha_state',
+                          return_value=mock_coro()) as mock_update:
+            run_coroutine_threadsafe(
+                tracker.async_see_many(seen), self.hass.loop).result()
+            self.hass.block_till_done()
+
+        # Only the device that moved is written
+        assert mock_update.call_count == 1
+        assert tracker.group.async_set_group.call_count == 1
+
+    def test_see_many_unique_ids(self):
+        """Test new devices of a batch get unique device ids."""
+        tracker = device_tracker.DeviceTracker(
+            self.hass, timedelta(seconds=60), False, {}, [])
+        run_coroutine_threadsafe(tracker.async_see_many([
+            {'mac': 'mac_1', 'host_name': 'phone'},
+            {'mac': 'mac_2', 'host_name': 'phone'},
+        ]), self.hass.loop).result()
+        self.hass.block_till_done()
+
+        assert sorted(tracker.devices) == ['phone', 'phone_2']
+
+    def test_see_many_vendor_lookups(self):
+        """Test the vendors of new devices are looked up one at a time."""
+        tracker = device_tracker.DeviceTracker(
+            self.hass, timedelta(seconds=60), False, {}, [])
+        running = []
+        overlapping = []
+
+        @asyncio.coroutine
+        def get_vendor_for_mac(device):
+            """Record lookups that run at the same time."""
+            running.append(device)
+            overlapping.append(len(running) > 1)
+            yield from asyncio.sleep(0, loop=self.hass.loop)
+            running.remove(device)
+            return 'Vendor'
+
+        with patch.object(device_tracker.Device, 'get_vendor_for_mac',
+                          autospec=True, side_effect=get_vendor_for_mac):
+            run_coroutine_threadsafe(tracker.async_see_many([
+                {'mac': 'AA:BB:CC:DD:EE:01'}, {'mac': 'AA:BB:CC:DD:EE:02'},
+            ]), self.hass.loop).result()
+
+        assert overlapping == [False, False]
+        assert [device.vendor for device in tracker.devices.values()] == \
+            ['Vendor', 'Vendor']
+
+    def _load_store(self, evict_after=None):
+        """Create and load a device store."""
+        store = device_tracker.DeviceStore(
+            self.hass, self.hass.config.path(device_tracker.JSON_DEVICES),
+            self.yaml_devices, timedelta(seconds=60), evict_after)
+        run_coroutine_threadsafe(store.async_load(), self.hass.loop).result()
+        return store
+
+    def test_store_import_yaml(self):
+        """Test known_devices.yaml is imported into the device store."""
+        with open(self.yaml_devices, 'w') as out:
+            out.write('phone:\n  name: Phone\n  track: true\n'
+                      '  mac: aa:bb\n'
+                      'guest:\n  name: Guest\n  mac: cc:dd\n'
+                      'invalid:\n  track: true\n')
+
+        store = self._load_store()
+        assert sorted(store.entries) == ['guest', 'phone']
+        assert [dev.dev_id for dev in store.async_tracked_devices()] == \
+            ['phone']
+
+        device = store.async_get_device(mac='CC:DD')
+        assert device.dev_id == 'guest'
+        assert device.name == 'Guest'
+        assert not device.track
+        assert store.async_get_device(mac='EE:FF') is None
+
+        self.hass.add_job(store._async_save)
+        self.hass.block_till_done()
+
+        # The YAML file is not imported again while it is unchanged
+        with patch('homeassistant.components.device_tracker.'
+                   'async_load_config') as mock_load:
+            store = self._load_store()
+        assert not mock_load.called
+        assert sorted(store.entries) == ['guest', 'phone']
+
+    def test_store_eviction(self):
+        """Test untracked devices that were not seen are evicted."""
+        now = dt_util.utcnow().timestamp()
+        store = self._load_store(timedelta(days=30))
+        store.entries.update({
+            'phone': {'name': 'Phone', 'track': True, 'last_seen': 0},
+            'old_guest': {'name': 'Old', 'mac': 'AA', 'last_seen': 0},
+            'guest': {'name': 'Guest', 'mac': 'BB', 'last_seen': now},
+        })
+        store.mac_to_id.update({'AA': 'old_guest', 'BB': 'guest'})
+
+        self.hass.add_job(store._async_save)
+        self.hass.block_till_done()
+
+        assert sorted(store.entries) == ['guest', 'phone']
+        assert store.mac_to_id == {'BB': 'guest'}
+        store = self._load_store()
+        assert sorted(store.entries) == ['guest', 'phone']
+
+    def test_see_with_store(self):
+        """Test stored devices are used and new devices are stored."""
+        store = self._load_store()
+        store.entries['guest'] = {'name': 'Guest', 'mac': 'AA:BB'}
+        store.mac_to_id['AA:BB'] = 'guest'
+        tracker = device_tracker.DeviceTracker(
+            self.hass, timedelta(seconds=60), False, {},
+            store.async_tracked_devices(), store)
+        events = []
+        self.hass.bus.listen(
+            device_tracker.EVENT_NEW_DEVICE, lambda event: events.append(1))
+
+        tracker.see(mac='aa:bb')
+        tracker.see(dev_id='guest')
+        self.hass.block_till_done()
+
+        assert events == []
+        assert list(tracker.devices) == ['guest']
+        assert store.entries['guest']['last_seen'] is not None
+
+        tracker.see(dev_id='new')
+        self.hass.block_till_done()
+
+        assert len(events) == 1
+        assert store.entries['new']['name'] == 'new'
+        assert not os.path.isfile(self.yaml_devices)
+
+    def test_store_save_delay(self):
+        """Test sightings are saved later than changed devices."""
+        store = self._load_store()
+        store.entries['guest'] = {'name': 'Guest'}
+        device = device_tracker.Device(
+            self.hass, timedelta(seconds=60), False, 'guest', None)
+        device.last_seen = dt_util.utcnow()
+
+        self.hass.add_job(store.async_seen, device)
+        self.hass.block_till_done()
+        assert store._save_time - self.hass.loop.time() > \
+            device_tracker.STORE_SAVE_DELAY
+
+        device = device_tracker.Device(
+            self.hass, timedelta(seconds=60), False, 'new', None)
+        self.hass.add_job(store.async_add_devices, [device])
+        self.hass.block_till_done()
+        assert store._save_time - self.hass.loop.time() <= \
+            device_tracker.STORE_SAVE_DELAY
+
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_STOP)
+        self.hass.block_till_done()
+        store = self._load_store()
+        assert sorted(store.entries) == ['guest', 'new']
+        assert store.entries['guest']['last_seen'] is not None
+
     @patch('homeassistant.components.device_tracker._LOGGER.warning')
     def test_see_failures(self, mock_warning):
         """Test that the device tracker see failures."""
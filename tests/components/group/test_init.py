@@ -365,6 +365,47 @@ class TestComponentsGroup(unittest.TestCase):
         assert self.hass.states.entity_ids() == ['group.hello']
         assert self.hass.bus.listeners['state_changed'] == 1
 
+    def test_reloading_keeps_unchanged_groups(self):
+        """Test reloading only replaces the changed groups."""
+        assert setup_component(self.hass, 'group', {'group': {
+            'test_group': 'hello.world,sensor.happy',
+            'second_group': 'light.bowl',
+        }})
+        test_group = self.hass.states.get('group.test_group')
+
+        with patch('homeassistant.config.load_yaml_config_file', return_value={
+                'group': {
+                    'test_group': 'hello.world,sensor.happy',
+                    'second_group': 'light.bowl,light.ceiling',
+                }}):
+            group.reload(self.hass)
+            self.hass.block_till_done()
+
+        assert self.hass.states.get('group.test_group') == test_group
+        assert self.hass.states.get('group.test_group').last_updated == \
+            test_group.last_updated
+        assert self.hass.states.get('group.second_group').attributes[
+            'entity_id'] == ('light.bowl', 'light.ceiling')
+        assert self.hass.bus.listeners['state_changed'] == 2
+
+    def test_reloading_keeps_group_order(self):
+        """Test a changed group keeps its order when it is reloaded."""
+        assert setup_component(self.hass, 'group', {'group': {
+            'first_group': 'light.bowl',
+        }})
+        group.Group.create_group(self.hass, 'second_group', ['light.ceiling'])
+        order = self.hass.states.get('group.first_group').attributes['order']
+
+        with patch('homeassistant.config.load_yaml_config_file', return_value={
+                'group': {
+                    'first_group': 'light.bowl,light.ceiling',
+                }}):
+            group.reload(self.hass)
+            self.hass.block_till_done()
+
+        assert self.hass.states.get('group.first_group').attributes[
+            'order'] == order
+
     def test_stopping_a_group(self):
         """Test that a group correctly removes itself."""
         grp = group.Group.create_group(
@@ -12,6 +12,7 @@ from homeassistant.setup import async_setup_component
 import homeassistant.components.http as http
 from homeassistant.components.http.const import (
     KEY_TRUSTED_NETWORKS, KEY_USE_X_FORWARDED_FOR, HTTP_HEADER_X_FORWARDED_FOR)
+from homeassistant.components.http.util import IpNetworkSet
 
 API_PASSWORD = 'test1234'
 
@@ -37,9 +38,9 @@ def mock_api_client(hass, test_client):
 @pytest.fixture
 def mock_trusted_networks(hass, mock_api_client):
     """Mock trusted networks."""
-    hass.http.app[KEY_TRUSTED_NETWORKS] = [
+    hass.http.app[KEY_TRUSTED_NETWORKS] = IpNetworkSet(
         ip_network(trusted_network)
-        for trusted_network in TRUSTED_NETWORKS]
+        for trusted_network in TRUSTED_NETWORKS)
 
 
 @asyncio.coroutine
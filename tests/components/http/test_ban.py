@@ -7,11 +7,13 @@ from unittest.mock import patch, mock_open
 import pytest
 
 from homeassistant import const
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.setup import async_setup_component
 import homeassistant.components.http as http
 from homeassistant.components.http.const import (
     KEY_BANS_ENABLED, KEY_LOGIN_THRESHOLD, KEY_BANNED_IPS)
-from homeassistant.components.http.ban import IpBan, IP_BANS_FILE
+from homeassistant.components.http.ban import (
+    IpBan, IpBanList, IpBanWriter, IP_BANS_FILE)
 
 API_PASSWORD = 'test1234'
 BANNED_IPS = ['200.201.202.203', '100.64.0.2']
@@ -25,8 +27,8 @@ def mock_api_client(hass, test_client):
             http.CONF_API_PASSWORD: API_PASSWORD,
         }
     }))
-    hass.http.app[KEY_BANNED_IPS] = [IpBan(banned_ip) for banned_ip
-                                     in BANNED_IPS]
+    hass.http.app[KEY_BANNED_IPS] = IpBanList(
+        IpBan(banned_ip) for banned_ip in BANNED_IPS)
     return hass.loop.run_until_complete(test_client(hass.http.app))
 
 
@@ -89,3 +91,39 @@ def test_ip_bans_file_creation(hass, mock_api_client):
         resp = yield from call_server()
         assert resp.status == 403
         assert m.call_count == 1
+
+
+@asyncio.coroutine
+def test_access_from_banned_network(hass, mock_api_client):
+    """Test addresses in a banned network are refused."""
+    hass.http.app[KEY_BANS_ENABLED] = True
+    hass.http.app[KEY_BANNED_IPS].append(IpBan('10.1.0.0/16'))
+
+    for remote_addr, status in (('10.1.2.3', 403), ('10.2.0.1', 200)):
+        with patch('homeassistant.components.http.ban.get_real_ip',
+                   return_value=ip_address(remote_addr)):
+            resp = yield from mock_api_client.get(
+                const.URL_API,
+                headers={const.HTTP_HEADER_HA_AUTH: API_PASSWORD})
+            assert resp.status == status
+
+
+@asyncio.coroutine
+def test_ip_bans_written_in_batches(hass):
+    """Test bans within the save interval are written together."""
+    writer = IpBanWriter(hass, hass.config.path(IP_BANS_FILE))
+
+    with patch('homeassistant.components.http.ban.update_ip_bans_config') \
+            as mock_update:
+        yield from writer.async_add(IpBan('200.201.202.1'))
+        yield from writer.async_add(IpBan('200.201.202.2'))
+        yield from writer.async_add(IpBan('200.201.202.3'))
+        assert len(mock_update.mock_calls) == 1
+
+        hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+        yield from hass.async_block_till_done()
+
+    assert len(mock_update.mock_calls) == 2
+    assert [str(ip_ban.ip_address) for ip_ban
+            in mock_update.mock_calls[1][1][1]] == \
+        ['200.201.202.2', '200.201.202.3']
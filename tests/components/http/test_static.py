@@ -0,0 +1,103 @@
+"""The tests for static file handling of the HTTP component."""
+import asyncio
+import gzip
+import pathlib
+
+from aiohttp import web
+import pytest
+
+from homeassistant.components.http.static import (
+    CachingStaticResource, StaticFile)
+
+
+@pytest.fixture
+def static_dir(tmpdir):
+    """Create a directory with static files."""
+    tmpdir.join('app.js').write('var x = 1;\n' * 500)
+    tmpdir.join('style.css').write('body {}\n' * 500)
+    tmpdir.join('style.css.br').write_binary(b'brotli')
+    tmpdir.join('style.css.gz').write_binary(gzip.compress(b'gzipped'))
+    tmpdir.join('tiny.js').write('var x = 1;\n')
+    return tmpdir
+
+
+@pytest.fixture
+def mock_static_client(loop, test_client, static_dir):
+    """Serve the static directory."""
+    app = web.Application()
+    app.router.register_resource(
+        CachingStaticResource('/static', str(static_dir)))
+    return loop.run_until_complete(test_client(app))
+
+
+@asyncio.coroutine
+def test_gzip_on_first_request(mock_static_client, static_dir):
+    """Test files without variants are gzipped and cached until changed."""
+    resp = yield from mock_static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status == 200
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert resp.headers['Vary'] == 'Accept-Encoding'
+    assert 'max-age' in resp.headers['Cache-Control']
+    assert (yield from resp.text()) == 'var x = 1;\n' * 500
+
+    static_dir.join('app.js').write('var x = 22;\n' * 500)
+    resp = yield from mock_static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status == 200
+    assert (yield from resp.text()) == 'var x = 22;\n' * 500
+
+    static_dir.join('app.js').remove()
+    resp = yield from mock_static_client.get(
+        '/static/app.js', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status == 404
+
+
+@asyncio.coroutine
+def test_precompressed_variant(mock_static_client):
+    """Test precompressed variants are served."""
+    resp = yield from mock_static_client.get(
+        '/static/style.css', headers={'Accept-Encoding': 'gzip'})
+    assert resp.status == 200
+    assert resp.headers['Content-Encoding'] == 'gzip'
+    assert resp.headers['Content-Type'] == 'text/css'
+    assert (yield from resp.text()) == 'gzipped'
+
+    resp = yield from mock_static_client.get(
+        '/static/style.css', headers={'Accept-Encoding': 'identity'})
+    assert resp.status == 200
+    assert 'Content-Encoding' not in resp.headers
+    assert (yield from resp.text()) == 'body {}\n' * 500
+
+
+@asyncio.coroutine
+def test_etag(mock_static_client):
+    """Test clients with a matching ETag get a 304."""
+    resp = yield from mock_static_client.get('/static/tiny.js')
+    assert resp.status == 200
+    assert 'Vary' not in resp.headers
+    etag = resp.headers['ETag']
+
+    resp = yield from mock_static_client.get(
+        '/static/tiny.js', headers={'If-None-Match': etag})
+    assert resp.status == 304
+    assert resp.headers['ETag'] == etag
+
+    resp = yield from mock_static_client.get(
+        '/static/tiny.js', headers={'If-None-Match': '"other"'})
+    assert resp.status == 200
+
+
+def test_static_file_etags(static_dir):
+    """Test each encoding has its own ETag."""
+    static_file = StaticFile(pathlib.Path(str(static_dir.join('app.js'))))
+
+    assert static_file.compressible
+    assert static_file.etag_for(None) == static_file.etag
+    assert static_file.etag_for('gzip') != static_file.etag
+    assert static_file.select_encoding('deflate, gzip;q=1.0') == 'gzip'
+    assert static_file.select_encoding('br') is None
+
+    static_file = StaticFile(pathlib.Path(str(static_dir.join('style.css'))))
+    assert not static_file.compressible
+    assert static_file.select_encoding('gzip, br') == 'br'
@@ -1,5 +1,9 @@
 """The tests for the image_processing component."""
-from unittest.mock import patch, PropertyMock
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import pickle
+import threading
+from unittest.mock import MagicMock, patch, PropertyMock
 
 from homeassistant.core import callback
 from homeassistant.const import ATTR_ENTITY_PICTURE
@@ -8,8 +12,11 @@ from homeassistant.exceptions import HomeAssistantError
 import homeassistant.components.http as http
 import homeassistant.components.image_processing as ip
 
+import homeassistant.util.dt as dt_util
+
 from tests.common import (
-    get_test_home_assistant, get_test_instance_port, assert_setup_component)
+    get_test_home_assistant, get_test_instance_port, assert_setup_component,
+    mock_coro)
 
 
 class TestSetupImageProcessing(object):
@@ -296,3 +303,169 @@ class TestImageProcessingFace(object):
         assert event_data[0]['gender'] == 'male'
         assert event_data[0]['entity_id'] == \
             'image_processing.demo_face'
+
+
+@asyncio.coroutine
+def test_process_pool_drops_stale_images(hass):
+    """Test a waiting image is replaced by a newer one."""
+    started = threading.Event()
+    gate = threading.Event()
+
+    def analyze(image):
+        """Wait for the gate on the first image."""
+        started.set()
+        if image == b'first':
+            gate.wait()
+        return image.upper()
+
+    with patch('homeassistant.components.image_processing.'
+               'ProcessPoolExecutor', ThreadPoolExecutor):
+        pool = yield from hass.async_add_job(
+            ip.get_process_pool, hass, 'test', 2)
+
+    assert ip.get_process_pool(hass, 'test', 2) is pool
+    assert ip.get_process_pool(hass, 'other', 0) is None
+
+    first = hass.async_add_job(pool.async_run('camera', analyze, b'first'))
+    yield from hass.loop.run_in_executor(None, started.wait)
+    second = hass.async_add_job(pool.async_run('camera', analyze, b'second'))
+    yield from asyncio.sleep(0, loop=hass.loop)
+    third = hass.async_add_job(pool.async_run('camera', analyze, b'third'))
+    other = yield from pool.async_run('other', analyze, b'other')
+    gate.set()
+
+    assert (yield from first) == b'FIRST'
+    assert (yield from second) is None
+    assert (yield from third) == b'THIRD'
+    assert other == b'OTHER'
+    assert pool.stats == {'processed': 3, 'dropped': 1}
+
+
+@asyncio.coroutine
+def test_process_pool_cancelled_waiting_image(hass):
+    """Test a newer image is queued if the waiting one was cancelled."""
+    started = threading.Event()
+    gate = threading.Event()
+
+    def analyze(image):
+        """Wait for the gate on the first image."""
+        started.set()
+        if image == b'first':
+            gate.wait()
+        return image.upper()
+
+    with patch('homeassistant.components.image_processing.'
+               'ProcessPoolExecutor', ThreadPoolExecutor):
+        pool = yield from hass.async_add_job(
+            ip.get_process_pool, hass, 'test', 1)
+
+    first = hass.async_add_job(pool.async_run('camera', analyze, b'first'))
+    yield from hass.loop.run_in_executor(None, started.wait)
+    second = hass.async_add_job(pool.async_run('camera', analyze, b'second'))
+    yield from asyncio.sleep(0, loop=hass.loop)
+    second.cancel()
+    yield from asyncio.sleep(0, loop=hass.loop)
+    third = hass.async_add_job(pool.async_run('camera', analyze, b'third'))
+    yield from asyncio.sleep(0, loop=hass.loop)
+    gate.set()
+
+    assert (yield from first) == b'FIRST'
+    assert (yield from third) == b'THIRD'
+    assert second.cancelled()
+
+
+def test_analyze_jobs_are_picklable():
+    """Test the jobs of platforms with workers can be sent to a process."""
+    from homeassistant.components.image_processing import (
+        dlib_face_detect, dlib_face_identify, opencv)
+
+    entities = [
+        opencv.OpenCVImageProcessor(
+            None, 'camera.demo_camera', None, {'Face': 'face.xml'}),
+        dlib_face_detect.DlibFaceDetectEntity('camera.demo_camera'),
+    ]
+    with patch.dict('sys.modules', {'face_recognition': MagicMock()}):
+        entities.append(dlib_face_identify.DlibFaceIdentifyEntity(
+            'camera.demo_camera', {}))
+
+    for entity in entities:
+        func, args = pickle.loads(pickle.dumps(entity.analyze_job(b'img')))
+        assert func.__module__ == type(entity).__module__
+        assert args[0] == b'img'
+
+
+class MockImageProcessingEntity(ip.ImageProcessingEntity):
+    """Count the processed images."""
+
+    def __init__(self, hass):
+        """Initialize the entity."""
+        self.hass = hass
+        self.entity_id = 'image_processing.test'
+        self.images = []
+
+    @property
+    def camera_entity(self):
+        """Return the camera entity id."""
+        return 'camera.demo_camera'
+
+    def process_image(self, image):
+        """Remember the image."""
+        self.images.append(image)
+
+
+@asyncio.coroutine
+def test_schedule_frame_difference(hass):
+    """Test only images with a changed size are processed."""
+    entity = MockImageProcessingEntity(hass)
+    entity.schedule = ip.get_schedule(hass, {ip.CONF_FRAME_DIFFERENCE: 10})
+    yield from entity.async_added_to_hass()
+    images = [b'a' * 100, b'b' * 105, b'c' * 120, b'd' * 100]
+
+    with patch('homeassistant.components.camera.async_get_image',
+               side_effect=lambda *args, **kwargs: mock_coro(images.pop(0))):
+        for _ in range(3):
+            yield from entity.async_update()
+
+        assert entity.images == [b'a' * 100, b'c' * 120]
+
+        with patch('homeassistant.util.dt.utcnow',
+                   return_value=dt_util.utcnow() + ip.DEFAULT_MAX_INTERVAL):
+            yield from entity.async_update()
+
+    assert len(entity.images) == 3
+    assert entity.schedule.stats == {'processed': 3, 'skipped': 1}
+
+
+@asyncio.coroutine
+def test_schedule_motion(hass):
+    """Test images are processed when a motion entity turns on."""
+    hass.states.async_set('binary_sensor.motion', 'off')
+    entity = MockImageProcessingEntity(hass)
+    entity.schedule = ip.get_schedule(hass, {
+        ip.CONF_MOTION_ENTITY_ID: ['binary_sensor.motion'],
+    })
+    yield from entity.async_added_to_hass()
+
+    with patch('homeassistant.components.camera.async_get_image',
+               side_effect=lambda *args, **kwargs: mock_coro(b'Test')) \
+            as mock_image:
+        yield from entity.async_update()
+        yield from entity.async_update()
+        assert len(entity.images) == 1
+        assert mock_image.call_count == 1
+
+        hass.states.async_set('binary_sensor.motion', 'on')
+        yield from hass.async_block_till_done()
+        assert len(entity.images) == 2
+
+        yield from entity.async_update()
+        assert len(entity.images) == 3
+
+        yield from entity.async_remove()
+        hass.states.async_set('binary_sensor.motion', 'off')
+        hass.states.async_set('binary_sensor.motion', 'on')
+        yield from hass.async_block_till_done()
+        assert len(entity.images) == 3
+
+    assert entity.schedule.stats == {'processed': 3, 'skipped': 1}
+    assert ip.get_schedule(hass, {ip.CONF_ENTITY_ID: 'camera.demo'}) is None
@@ -27,8 +27,8 @@ def create_engine_test(*args, **kwargs):
 def test_schema_update_calls(hass):
     """Test that schema migrations occurr in correct order."""
     with patch('sqlalchemy.create_engine', new=create_engine_test), \
-        patch('homeassistant.components.recorder.migration._apply_update') as \
-            update:
+        patch('homeassistant.components.recorder.migration._apply_update',
+              wraps=migration._apply_update) as update:
         yield from async_setup_component(hass, 'recorder', {
             'recorder': {
                 'db_url': 'sqlite://'
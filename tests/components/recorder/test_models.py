@@ -47,6 +47,15 @@ class TestEvents(unittest.TestCase):
         })
         assert event == Events.from_event(event).to_native()
 
+    def test_from_event_entity_id(self):
+        """Test the entity_id of an event is copied to its column."""
+        assert Events.from_event(ha.Event('test_event', {
+            'entity_id': 'light.kitchen',
+        })).entity_id == 'light.kitchen'
+        assert Events.from_event(ha.Event('test_event', {
+            'entity_id': ['light.kitchen'],
+        })).entity_id is None
+
 
 class TestStates(unittest.TestCase):
     """Test States model."""
@@ -155,9 +155,13 @@ class TestDatadog(unittest.TestCase):
         for in_, out in valid.items():
             state = mock.MagicMock(domain="sensor", entity_id="sensor.foo.bar",
                                    state=in_, attributes=attributes)
-            handler_method(mock.MagicMock(data={'new_state': state}))
+            self.hass.add_job(
+                handler_method, mock.MagicMock(data={'new_state': state}))
+            self.hass.block_till_done()
 
             self.assertEqual(mock_client.gauge.call_count, 3)
+            self.assertEqual(mock_client.open_buffer.call_count, 1)
+            self.assertEqual(mock_client.close_buffer.call_count, 1)
 
             for attribute, value in attributes.items():
                 mock_client.gauge.assert_has_calls([
@@ -177,8 +181,11 @@ class TestDatadog(unittest.TestCase):
             )
 
             mock_client.gauge.reset_mock()
+            mock_client.open_buffer.reset_mock()
+            mock_client.close_buffer.reset_mock()
 
         for invalid in ('foo', '', object):
-            handler_method(mock.MagicMock(data={
+            self.hass.add_job(handler_method, mock.MagicMock(data={
                 'new_state': ha.State('domain.test', invalid, {})}))
+            self.hass.block_till_done()
             self.assertFalse(mock_client.gauge.called)
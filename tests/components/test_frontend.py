@@ -3,6 +3,7 @@ import asyncio
 import re
 from unittest.mock import patch
 
+import jinja2
 import pytest
 
 from homeassistant.setup import async_setup_component
@@ -189,3 +190,30 @@ def test_panel_without_path(hass):
         'test_component', 'nonexistant_file')
     yield from async_setup_component(hass, 'frontend', {})
     assert 'test_component' not in hass.data[DATA_PANELS]
+
+
+@asyncio.coroutine
+def test_index_cached(hass, mock_http_client):
+    """Test the index is rendered once and revalidated with its ETag."""
+    with patch.object(jinja2.Template, 'render', autospec=True,
+                      side_effect=jinja2.Template.render) as mock_render:
+        resp = yield from mock_http_client.get('/states')
+        assert resp.status == 200
+        etag = resp.headers['ETag']
+        text = yield from resp.text()
+
+        resp = yield from mock_http_client.get('/states')
+        assert (yield from resp.text()) == text
+        assert len(mock_render.mock_calls) == 1
+
+        resp = yield from mock_http_client.get(
+            '/states', headers={'If-None-Match': etag})
+        assert resp.status == 304
+
+        hass.components.frontend.add_extra_html_url(
+            'https://domain.com/my_extra_url_es5.html', True)
+        resp = yield from mock_http_client.get(
+            '/states', headers={'If-None-Match': etag})
+        assert resp.status == 200
+        assert resp.headers['ETag'] != etag
+        assert len(mock_render.mock_calls) == 2
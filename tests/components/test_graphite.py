@@ -7,9 +7,7 @@ from unittest.mock import patch
 from homeassistant.setup import setup_component
 import homeassistant.core as ha
 import homeassistant.components.graphite as graphite
-from homeassistant.const import (
-    EVENT_STATE_CHANGED, EVENT_HOMEASSISTANT_START, EVENT_HOMEASSISTANT_STOP,
-    STATE_ON, STATE_OFF)
+from homeassistant.const import STATE_ON, STATE_OFF
 from tests.common import get_test_home_assistant
 
 
@@ -19,7 +17,7 @@ class TestGraphite(unittest.TestCase):
     def setup_method(self, method):
         """Setup things to be run when tests are started."""
         self.hass = get_test_home_assistant()
-        self.gf = graphite.GraphiteFeeder(self.hass, 'foo', 123, 'ha')
+        self.gf = graphite.GraphiteFeeder('foo', 123, 'ha')
 
     def teardown_method(self, method):
         """Stop everything that was started."""
@@ -50,7 +48,7 @@ class TestGraphite(unittest.TestCase):
         self.assertTrue(setup_component(self.hass, graphite.DOMAIN, config))
         self.assertEqual(mock_gf.call_count, 1)
         self.assertEqual(
-            mock_gf.call_args, mock.call(self.hass, 'foo', 123, 'me')
+            mock_gf.call_args, mock.call('foo', 123, 'me')
         )
         self.assertEqual(mock_socket.call_count, 1)
         self.assertEqual(
@@ -77,42 +75,20 @@ class TestGraphite(unittest.TestCase):
             mock.call(socket.AF_INET, socket.SOCK_STREAM)
         )
 
-    def test_subscribe(self):
-        """Test the subscription."""
-        fake_hass = mock.MagicMock()
-        gf = graphite.GraphiteFeeder(fake_hass, 'foo', 123, 'ha')
-        fake_hass.bus.listen_once.has_calls([
-            mock.call(EVENT_HOMEASSISTANT_START, gf.start_listen),
-            mock.call(EVENT_HOMEASSISTANT_STOP, gf.shutdown),
-        ])
-        self.assertEqual(fake_hass.bus.listen.call_count, 1)
-        self.assertEqual(
-            fake_hass.bus.listen.call_args,
-            mock.call(EVENT_STATE_CHANGED, gf.event_listener)
-        )
-
-    def test_start(self):
-        """Test the start."""
-        with mock.patch.object(self.gf, 'start') as mock_start:
-            self.gf.start_listen('event')
-            self.assertEqual(mock_start.call_count, 1)
-            self.assertEqual(mock_start.call_args, mock.call())
-
-    def test_shutdown(self):
-        """Test the shutdown."""
-        with mock.patch.object(self.gf, '_queue') as mock_queue:
-            self.gf.shutdown('event')
-            self.assertEqual(mock_queue.put.call_count, 1)
+    def test_event_lines(self):
+        """Test the metric lines of an event."""
+        event = mock.MagicMock(data={'entity_id': 'entity',
+                                     'new_state': mock.MagicMock()})
+        with mock.patch.object(self.gf, '_metric_lines') as mock_r:
+            mock_r.return_value = ['foo 1.000000 12345']
+            self.assertEqual(self.gf.event_lines(event),
+                             ['foo 1.000000 12345'])
             self.assertEqual(
-                mock_queue.put.call_args, mock.call(self.gf._quit_object)
-            )
+                mock_r.call_args,
+                mock.call('entity', event.data['new_state']))
 
-    def test_event_listener(self):
-        """Test the event listener."""
-        with mock.patch.object(self.gf, '_queue') as mock_queue:
-            self.gf.event_listener('foo')
-            self.assertEqual(mock_queue.put.call_count, 1)
-            self.assertEqual(mock_queue.put.call_args, mock.call('foo'))
+            mock_r.return_value = []
+            self.assertIsNone(self.gf.event_lines(event))
 
     @patch('time.time')
     def test_report_attributes(self, mock_time):
@@ -132,10 +108,8 @@ class TestGraphite(unittest.TestCase):
             ]
 
         state = mock.MagicMock(state=0, attributes=attrs)
-        with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
-            self.gf._report_attributes('entity', state)
-            actual = mock_send.call_args_list[0][0][0].split('\n')
-            self.assertEqual(sorted(expected), sorted(actual))
+        actual = self.gf._metric_lines('entity', state)
+        self.assertEqual(sorted(expected), sorted(actual))
 
     @patch('time.time')
     def test_report_with_string_state(self, mock_time):
@@ -147,46 +121,38 @@ class TestGraphite(unittest.TestCase):
             ]
 
         state = mock.MagicMock(state='above_horizon', attributes={'foo': 1.0})
-        with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
-            self.gf._report_attributes('entity', state)
-            actual = mock_send.call_args_list[0][0][0].split('\n')
-            self.assertEqual(sorted(expected), sorted(actual))
+        actual = self.gf._metric_lines('entity', state)
+        self.assertEqual(sorted(expected), sorted(actual))
 
     @patch('time.time')
     def test_report_with_binary_state(self, mock_time):
         """Test the reporting with binary state."""
         mock_time.return_value = 12345
         state = ha.State('domain.entity', STATE_ON, {'foo': 1.0})
-        with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
-            self.gf._report_attributes('entity', state)
-            expected = ['ha.entity.foo 1.000000 12345',
-                        'ha.entity.state 1.000000 12345']
-            actual = mock_send.call_args_list[0][0][0].split('\n')
-            self.assertEqual(sorted(expected), sorted(actual))
+        expected = ['ha.entity.foo 1.000000 12345',
+                    'ha.entity.state 1.000000 12345']
+        actual = self.gf._metric_lines('entity', state)
+        self.assertEqual(sorted(expected), sorted(actual))
 
         state.state = STATE_OFF
-        with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
-            self.gf._report_attributes('entity', state)
-            expected = ['ha.entity.foo 1.000000 12345',
-                        'ha.entity.state 0.000000 12345']
-            actual = mock_send.call_args_list[0][0][0].split('\n')
-            self.assertEqual(sorted(expected), sorted(actual))
+        expected = ['ha.entity.foo 1.000000 12345',
+                    'ha.entity.state 0.000000 12345']
+        actual = self.gf._metric_lines('entity', state)
+        self.assertEqual(sorted(expected), sorted(actual))
 
-    @patch('time.time')
-    def test_send_to_graphite_errors(self, mock_time):
-        """Test the sending with errors."""
-        mock_time.return_value = 12345
-        state = ha.State('domain.entity', STATE_ON, {'foo': 1.0})
+    def test_send_lines(self):
+        """Test a batch is sent in one write."""
         with mock.patch.object(self.gf, '_send_to_graphite') as mock_send:
-            mock_send.side_effect = socket.error
-            self.gf._report_attributes('entity', state)
-            mock_send.side_effect = socket.gaierror
-            self.gf._report_attributes('entity', state)
+            self.gf.send_lines([['foo 1', 'bar 2'], ['baz 3']])
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual(mock_send.call_args,
+                         mock.call('foo 1\nbar 2\nbaz 3'))
 
     @patch('socket.socket')
     def test_send_to_graphite(self, mock_socket):
         """Test the sending of data."""
         self.gf._send_to_graphite('foo')
+        self.gf._send_to_graphite('bar')
         self.assertEqual(mock_socket.call_count, 1)
         self.assertEqual(
             mock_socket.call_args,
@@ -195,51 +161,41 @@ class TestGraphite(unittest.TestCase):
         sock = mock_socket.return_value
         self.assertEqual(sock.connect.call_count, 1)
         self.assertEqual(sock.connect.call_args, mock.call(('foo', 123)))
-        self.assertEqual(sock.sendall.call_count, 1)
-        self.assertEqual(
-            sock.sendall.call_args, mock.call('foo'.encode('ascii'))
-        )
-        self.assertEqual(sock.send.call_count, 1)
-        self.assertEqual(sock.send.call_args, mock.call('\n'.encode('ascii')))
+        self.assertEqual(sock.sendall.call_args_list, [
+            mock.call('foo\n'.encode('ascii')),
+            mock.call('bar\n'.encode('ascii')),
+        ])
+        self.assertFalse(sock.close.called)
+
+        self.gf._disconnect()
         self.assertEqual(sock.close.call_count, 1)
-        self.assertEqual(sock.close.call_args, mock.call())
-
-    def test_run_stops(self):
-        """Test the stops."""
-        with mock.patch.object(self.gf, '_queue') as mock_queue:
-            mock_queue.get.return_value = self.gf._quit_object
-            self.assertEqual(None, self.gf.run())
-            self.assertEqual(mock_queue.get.call_count, 1)
-            self.assertEqual(mock_queue.get.call_args, mock.call())
-            self.assertEqual(mock_queue.task_done.call_count, 1)
-            self.assertEqual(mock_queue.task_done.call_args, mock.call())
-
-    def test_run(self):
-        """Test the running."""
-        runs = []
-        event = mock.MagicMock(event_type=EVENT_STATE_CHANGED,
-                               data={'entity_id': 'entity',
-                                     'new_state': mock.MagicMock()})
 
-        def fake_get():
-            if len(runs) >= 2:
-                return self.gf._quit_object
-            elif runs:
-                runs.append(1)
-                return mock.MagicMock(event_type='somethingelse',
-                                      data={'new_event': None})
-            else:
-                runs.append(1)
-                return event
-
-        with mock.patch.object(self.gf, '_queue') as mock_queue:
-            with mock.patch.object(self.gf, '_report_attributes') as mock_r:
-                mock_queue.get.side_effect = fake_get
-                self.gf.run()
-                # Twice for two events, once for the stop
-                self.assertEqual(3, mock_queue.task_done.call_count)
-                self.assertEqual(mock_r.call_count, 1)
-                self.assertEqual(
-                    mock_r.call_args,
-                    mock.call('entity', event.data['new_state'])
-                )
+    @patch('socket.socket')
+    def test_send_to_graphite_reconnects(self, mock_socket):
+        """Test the connection is reopened when a write fails."""
+        sock = mock_socket.return_value
+        sock.sendall.side_effect = [None, socket.error, None]
+        self.gf._send_to_graphite('foo')
+        self.gf._send_to_graphite('bar')
+        self.assertEqual(mock_socket.call_count, 2)
+        self.assertEqual(sock.close.call_count, 1)
+        self.assertEqual(sock.sendall.call_count, 3)
+
+        sock.sendall.side_effect = socket.error
+        with self.assertRaises(socket.error):
+            self.gf._send_to_graphite('baz')
+        self.assertIsNone(self.gf._sock)
+
+    @patch('socket.socket')
+    def test_state_changes_sent(self, mock_socket):
+        """Test state changes are sent through the export pipeline."""
+        assert setup_component(self.hass, graphite.DOMAIN, {'graphite': {}})
+        sock = mock_socket.return_value
+
+        with patch('time.time', return_value=12345):
+            self.hass.states.set('test.one', '1')
+            self.hass.block_till_done()
+
+        self.assertEqual(
+            sock.sendall.call_args,
+            mock.call('ha.test.one.state 1.000000 12345\n'.encode('ascii')))
@@ -3,13 +3,9 @@ import unittest
 import datetime
 from unittest import mock
 
-from datetime import timedelta
-from unittest.mock import MagicMock
-
 import influxdb as influx_client
+from influxdb.line_protocol import make_lines
 
-from homeassistant.util import dt as dt_util
-from homeassistant import core as ha
 from homeassistant.setup import setup_component
 import homeassistant.components.influxdb as influxdb
 from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON, \
@@ -18,6 +14,11 @@ from homeassistant.const import EVENT_STATE_CHANGED, STATE_OFF, STATE_ON, \
 from tests.common import get_test_home_assistant
 
 
+def _lines(body):
+    """Return the lines InfluxDB receives for a JSON body."""
+    return make_lines({'points': body}).splitlines()
+
+
 @mock.patch('influxdb.InfluxDBClient')
 class TestInfluxDB(unittest.TestCase):
     """Test the InfluxDB component."""
@@ -120,10 +121,10 @@ class TestInfluxDB(unittest.TestCase):
 
         # map of HA State to valid influxdb [state, value] fields
         valid = {
-            '1': [None, 1],
+            '1': [None, 1.0],
             '1.0': [None, 1.0],
-            STATE_ON: [STATE_ON, 1],
-            STATE_OFF: [STATE_OFF, 0],
+            STATE_ON: [STATE_ON, 1.0],
+            STATE_OFF: [STATE_OFF, 0.0],
             STATE_STANDBY: [STATE_STANDBY, None],
             'foo': ['foo', None]
         }
@@ -159,7 +160,7 @@ class TestInfluxDB(unittest.TestCase):
                     'last_seen_str': 'Last seen 23 minutes ago',
                     'last_seen': 23.0,
                     'updated_at_str': '2017-01-01 00:00:00',
-                    'updated_at': 20170101000000,
+                    'updated_at': 20170101000000.0,
                     'multi_periods_str': '0.120.240.2023873'
                 },
             }]
@@ -168,13 +169,14 @@ class TestInfluxDB(unittest.TestCase):
             if out[1] is not None:
                 body[0]['fields']['value'] = out[1]
 
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             self.assertEqual(
                 mock_client.return_value.write_points.call_count, 1
             )
             self.assertEqual(
                 mock_client.return_value.write_points.call_args,
-                mock.call(body)
+                mock.call(_lines(body), protocol='line')
             )
             mock_client.return_value.write_points.reset_mock()
 
@@ -199,16 +201,17 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             self.assertEqual(
                 mock_client.return_value.write_points.call_count, 1
             )
             self.assertEqual(
                 mock_client.return_value.write_points.call_args,
-                mock.call(body)
+                mock.call(_lines(body), protocol='line')
             )
             mock_client.return_value.write_points.reset_mock()
 
@@ -222,7 +225,8 @@ class TestInfluxDB(unittest.TestCase):
         event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
         mock_client.return_value.write_points.side_effect = \
             influx_client.exceptions.InfluxDBClientError('foo')
-        self.handler_method(event)
+        self.hass.add_job(self.handler_method, event)
+        self.hass.block_till_done()
 
     def test_event_listener_states(self, mock_client):
         """Test the event listener against ignored states."""
@@ -241,17 +245,18 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             if state_state == 1:
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
                 )
                 self.assertEqual(
                     mock_client.return_value.write_points.call_args,
-                    mock.call(body)
+                    mock.call(_lines(body), protocol='line')
                 )
             else:
                 self.assertFalse(mock_client.return_value.write_points.called)
@@ -274,17 +279,18 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             if entity_id == 'ok':
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
                 )
                 self.assertEqual(
                     mock_client.return_value.write_points.call_args,
-                    mock.call(body)
+                    mock.call(_lines(body), protocol='line')
                 )
             else:
                 self.assertFalse(mock_client.return_value.write_points.called)
@@ -308,17 +314,18 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             if domain == 'ok':
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
                 )
                 self.assertEqual(
                     mock_client.return_value.write_points.call_args,
-                    mock.call(body)
+                    mock.call(_lines(body), protocol='line')
                 )
             else:
                 self.assertFalse(mock_client.return_value.write_points.called)
@@ -352,17 +359,18 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             if entity_id == 'included':
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
                 )
                 self.assertEqual(
                     mock_client.return_value.write_points.call_args,
-                    mock.call(body)
+                    mock.call(_lines(body), protocol='line')
                 )
             else:
                 self.assertFalse(mock_client.return_value.write_points.called)
@@ -397,17 +405,18 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             if domain == 'fake':
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
                 )
                 self.assertEqual(
                     mock_client.return_value.write_points.call_args,
-                    mock.call(body)
+                    mock.call(_lines(body), protocol='line')
                 )
             else:
                 self.assertFalse(mock_client.return_value.write_points.called)
@@ -419,10 +428,10 @@ class TestInfluxDB(unittest.TestCase):
 
         # map of HA State to valid influxdb [state, value] fields
         valid = {
-            '1': [None, 1],
+            '1': [None, 1.0],
             '1.0': [None, 1.0],
-            STATE_ON: [STATE_ON, 1],
-            STATE_OFF: [STATE_OFF, 0],
+            STATE_ON: [STATE_ON, 1.0],
+            STATE_OFF: [STATE_OFF, 0.0],
             STATE_STANDBY: [STATE_STANDBY, None],
             'foo': ['foo', None]
         }
@@ -455,13 +464,14 @@ class TestInfluxDB(unittest.TestCase):
             if out[1] is not None:
                 body[0]['fields']['value'] = out[1]
 
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             self.assertEqual(
                 mock_client.return_value.write_points.call_count, 1
             )
             self.assertEqual(
                 mock_client.return_value.write_points.call_args,
-                mock.call(body)
+                mock.call(_lines(body), protocol='line')
             )
             mock_client.return_value.write_points.reset_mock()
 
@@ -494,17 +504,18 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             if entity_id == 'ok':
                 self.assertEqual(
                     mock_client.return_value.write_points.call_count, 1
                 )
                 self.assertEqual(
                     mock_client.return_value.write_points.call_args,
-                    mock.call(body)
+                    mock.call(_lines(body), protocol='line')
                 )
             else:
                 self.assertFalse(mock_client.return_value.write_points.called)
@@ -542,13 +553,14 @@ class TestInfluxDB(unittest.TestCase):
                 'unit_of_measurement_str': 'foobars',
             },
         }]
-        self.handler_method(event)
+        self.hass.add_job(self.handler_method, event)
+        self.hass.block_till_done()
         self.assertEqual(
             mock_client.return_value.write_points.call_count, 1
         )
         self.assertEqual(
             mock_client.return_value.write_points.call_args,
-            mock.call(body)
+            mock.call(_lines(body), protocol='line')
         )
         mock_client.return_value.write_points.reset_mock()
 
@@ -583,17 +595,18 @@ class TestInfluxDB(unittest.TestCase):
             },
             'time': 12345,
             'fields': {
-                'value': 1,
+                'value': 1.0,
                 'field_fake_str': 'field_str'
             },
         }]
-        self.handler_method(event)
+        self.hass.add_job(self.handler_method, event)
+        self.hass.block_till_done()
         self.assertEqual(
             mock_client.return_value.write_points.call_count, 1
         )
         self.assertEqual(
             mock_client.return_value.write_points.call_args,
-            mock.call(body)
+            mock.call(_lines(body), protocol='line')
         )
         mock_client.return_value.write_points.reset_mock()
 
@@ -644,19 +657,21 @@ class TestInfluxDB(unittest.TestCase):
                 },
                 'time': 12345,
                 'fields': {
-                    'value': 1,
+                    'value': 1.0,
                 },
             }]
-            self.handler_method(event)
+            self.hass.add_job(self.handler_method, event)
+            self.hass.block_till_done()
             self.assertEqual(
                 mock_client.return_value.write_points.call_count, 1
             )
             self.assertEqual(
                 mock_client.return_value.write_points.call_args,
-                mock.call(body)
+                mock.call(_lines(body), protocol='line')
             )
             mock_client.return_value.write_points.reset_mock()
 
+    @mock.patch('homeassistant.helpers.export.RETRY_DELAY', 0)
     def test_scheduled_write(self, mock_client):
         """Test the event listener to retry after write failures."""
         self._setup(max_retries=1)
@@ -668,152 +683,69 @@ class TestInfluxDB(unittest.TestCase):
         mock_client.return_value.write_points.side_effect = \
             IOError('foo')
 
-        start = dt_util.utcnow()
-
-        self.handler_method(event)
-        json_data = mock_client.return_value.write_points.call_args[0][0]
-        self.assertEqual(mock_client.return_value.write_points.call_count, 1)
-
-        shifted_time = start + (timedelta(seconds=20 + 1))
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                           {ha.ATTR_NOW: shifted_time})
-        self.hass.block_till_done()
-        self.assertEqual(mock_client.return_value.write_points.call_count, 2)
-        mock_client.return_value.write_points.assert_called_with(json_data)
-
-        shifted_time = shifted_time + (timedelta(seconds=20 + 1))
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                           {ha.ATTR_NOW: shifted_time})
+        self.hass.add_job(self.handler_method, event)
         self.hass.block_till_done()
         self.assertEqual(mock_client.return_value.write_points.call_count, 2)
+        self.assertEqual(
+            mock_client.return_value.write_points.call_args_list[0],
+            mock_client.return_value.write_points.call_args_list[1])
 
+    def test_batched_write(self, mock_client):
+        """Test events are written in batches."""
+        self._setup(batch_size=2, batch_timeout=60)
 
-class TestRetryOnErrorDecorator(unittest.TestCase):
-    """Test the RetryOnError decorator."""
-
-    def setUp(self):
-        """Setup things to be run when tests are started."""
-        self.hass = get_test_home_assistant()
-
-    def tearDown(self):
-        """Clear data."""
-        self.hass.stop()
-
-    def test_no_retry(self):
-        """Test that it does not retry if configured."""
-        mock_method = MagicMock()
-        wrapped = influxdb.RetryOnError(self.hass)(mock_method)
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 1)
-        mock_method.assert_called_with(1, 2, test=3)
-
-        mock_method.side_effect = Exception()
-        self.assertRaises(Exception, wrapped, 1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 2)
-        mock_method.assert_called_with(1, 2, test=3)
-
-    def test_single_retry(self):
-        """Test that retry stops after a single try if configured."""
-        mock_method = MagicMock()
-        retryer = influxdb.RetryOnError(self.hass, retry_limit=1)
-        wrapped = retryer(mock_method)
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 1)
-        mock_method.assert_called_with(1, 2, test=3)
-
-        start = dt_util.utcnow()
-        shifted_time = start + (timedelta(seconds=20 + 1))
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                           {ha.ATTR_NOW: shifted_time})
-        self.hass.block_till_done()
-        self.assertEqual(mock_method.call_count, 1)
-
-        mock_method.side_effect = Exception()
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 2)
-        mock_method.assert_called_with(1, 2, test=3)
-
-        for cnt in range(3):
-            start = dt_util.utcnow()
-            shifted_time = start + (timedelta(seconds=20 + 1))
-            self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                               {ha.ATTR_NOW: shifted_time})
-            self.hass.block_till_done()
-            self.assertEqual(mock_method.call_count, 3)
-            mock_method.assert_called_with(1, 2, test=3)
-
-    def test_multi_retry(self):
-        """Test that multiple retries work."""
-        mock_method = MagicMock()
-        retryer = influxdb.RetryOnError(self.hass, retry_limit=4)
-        wrapped = retryer(mock_method)
-        mock_method.side_effect = Exception()
-
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 1)
-        mock_method.assert_called_with(1, 2, test=3)
-
-        for cnt in range(3):
-            start = dt_util.utcnow()
-            shifted_time = start + (timedelta(seconds=20 + 1))
-            self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                               {ha.ATTR_NOW: shifted_time})
-            self.hass.block_till_done()
-            self.assertEqual(mock_method.call_count, cnt + 2)
-            mock_method.assert_called_with(1, 2, test=3)
-
-    def test_max_queue(self):
-        """Test the maximum queue length."""
-        # make a wrapped method
-        mock_method = MagicMock()
-        retryer = influxdb.RetryOnError(
-            self.hass, retry_limit=4, queue_limit=3)
-        wrapped = retryer(mock_method)
-        mock_method.side_effect = Exception()
-
-        # call it once, call fails, queue fills to 1
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 1)
-        mock_method.assert_called_with(1, 2, test=3)
-        self.assertEqual(len(wrapped._retry_queue), 1)
-
-        # two more calls that failed. queue is 3
-        wrapped(1, 2, test=3)
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 3)
-        self.assertEqual(len(wrapped._retry_queue), 3)
-
-        # another call, queue gets limited to 3
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 4)
-        self.assertEqual(len(wrapped._retry_queue), 3)
-
-        # time passes
-        start = dt_util.utcnow()
-        shifted_time = start + (timedelta(seconds=20 + 1))
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                           {ha.ATTR_NOW: shifted_time})
+        events = [mock.MagicMock(data={'new_state': None})]
+        for object_id in ('one', 'two', 'three'):
+            state = mock.MagicMock(
+                state=1, domain='fake', entity_id='fake.' + object_id,
+                object_id=object_id, attributes={})
+            events.append(mock.MagicMock(
+                data={'new_state': state},
+                time_fired=datetime.datetime(
+                    2017, 1, 1, tzinfo=datetime.timezone.utc)))
+
+        def fire_events():
+            """Handle all events in one loop iteration."""
+            for event in events:
+                self.handler_method(event)
+
+        self.hass.add_job(fire_events)
         self.hass.block_till_done()
 
-        # only the three queued calls where repeated
-        self.assertEqual(mock_method.call_count, 7)
-        self.assertEqual(len(wrapped._retry_queue), 3)
-
-        # another call, queue stays limited
-        wrapped(1, 2, test=3)
-        self.assertEqual(mock_method.call_count, 8)
-        self.assertEqual(len(wrapped._retry_queue), 3)
+        write_points = mock_client.return_value.write_points
+        self.assertEqual(write_points.call_args_list, [
+            mock.call([
+                'fake.one,domain=fake,entity_id=one value=1.0 '
+                '1483228800000000000',
+                'fake.two,domain=fake,entity_id=two value=1.0 '
+                '1483228800000000000',
+            ], protocol='line'),
+            mock.call([
+                'fake.three,domain=fake,entity_id=three value=1.0 '
+                '1483228800000000000',
+            ], protocol='line'),
+        ])
+
+    def test_line_escaping(self, mock_client):
+        """Test special characters are escaped in the line protocol."""
+        self._setup(tags_attributes=['room'])
 
-        # disable the side effect
-        mock_method.side_effect = None
-
-        # time passes, all calls should succeed
-        start = dt_util.utcnow()
-        shifted_time = start + (timedelta(seconds=20 + 1))
-        self.hass.bus.fire(ha.EVENT_TIME_CHANGED,
-                           {ha.ATTR_NOW: shifted_time})
+        state = mock.MagicMock(
+            state='on "now"', domain='fake', entity_id='fake.entity',
+            object_id='entity', attributes={
+                'unit_of_measurement': 'm s,=',
+                'room': 'living room',
+                'friendly name': 'a\\b',
+                'inf': 'inf',
+            })
+        event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
+        self.hass.add_job(self.handler_method, event)
         self.hass.block_till_done()
 
-        # three queued calls succeeded, queue empty.
-        self.assertEqual(mock_method.call_count, 11)
-        self.assertEqual(len(wrapped._retry_queue), 0)
+        self.assertEqual(
+            mock_client.return_value.write_points.call_args,
+            mock.call([
+                'm\\ s\\,\\=,domain=fake,entity_id=entity,'
+                'room=living\\ room friendly\\ name_str="a\\\\b",'
+                'inf_str="inf",state="on \\"now\\"" 12345'
+            ], protocol='line'))
@@ -1,8 +1,12 @@
 """The tests for the logbook component."""
 # pylint: disable=protected-access,invalid-name
+import asyncio
+from contextlib import contextmanager
+import json
 import logging
 from datetime import timedelta
 import unittest
+from unittest.mock import patch
 
 from homeassistant.components import sun
 import homeassistant.core as ha
@@ -11,7 +15,7 @@ from homeassistant.const import (
     ATTR_HIDDEN, STATE_NOT_HOME, STATE_ON, STATE_OFF)
 import homeassistant.util.dt as dt_util
 from homeassistant.components import logbook
-from homeassistant.setup import setup_component
+from homeassistant.setup import async_setup_component, setup_component
 
 from tests.common import (
     mock_http_component, init_recorder_component, get_test_home_assistant)
@@ -90,6 +94,123 @@ class TestComponentLogbook(unittest.TestCase):
 
         self.assertEqual(0, len(calls))
 
+    def test_get_events_filtered_in_database(self):
+        """Test the database only returns events that are not excluded."""
+        from homeassistant.components import recorder
+        from homeassistant.components.recorder.models import Events
+
+        start = dt_util.utcnow() - timedelta(hours=1)
+        self.hass.states.set('light.kitchen', STATE_ON)
+        self.hass.states.set('light.kitchen', STATE_OFF)
+        self.hass.states.set('light.kitchen', STATE_OFF, {'brightness': 1})
+        self.hass.states.set('switch.fan', STATE_ON)
+        self.hass.states.set('switch.fan', STATE_OFF)
+        logbook.log_entry(self.hass, 'Alarm', 'is triggered', 'alarm')
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        config = logbook.CONFIG_SCHEMA({
+            logbook.DOMAIN: {
+                logbook.CONF_EXCLUDE: {
+                    logbook.CONF_DOMAINS: ['switch', 'alarm'],
+                }
+            }
+        })
+        converted = []
+        to_native = Events.to_native
+
+        def convert(row):
+            """Remember the converted rows."""
+            event = to_native(row)
+            converted.append(event)
+            return event
+
+        with patch.object(Events, 'to_native', autospec=True,
+                          side_effect=convert):
+            entries = logbook._get_events(
+                self.hass, config[logbook.DOMAIN], start,
+                start + timedelta(hours=2))
+
+        self.assertEqual(
+            [(entry.name, entry.message) for entry in entries],
+            [('Home Assistant', 'started'), ('kitchen', 'turned off')])
+        self.assertFalse([
+            event for event in converted
+            if event.data.get('entity_id', '').startswith('switch.')])
+        self.assertEqual(4, len(converted))
+
+    def test_get_events_of_entity(self):
+        """Test the events of a single entity are read by entity_id."""
+        from homeassistant.components import recorder
+
+        start = dt_util.utcnow() - timedelta(hours=1)
+        self.hass.states.set('lock.front_door', 'unlocked')
+        self.hass.states.set('lock.front_door', 'locked')
+        self.hass.states.set('lock.back_door', 'unlocked')
+        self.hass.states.set('lock.back_door', 'locked')
+        logbook.log_entry(self.hass, 'Front door', 'was opened',
+                          entity_id='lock.front_door')
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        entries = logbook._get_events(
+            self.hass, {}, start, start + timedelta(hours=2),
+            'lock.front_door')
+
+        self.assertEqual(
+            [(entry.entity_id, entry.message) for entry in entries],
+            [('lock.front_door', 'changed to locked'),
+             ('lock.front_door', 'was opened')])
+
+    @patch('homeassistant.components.logbook.QUERY_BATCH_SIZE', 2)
+    def test_get_events_in_pages(self):
+        """Test events are read in pages, each in a closed session."""
+        from homeassistant.components import recorder
+        from homeassistant.components.recorder import util
+
+        start = dt_util.utcnow() - timedelta(hours=1)
+        for index in range(5):
+            logbook.log_entry(self.hass, 'Alarm', str(index))
+        self.hass.block_till_done()
+        self.hass.data[recorder.DATA_INSTANCE].block_till_done()
+
+        sessions = []
+        session_scope = util.session_scope
+
+        @contextmanager
+        def scope(**kwargs):
+            """Remember if the sessions are open."""
+            with session_scope(**kwargs) as session:
+                sessions.append(True)
+                yield session
+            sessions[-1] = False
+
+        messages = []
+        with patch.object(util, 'session_scope', scope):
+            for event in logbook._read_events(
+                    self.hass, {}, start, start + timedelta(hours=2)):
+                self.assertFalse(any(sessions))
+                if event.event_type == logbook.EVENT_LOGBOOK_ENTRY:
+                    messages.append(event.data[logbook.ATTR_MESSAGE])
+
+        self.assertEqual(messages, ['0', '1', '2', '3', '4'])
+        # Three full pages with the start event, and an empty one
+        self.assertEqual(len(sessions), 4)
+
+    def test_json_chunks(self):
+        """Test entries are encoded as a JSON list in chunks."""
+        entries = [logbook.Entry(name='test{}'.format(i)) for i in range(3)]
+
+        with patch('homeassistant.components.logbook.JSON_CHUNK_SIZE', 2):
+            chunks = list(logbook._json_chunks(entries))
+
+        self.assertEqual(2, len(chunks))
+        self.assertEqual(
+            [entry.as_dict() for entry in entries],
+            json.loads(b''.join(chunks).decode('UTF-8')))
+        self.assertEqual([], json.loads(
+            b''.join(logbook._json_chunks([])).decode('UTF-8')))
+
     def test_humanify_filter_sensor(self):
         """Test humanify filter too frequent sensor values."""
         entity_id = 'sensor.bla'
@@ -556,3 +677,45 @@ class TestComponentLogbook(unittest.TestCase):
             'old_state': state,
             'new_state': state,
         }, time_fired=event_time_fired)
+
+
+def _failing_stream(count):
+    """Return a _stream_events replacement that fails after count entries."""
+    def stream_events(*args):
+        """Generate the entries and fail."""
+        for index in range(count):
+            yield logbook.Entry(name=str(index))
+        raise ValueError('Database error')
+
+    return stream_events
+
+
+@asyncio.coroutine
+def test_view_early_error(hass, test_client):
+    """Test an error before the first chunk returns an error status."""
+    yield from async_setup_component(hass, 'http', {})
+    hass.http.register_view(logbook.LogbookView({}))
+    client = yield from test_client(hass.http.app)
+
+    with patch('homeassistant.components.logbook._stream_events',
+               _failing_stream(0)):
+        resp = yield from client.get('/api/logbook')
+
+    assert resp.status == 500
+
+
+@asyncio.coroutine
+def test_view_late_error(hass, test_client):
+    """Test an error after the first chunk still returns a JSON list."""
+    yield from async_setup_component(hass, 'http', {})
+    hass.http.register_view(logbook.LogbookView({}))
+    client = yield from test_client(hass.http.app)
+
+    with patch('homeassistant.components.logbook._stream_events',
+               _failing_stream(3)), \
+            patch('homeassistant.components.logbook.JSON_CHUNK_SIZE', 2):
+        resp = yield from client.get('/api/logbook')
+        data = yield from resp.json()
+
+    assert resp.status == 200
+    assert [entry['name'] for entry in data] == ['0', '1']
@@ -1,5 +1,5 @@
 """The tests for the Logentries component."""
-
+import json
 import unittest
 from unittest import mock
 
@@ -8,6 +8,9 @@ import homeassistant.components.logentries as logentries
 from homeassistant.const import STATE_ON, STATE_OFF, EVENT_STATE_CHANGED
 
 from tests.common import get_test_home_assistant
+from tests.test_util.aiohttp import mock_aiohttp_client
+
+URL = 'https://webhook.logentries.com/noformat/logs/token'
 
 
 class TestLogentries(unittest.TestCase):
@@ -47,11 +50,8 @@ class TestLogentries(unittest.TestCase):
         self.assertEqual(EVENT_STATE_CHANGED,
                          self.hass.bus.listen.call_args_list[0][0][0])
 
-    def _setup(self, mock_requests):
+    def _setup(self):
         """Test the setup."""
-        self.mock_post = mock_requests.post
-        self.mock_request_exception = Exception
-        mock_requests.exceptions.RequestException = self.mock_request_exception
         config = {
             'logentries': {
                 'token': 'token'
@@ -61,39 +61,50 @@ class TestLogentries(unittest.TestCase):
         setup_component(self.hass, logentries.DOMAIN, config)
         self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
 
-    @mock.patch.object(logentries, 'requests')
-    @mock.patch('json.dumps')
-    def test_event_listener(self, mock_dump, mock_requests):
+    def test_event_listener(self):
         """Test event listener."""
-        mock_dump.side_effect = lambda x: x
-        self._setup(mock_requests)
+        self._setup()
 
         valid = {'1': 1,
                  '1.0': 1.0,
                  STATE_ON: 1,
                  STATE_OFF: 0,
                  'foo': 'foo'}
-        for in_, out in valid.items():
-            state = mock.MagicMock(state=in_,
-                                   domain='fake',
-                                   object_id='entity',
-                                   attributes={})
-            event = mock.MagicMock(data={'new_state': state},
-                                   time_fired=12345)
-            body = [{
-                'domain': 'fake',
-                'entity_id': 'entity',
-                'attributes': {},
-                'time': '12345',
-                'value': out,
-            }]
-            payload = {'host': 'https://webhook.logentries.com/noformat/'
-                       'logs/token',
-                       'event': body}
-            self.handler_method(event)
-            self.assertEqual(self.mock_post.call_count, 1)
-            self.assertEqual(
-                self.mock_post.call_args,
-                mock.call(payload['host'], data=payload, timeout=10)
-            )
-            self.mock_post.reset_mock()
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(URL)
+
+            for in_, out in valid.items():
+                state = mock.MagicMock(state=in_,
+                                       domain='fake',
+                                       object_id='entity',
+                                       attributes={})
+                event = mock.MagicMock(data={'new_state': state},
+                                       time_fired=12345)
+                body = [{
+                    'domain': 'fake',
+                    'entity_id': 'entity',
+                    'attributes': {},
+                    'time': '12345',
+                    'value': out,
+                }]
+                payload = {'host': URL, 'event': body}
+                self.hass.add_job(self.handler_method, event)
+                self.hass.block_till_done()
+
+                self.assertEqual(aioclient_mock.call_count, 1)
+                self.assertEqual(json.loads(aioclient_mock.mock_calls[0][2]),
+                                 payload)
+                aioclient_mock.mock_calls.clear()
+
+    def test_event_listener_error(self):
+        """Test that rejected lines are reported to the pipeline."""
+        self._setup()
+        pipeline = self.hass.data[logentries.DOMAIN]
+
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(URL, status=400)
+            self.hass.add_job(pipeline.async_add, 'line')
+            self.hass.block_till_done()
+
+        self.assertEqual(aioclient_mock.call_count, 1)
+        self.assertEqual(pipeline.stats['dropped'], 1)
@@ -1,5 +1,8 @@
 """The tests for the Prometheus exporter."""
 import asyncio
+from unittest.mock import patch
+
+import prometheus_client as client_lib
 import pytest
 
 from homeassistant.setup import async_setup_component
@@ -33,3 +36,69 @@ def test_view(prometheus_client):  # pylint: disable=redefined-outer-name
             assert line.startswith('# ') \
                 or line.startswith('process_') \
                 or line.startswith('python_info')
+
+
+@asyncio.coroutine
+def test_state_metrics(hass, test_client):
+    """Test states are exported and only changed metrics are rendered."""
+    assert (yield from async_setup_component(hass, prometheus.DOMAIN, {
+        prometheus.DOMAIN: {'attributes': True},
+    }))
+    client = yield from test_client(hass.http.app)
+
+    hass.states.async_set('sensor.outside_temperature', '12.5', {
+        'friendly_name': 'Outside',
+        'battery_level': 80,
+        'rssi': -70,
+        'on battery': True,
+    })
+    hass.states.async_set('switch.heater', 'on')
+    yield from hass.async_block_till_done()
+
+    resp = yield from client.get(prometheus.API_ENDPOINT)
+    body = yield from resp.text()
+
+    assert ('outside_temperature{entity="sensor.outside_temperature",'
+            'friendly_name="Outside"} 12.5') in body
+    assert ('battery_level_percent{entity="sensor.outside_temperature",'
+            'friendly_name="Outside"} 80.0') in body
+    assert ('sensor_attr_rssi{entity="sensor.outside_temperature",'
+            'friendly_name="Outside"} -70.0') in body
+    assert 'sensor_attr_on_battery' not in body
+    assert ('switch_state{entity="switch.heater",friendly_name="None"} '
+            '1.0') in body
+
+    hass.states.async_set('switch.heater', 'off')
+    yield from hass.async_block_till_done()
+
+    with patch('prometheus_client.generate_latest',
+               wraps=client_lib.generate_latest) as mock_render:
+        resp = yield from client.get(prometheus.API_ENDPOINT)
+        body = yield from resp.text()
+
+    # The default registry and the switch metric
+    assert mock_render.call_count == 2
+    assert ('switch_state{entity="switch.heater",friendly_name="None"} '
+            '0.0') in body
+    assert ('outside_temperature{entity="sensor.outside_temperature",'
+            'friendly_name="Outside"} 12.5') in body
+
+
+@asyncio.coroutine
+def test_filter(hass, test_client):
+    """Test excluded entities are not exported."""
+    assert (yield from async_setup_component(hass, prometheus.DOMAIN, {
+        prometheus.DOMAIN: {'exclude': {'domains': ['switch']}},
+    }))
+    client = yield from test_client(hass.http.app)
+
+    hass.states.async_set('switch.heater', 'on')
+    hass.states.async_set('lock.door', 'locked', {'battery_level': 10})
+    yield from hass.async_block_till_done()
+
+    resp = yield from client.get(prometheus.API_ENDPOINT)
+    body = yield from resp.text()
+
+    assert 'switch_state' not in body
+    assert 'lock_state{entity="lock.door"' in body
+    assert 'lock_attr_battery_level' not in body
@@ -207,3 +207,32 @@ class TestScriptComponent(unittest.TestCase):
 
         assert self.hass.states.get("script.test2") is not None
         assert self.hass.services.has_service(script.DOMAIN, 'test2')
+
+    def test_reload_service_keeps_running_script(self):
+        """Verify reloading keeps scripts with an unchanged config."""
+        config = {
+            'script': {
+                'test': {
+                    'sequence': [{'delay': {'seconds': 5}}]
+                },
+                'test2': {
+                    'sequence': [{'delay': {'seconds': 5}}]
+                },
+            }
+        }
+        assert setup_component(self.hass, 'script', config)
+
+        script.turn_on(self.hass, ENTITY_ID)
+        self.hass.block_till_done()
+        assert script.is_on(self.hass, ENTITY_ID)
+
+        config['script']['test2']['alias'] = 'Changed'
+        with patch('homeassistant.config.load_yaml_config_file',
+                   return_value=config):
+            script.reload(self.hass)
+            self.hass.block_till_done()
+
+        assert script.is_on(self.hass, ENTITY_ID)
+        assert self.hass.services.has_service(script.DOMAIN, 'test')
+        assert self.hass.states.get('script.test2').name == 'Changed'
+        assert self.hass.services.has_service(script.DOMAIN, 'test2')
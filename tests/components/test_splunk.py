@@ -10,6 +10,9 @@ from homeassistant.helpers import state as state_helper
 import homeassistant.util.dt as dt_util
 
 from tests.common import get_test_home_assistant
+from tests.test_util.aiohttp import mock_aiohttp_client
+
+URL = 'http://host:8088/services/collector/event'
 
 
 class TestSplunk(unittest.TestCase):
@@ -56,11 +59,8 @@ class TestSplunk(unittest.TestCase):
         self.assertEqual(EVENT_STATE_CHANGED,
                          self.hass.bus.listen.call_args_list[0][0][0])
 
-    def _setup(self, mock_requests):
+    def _setup(self):
         """Test the setup."""
-        self.mock_post = mock_requests.post
-        self.mock_request_exception = Exception
-        mock_requests.exceptions.RequestException = self.mock_request_exception
         config = {
             'splunk': {
                 'host': 'host',
@@ -73,10 +73,9 @@ class TestSplunk(unittest.TestCase):
         setup_component(self.hass, splunk.DOMAIN, config)
         self.handler_method = self.hass.bus.listen.call_args_list[0][0][1]
 
-    @mock.patch.object(splunk, 'requests')
-    def test_event_listener(self, mock_requests):
+    def test_event_listener(self):
         """Test event listener."""
-        self._setup(mock_requests)
+        self._setup()
 
         now = dt_util.now()
         valid = {
@@ -87,39 +86,73 @@ class TestSplunk(unittest.TestCase):
             'foo': 'foo',
         }
 
-        for in_, out in valid.items():
-            state = mock.MagicMock(state=in_,
-                                   domain='fake',
-                                   object_id='entity',
-                                   attributes={'datetime_attr': now})
-            event = mock.MagicMock(data={'new_state': state}, time_fired=12345)
-
-            try:
-                out = state_helper.state_as_number(state)
-            except ValueError:
-                out = state.state
-
-            body = [{
-                'domain': 'fake',
-                'entity_id': 'entity',
-                'attributes': {
-                    'datetime_attr': now.isoformat()
-                },
-                'time': '12345',
-                'value': out,
-                'host': 'HASS',
-            }]
-
-            payload = {'host': 'http://host:8088/services/collector/event',
-                       'event': body}
-            self.handler_method(event)
-            self.assertEqual(self.mock_post.call_count, 1)
-            self.assertEqual(
-                self.mock_post.call_args,
-                mock.call(
-                    payload['host'], data=json.dumps(payload),
-                    headers={'Authorization': 'Splunk secret'},
-                    timeout=10
-                )
-            )
-            self.mock_post.reset_mock()
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(URL)
+
+            for in_, out in valid.items():
+                state = mock.MagicMock(state=in_,
+                                       domain='fake',
+                                       object_id='entity',
+                                       attributes={'datetime_attr': now})
+                event = mock.MagicMock(data={'new_state': state},
+                                       time_fired=12345)
+
+                try:
+                    out = state_helper.state_as_number(state)
+                except ValueError:
+                    out = state.state
+
+                body = [{
+                    'domain': 'fake',
+                    'entity_id': 'entity',
+                    'attributes': {
+                        'datetime_attr': now.isoformat()
+                    },
+                    'time': '12345',
+                    'value': out,
+                    'host': 'HASS',
+                }]
+
+                payload = {'host': URL, 'event': body}
+
+                self.hass.add_job(self.handler_method, event)
+                self.hass.block_till_done()
+
+                self.assertEqual(aioclient_mock.call_count, 1)
+                self.assertEqual(
+                    aioclient_mock.mock_calls[0],
+                    ('post', URL, json.dumps(payload),
+                     {'Authorization': 'Splunk secret'}))
+                aioclient_mock.mock_calls.clear()
+
+    def test_event_listener_batch(self):
+        """Test that queued events are sent in one request."""
+        self._setup()
+        pipeline = self.hass.data[splunk.DOMAIN]
+
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(URL)
+
+            def add_events():
+                """Queue two events at once."""
+                pipeline.async_add('one')
+                pipeline.async_add('two')
+
+            self.hass.add_job(add_events)
+            self.hass.block_till_done()
+
+        self.assertEqual(aioclient_mock.call_count, 1)
+        self.assertEqual(aioclient_mock.mock_calls[0][2], 'one\ntwo')
+
+    def test_event_listener_server_error(self):
+        """Test that server errors are reported to the pipeline."""
+        self._setup()
+        pipeline = self.hass.data[splunk.DOMAIN]
+
+        with mock_aiohttp_client() as aioclient_mock:
+            aioclient_mock.post(URL, status=503)
+            self.hass.add_job(pipeline.async_add, 'event')
+            self.hass.block_till_done()
+
+        self.assertEqual(pipeline.stats['sent'], 0)
+        self.assertEqual(pipeline.stats['dropped'], 1)
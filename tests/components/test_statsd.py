@@ -1,4 +1,5 @@
 """The tests for the StatsD feeder."""
+from datetime import timedelta
 import unittest
 from unittest import mock
 
@@ -7,9 +8,11 @@ import voluptuous as vol
 from homeassistant.setup import setup_component
 import homeassistant.core as ha
 import homeassistant.components.statsd as statsd
-from homeassistant.const import (STATE_ON, STATE_OFF, EVENT_STATE_CHANGED)
+from homeassistant.const import (
+    STATE_ON, STATE_OFF, EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED)
+import homeassistant.util.dt as dt_util
 
-from tests.common import get_test_home_assistant
+from tests.common import get_test_home_assistant, fire_time_changed
 
 
 class TestStatsd(unittest.TestCase):
@@ -96,6 +99,7 @@ class TestStatsd(unittest.TestCase):
         setup_component(self.hass, statsd.DOMAIN, config)
         self.assertTrue(self.hass.bus.listen.called)
         handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        pipeline = mock_client.return_value.pipeline.return_value
 
         valid = {'1': 1,
                  '1.0': 1.0,
@@ -106,24 +110,24 @@ class TestStatsd(unittest.TestCase):
             state = mock.MagicMock(state=in_,
                                    attributes={"attribute key": 3.2})
             handler_method(mock.MagicMock(data={'new_state': state}))
-            mock_client.return_value.gauge.assert_has_calls([
+            pipeline.gauge.assert_has_calls([
                 mock.call(state.entity_id, out, statsd.DEFAULT_RATE),
             ])
 
-            mock_client.return_value.gauge.reset_mock()
+            pipeline.gauge.reset_mock()
 
-            self.assertEqual(mock_client.return_value.incr.call_count, 1)
+            self.assertEqual(pipeline.incr.call_count, 1)
             self.assertEqual(
-                mock_client.return_value.incr.call_args,
-                mock.call(state.entity_id, rate=statsd.DEFAULT_RATE)
+                pipeline.incr.call_args,
+                mock.call(state.entity_id, 1, statsd.DEFAULT_RATE)
             )
-            mock_client.return_value.incr.reset_mock()
+            pipeline.incr.reset_mock()
 
         for invalid in ('foo', '', object):
             handler_method(mock.MagicMock(data={
                 'new_state': ha.State('domain.test', invalid, {})}))
-            self.assertFalse(mock_client.return_value.gauge.called)
-            self.assertTrue(mock_client.return_value.incr.called)
+            self.assertFalse(pipeline.gauge.called)
+            self.assertTrue(pipeline.incr.called)
 
     @mock.patch('statsd.StatsClient')
     def test_event_listener_attr_details(self, mock_client):
@@ -141,6 +145,7 @@ class TestStatsd(unittest.TestCase):
         setup_component(self.hass, statsd.DOMAIN, config)
         self.assertTrue(self.hass.bus.listen.called)
         handler_method = self.hass.bus.listen.call_args_list[0][0][1]
+        pipeline = mock_client.return_value.pipeline.return_value
 
         valid = {'1': 1,
                  '1.0': 1.0,
@@ -150,24 +155,106 @@ class TestStatsd(unittest.TestCase):
             state = mock.MagicMock(state=in_,
                                    attributes={"attribute key": 3.2})
             handler_method(mock.MagicMock(data={'new_state': state}))
-            mock_client.return_value.gauge.assert_has_calls([
+            pipeline.gauge.assert_has_calls([
                 mock.call("%s.state" % state.entity_id,
                           out, statsd.DEFAULT_RATE),
                 mock.call("%s.attribute_key" % state.entity_id,
                           3.2, statsd.DEFAULT_RATE),
             ])
 
-            mock_client.return_value.gauge.reset_mock()
+            pipeline.gauge.reset_mock()
 
-            self.assertEqual(mock_client.return_value.incr.call_count, 1)
+            self.assertEqual(pipeline.incr.call_count, 1)
             self.assertEqual(
-                mock_client.return_value.incr.call_args,
-                mock.call(state.entity_id, rate=statsd.DEFAULT_RATE)
+                pipeline.incr.call_args,
+                mock.call(state.entity_id, 1, statsd.DEFAULT_RATE)
             )
-            mock_client.return_value.incr.reset_mock()
+            pipeline.incr.reset_mock()
 
         for invalid in ('foo', '', object):
             handler_method(mock.MagicMock(data={
                 'new_state': ha.State('domain.test', invalid, {})}))
-            self.assertFalse(mock_client.return_value.gauge.called)
-            self.assertTrue(mock_client.return_value.incr.called)
+            self.assertFalse(pipeline.gauge.called)
+            self.assertTrue(pipeline.incr.called)
+
+    @mock.patch('statsd.StatsClient')
+    def test_flush(self, mock_client):
+        """Test metrics are sent every flush interval."""
+        config = {
+            'statsd': {
+                'host': 'host',
+                'flush_interval': 10,
+            }
+        }
+        assert setup_component(self.hass, statsd.DOMAIN, config)
+        pipeline = mock_client.return_value.pipeline.return_value
+
+        for value in ('1', '2'):
+            self.hass.states.set('test.entity', value)
+        self.hass.block_till_done()
+        self.assertEqual(pipeline.gauge.call_count, 2)
+        self.assertEqual(pipeline.incr.call_count, 2)
+        self.assertFalse(pipeline.send.called)
+
+        fire_time_changed(
+            self.hass, dt_util.utcnow() + timedelta(seconds=11))
+        self.hass.block_till_done()
+        self.assertEqual(pipeline.send.call_count, 1)
+        self.assertEqual(
+            self.hass.data[statsd.DOMAIN].stats,
+            {'sent': 4, 'dropped': 0, 'flushes': 1})
+
+        # Nothing to send
+        fire_time_changed(
+            self.hass, dt_util.utcnow() + timedelta(seconds=22))
+        self.hass.block_till_done()
+        self.assertEqual(pipeline.send.call_count, 1)
+
+    @mock.patch('statsd.StatsClient')
+    def test_flush_error(self, mock_client):
+        """Test metrics of a failed send are counted as dropped."""
+        assert setup_component(self.hass, statsd.DOMAIN, {
+            'statsd': {'host': 'host', 'flush_interval': 10}
+        })
+        pipeline = mock_client.return_value.pipeline.return_value
+        pipeline.send.side_effect = OSError
+
+        self.hass.states.set('test.entity', '1')
+        self.hass.block_till_done()
+        fire_time_changed(
+            self.hass, dt_util.utcnow() + timedelta(seconds=11))
+        self.hass.block_till_done()
+        self.assertEqual(pipeline.send.call_count, 1)
+        self.assertEqual(
+            self.hass.data[statsd.DOMAIN].stats,
+            {'sent': 0, 'dropped': 2, 'flushes': 1})
+
+    @mock.patch('statsd.StatsClient')
+    def test_flush_on_stop(self, mock_client):
+        """Test pending metrics are sent before Home Assistant stops."""
+        assert setup_component(self.hass, statsd.DOMAIN, {
+            'statsd': {'host': 'host', 'flush_interval': 10}
+        })
+        pipeline = mock_client.return_value.pipeline.return_value
+
+        self.hass.states.set('test.entity', '1')
+        self.hass.block_till_done()
+        self.hass.bus.fire(EVENT_HOMEASSISTANT_STOP)
+        self.hass.block_till_done()
+        self.assertEqual(pipeline.send.call_count, 1)
+        self.assertEqual(self.hass.data[statsd.DOMAIN].stats['sent'], 2)
+
+    @mock.patch('homeassistant.components.statsd.MAX_PENDING', 1)
+    @mock.patch('statsd.StatsClient')
+    def test_max_pending(self, mock_client):
+        """Test metrics are dropped when too many are waiting."""
+        assert setup_component(self.hass, statsd.DOMAIN, {
+            'statsd': {'host': 'host'}
+        })
+        pipeline = mock_client.return_value.pipeline.return_value
+
+        self.hass.states.set('test.entity', '1')
+        self.hass.block_till_done()
+        self.assertEqual(pipeline.gauge.call_count, 1)
+        self.assertFalse(pipeline.incr.called)
+        self.assertEqual(self.hass.data[statsd.DOMAIN].stats['dropped'], 1)
@@ -1,5 +1,6 @@
 """Test zone component."""
 import unittest
+from unittest.mock import patch
 
 from homeassistant import setup
 from homeassistant.components import zone
@@ -143,3 +144,82 @@ class TestComponentZone(unittest.TestCase):
 
         assert zone.in_zone(self.hass.states.get('zone.passive_zone'),
                             latitude, longitude)
+
+    def test_active_zone_uses_index(self):
+        """Test only nearby zones are compared."""
+        assert setup.setup_component(self.hass, zone.DOMAIN, {
+            'zone': [
+                {
+                    'name': 'Near Zone',
+                    'latitude': 32.880600,
+                    'longitude': -117.237561,
+                    'radius': 250,
+                },
+                {
+                    'name': 'Far Zone',
+                    'latitude': 52.370216,
+                    'longitude': 4.895168,
+                    'radius': 250,
+                },
+                {
+                    'name': 'Huge Zone',
+                    'latitude': 0,
+                    'longitude': 0,
+                    'radius': 20000000,
+                },
+            ]
+        })
+
+        with patch('homeassistant.components.zone.distance',
+                   wraps=zone.distance) as mock_distance:
+            active = zone.active_zone(self.hass, 32.880600, -117.237561)
+
+        assert 'zone.near_zone' == active.entity_id
+        # Home, near and the unindexed huge zone are compared, far zone not
+        assert mock_distance.call_count == 3
+        assert (52.370216, 4.895168) not in [
+            call[0][2:] for call in mock_distance.call_args_list]
+
+        active = zone.active_zone(self.hass, 52.370216, 4.895168)
+        assert 'zone.far_zone' == active.entity_id
+
+        # A large accuracy radius still finds zones in neighbouring cells
+        active = zone.active_zone(self.hass, 32.880600, -117.337561, 10000)
+        assert 'zone.near_zone' == active.entity_id
+
+    def test_active_zone_index_updates(self):
+        """Test zone changes are picked up by the index."""
+        assert setup.setup_component(self.hass, zone.DOMAIN, {
+            'zone': None
+        })
+
+        assert zone.active_zone(self.hass, 52.370216, 4.895168) is None
+
+        self.hass.states.set('zone.new_zone', zone.STATE, {
+            'latitude': 52.370216,
+            'longitude': 4.895168,
+            'radius': 250,
+        })
+        self.hass.block_till_done()
+
+        active = zone.active_zone(self.hass, 52.370216, 4.895168)
+        assert 'zone.new_zone' == active.entity_id
+
+        self.hass.states.remove('zone.new_zone')
+        self.hass.block_till_done()
+
+        assert zone.active_zone(self.hass, 52.370216, 4.895168) is None
+
+    def test_active_zone_across_antimeridian(self):
+        """Test zones are found across the antimeridian."""
+        assert setup.setup_component(self.hass, zone.DOMAIN, {
+            'zone': {
+                'name': 'Date Line',
+                'latitude': -16.5,
+                'longitude': 179.999,
+                'radius': 1000,
+            }
+        })
+
+        active = zone.active_zone(self.hass, -16.5, -179.999)
+        assert 'zone.date_line' == active.entity_id
@@ -10,6 +10,7 @@ import requests
 import homeassistant.components.http as http
 import homeassistant.components.tts as tts
 from homeassistant.components.tts.demo import DemoProvider
+from homeassistant.core import CoreState
 from homeassistant.components.media_player import (
     SERVICE_PLAY_MEDIA, MEDIA_TYPE_MUSIC, ATTR_MEDIA_CONTENT_ID,
     ATTR_MEDIA_CONTENT_TYPE, DOMAIN as DOMAIN_MP)
@@ -562,3 +563,68 @@ class TestTTS(object):
         req = requests.get(url)
         assert req.status_code == 200
         assert req.content == demo_data
+
+    def test_setup_component_preload_on_start(self):
+        """Setup the demo platform and preload messages on start."""
+        config = {
+            tts.DOMAIN: {
+                'platform': 'demo',
+                'cache': False,
+                'preload': [
+                    "I person is on front of your door.",
+                    {'message': 'Alarm', 'language': 'de'},
+                ],
+            }
+        }
+
+        self.hass.state = CoreState.not_running
+        with assert_setup_component(1, tts.DOMAIN):
+            setup_component(self.hass, tts.DOMAIN, config)
+
+        assert self.hass.services.has_service(tts.DOMAIN, 'demo_preload')
+        self.hass.block_till_done()
+        assert not os.listdir(self.default_tts_cache)
+
+        self.hass.start()
+        self.hass.block_till_done()
+
+        assert os.path.isfile(os.path.join(
+            self.default_tts_cache,
+            "265944c108cbb00b2a621be5930513e03a0bb2cd_en_-_demo.mp3"))
+        assert len(os.listdir(self.default_tts_cache)) == 2
+
+        calls = mock_service(self.hass, DOMAIN_MP, SERVICE_PLAY_MEDIA)
+        with patch('homeassistant.components.tts.demo.DemoProvider.'
+                   'get_tts_audio') as mock_get_tts:
+            self.hass.services.call(tts.DOMAIN, 'demo_say', {
+                tts.ATTR_MESSAGE: "I person is on front of your door.",
+            })
+            self.hass.block_till_done()
+
+        assert not mock_get_tts.called
+        assert len(calls) == 1
+        assert calls[0].data[ATTR_MEDIA_CONTENT_ID].find(
+            "/api/tts_proxy/265944c108cbb00b2a621be5930513e03a0bb2cd"
+            "_en_-_demo.mp3") \
+            != -1
+
+    def test_setup_component_preload_service(self):
+        """Setup the demo platform and call the preload service."""
+        config = {
+            tts.DOMAIN: {
+                'platform': 'demo',
+            }
+        }
+
+        with assert_setup_component(1, tts.DOMAIN):
+            setup_component(self.hass, tts.DOMAIN, config)
+
+        self.hass.services.call(tts.DOMAIN, 'demo_preload', {
+            tts.ATTR_MESSAGE: ["I person is on front of your door.", "Bla"],
+        }, blocking=True)
+        self.hass.block_till_done()
+
+        assert os.path.isfile(os.path.join(
+            self.default_tts_cache,
+            "265944c108cbb00b2a621be5930513e03a0bb2cd_en_-_demo.mp3"))
+        assert len(os.listdir(self.default_tts_cache)) == 2
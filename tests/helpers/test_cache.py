@@ -0,0 +1,110 @@
+"""Test the byte cache helper."""
+import asyncio
+import os
+
+from homeassistant.helpers.cache import ByteCache
+
+
+@asyncio.coroutine
+def test_memory_budget(hass):
+    """Test the least recently used values are evicted."""
+    cache = ByteCache(hass, 10)
+    cache.async_set('a', b'1234')
+    cache.async_set('b', b'1234')
+    assert (yield from cache.async_get('a')) == b'1234'
+
+    cache.async_set('c', b'1234')
+    assert (yield from cache.async_get('b')) is None
+    assert (yield from cache.async_get('a')) == b'1234'
+    assert (yield from cache.async_get('c')) == b'1234'
+
+    cache.async_set('d', b'x' * 20)
+    assert (yield from cache.async_get('a')) is None
+    assert (yield from cache.async_get('d')) == b'x' * 20
+
+    assert cache.stats['evictions'] == 3
+    assert cache.hit_rate == 4 / 6
+
+
+@asyncio.coroutine
+def test_pinned(hass, tmpdir):
+    """Test pinned values are not evicted."""
+    cache = ByteCache(hass, 4, directory=str(tmpdir), max_disk=4)
+    cache.async_pin('a')
+    cache.async_set('a', b'1234', persist=True)
+    cache.async_set('b', b'1234', persist=True)
+    cache.async_set('c', b'1234', persist=True)
+    yield from hass.async_block_till_done()
+
+    assert cache.async_filename('a', disk=False) is not None
+    assert cache.async_filename('b') is None
+    assert os.path.isfile(str(tmpdir.join(cache.async_filename('a'))))
+    assert (yield from cache.async_get('c')) == b'1234'
+    assert cache.stats['evictions'] == 2
+
+
+@asyncio.coroutine
+def test_max_age(hass):
+    """Test expired values are not returned."""
+    cache = ByteCache(hass, 10, max_age=0)
+    cache.async_set('a', b'1234')
+    assert (yield from cache.async_get('a')) is None
+
+
+@asyncio.coroutine
+def test_coalesce_fetches(hass):
+    """Test concurrent requests share one fetch."""
+    cache = ByteCache(hass, 10)
+    gate = asyncio.Event(loop=hass.loop)
+    calls = []
+
+    @asyncio.coroutine
+    def fetch():
+        """Wait for the gate."""
+        calls.append(1)
+        yield from gate.wait()
+        return b'value'
+
+    first = hass.async_add_job(cache.async_get('a', fetch))
+    second = hass.async_add_job(cache.async_get('a', fetch))
+    yield from asyncio.sleep(0, loop=hass.loop)
+    gate.set()
+
+    assert (yield from first) == b'value'
+    assert (yield from second) == b'value'
+    assert (yield from cache.async_get('a', fetch)) == b'value'
+    assert len(calls) == 1
+    assert cache.stats == {
+        'hits': 1,
+        'disk_hits': 0,
+        'misses': 1,
+        'coalesced': 1,
+        'evictions': 0,
+    }
+
+
+@asyncio.coroutine
+def test_disk(hass, tmpdir):
+    """Test persisted values are loaded from disk and evicted by size."""
+    tmpdir.join('old').write_binary(b'1234')
+    tmpdir.join('ignored').write_binary(b'1234')
+    cache = ByteCache(hass, 4, directory=str(tmpdir), max_disk=10)
+    yield from cache.async_load_directory(
+        lambda filename: 'old' if filename == 'old' else None)
+
+    cache.async_set('a', b'1234', 'a.bin', persist=True)
+    yield from hass.async_block_till_done()
+    assert tmpdir.join('a.bin').read_binary() == b'1234'
+    assert cache.async_filename('old') == 'old'
+
+    assert (yield from cache.async_get('old')) == b'1234'
+    assert cache.stats['disk_hits'] == 1
+
+    cache.async_set('b', b'1234', persist=True)
+    yield from hass.async_block_till_done()
+    assert not os.path.isfile(str(tmpdir.join('a.bin')))
+    assert cache.async_filename('a') is None
+    assert (yield from cache.async_get('b')) == b'1234'
+
+    yield from cache.async_clear()
+    assert os.listdir(str(tmpdir)) == ['ignored']
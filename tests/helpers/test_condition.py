@@ -146,3 +146,61 @@ class TestConditionHelper:
                    return_value=dt.now().replace(hour=21)):
             assert not condition.time(after=sixam, before=sixpm)
             assert condition.time(after=sixpm, before=sixam)
+
+    def test_compiled_conditions(self):
+        """Test conditions are shared, sorted and report their entities."""
+        config = {
+            'condition': 'or',
+            'conditions': [
+                {
+                    'condition': 'template',
+                    'value_template': '{{ is_state("sensor.two", "on") }}',
+                }, {
+                    'condition': 'state',
+                    'entity_id': 'sensor.one',
+                    'state': 'on',
+                }, {
+                    'condition': 'time',
+                    'after': '06:00:00',
+                }
+            ]
+        }
+        test = condition.from_config(config)
+        shared = condition.from_config(dict(config))
+        state = condition.from_config(config['conditions'][1])
+
+        # The time condition does not depend on entities only
+        assert test.entity_ids is None
+        assert condition.from_config({
+            'condition': 'and',
+            'conditions': config['conditions'][:2],
+        }).entity_ids == {'sensor.one', 'sensor.two'}
+        assert shared.entity_ids is None
+        assert state.entity_ids == {'sensor.one'}
+        assert condition.async_from_config(config['conditions'][1]) is \
+            condition.async_from_config(dict(config['conditions'][1]))
+        assert condition.from_config({
+            'condition': 'template',
+            'value_template': '{{ states | count }}',
+        }).entity_ids is None
+
+        with patch('homeassistant.helpers.condition.async_template',
+                   return_value=False) as mock_template, \
+                patch('homeassistant.helpers.condition.dt_util.now',
+                      return_value=dt.now().replace(hour=9)):
+            assert test(self.hass)
+            assert len(mock_template.mock_calls) == 0
+
+    def test_sun_times_cached(self):
+        """Test sun times are calculated once per day."""
+        test = condition.from_config({
+            'condition': 'sun',
+            'after': 'sunrise',
+        })
+
+        with patch('homeassistant.helpers.condition.get_astral_event_date',
+                   return_value=dt.utcnow()) as mock_event:
+            test(self.hass)
+            test(self.hass)
+
+        assert len(mock_event.mock_calls) == 2
@@ -19,6 +19,7 @@ from homeassistant.helpers.event import (
     track_time_interval,
     track_template,
     track_same_state,
+    track_held_state,
     track_sunrise,
     track_sunset,
 )
@@ -373,6 +374,59 @@ class TestEventHelpers(unittest.TestCase):
         self.hass.block_till_done()
         self.assertEqual(1, len(callback_runs))
 
+    def test_track_held_state_shared(self):
+        """Test held states with the same key share one listener."""
+        runs = []
+        period = timedelta(minutes=1)
+        self.hass.states.set('light.bowl', 'on')
+        start = self.hass.states.get('light.bowl')
+
+        def check(entity, from_s, to_s):
+            """Check the light is on."""
+            return to_s.state == 'on'
+
+        for name in ('a', 'b'):
+            track_held_state(
+                self.hass, period, lambda name=name: runs.append(name),
+                check, 'light.bowl', 'on', start)
+        unsub = track_held_state(
+            self.hass, period, lambda: runs.append('c'), check,
+            'light.bowl', 'on', start)
+        unsub()
+
+        held = self.hass.data['held_state_tracker'].held
+        self.assertEqual(1, len(held['light.bowl']))
+        self.assertEqual(1, self.hass.bus.listeners['state_changed'])
+
+        self.hass.states.set('light.bowl', 'on', {'brightness': 100})
+        self.hass.states.set('light.kitchen', 'off')
+        self.hass.block_till_done()
+
+        fire_time_changed(self.hass, dt_util.utcnow() + period)
+        self.hass.block_till_done()
+        self.assertEqual(['a', 'b'], sorted(runs))
+        self.assertEqual({}, held)
+        self.assertNotIn('state_changed', self.hass.bus.listeners)
+
+    def test_track_held_state_cancel(self):
+        """Test held states are cancelled when the check fails."""
+        runs = []
+        period = timedelta(minutes=1)
+        self.hass.states.set('light.bowl', 'on')
+
+        track_held_state(
+            self.hass, period, lambda: runs.append(1),
+            lambda entity, from_s, to_s: to_s.state == 'on',
+            'light.bowl', 'on', self.hass.states.get('light.bowl'))
+
+        self.hass.states.set('light.bowl', 'off')
+        self.hass.block_till_done()
+        self.assertEqual({}, self.hass.data['held_state_tracker'].held)
+
+        fire_time_changed(self.hass, dt_util.utcnow() + period)
+        self.hass.block_till_done()
+        self.assertEqual([], runs)
+
     def test_track_time_interval(self):
         """Test tracking time interval."""
         specific_runs = []
@@ -0,0 +1,322 @@
+"""Test the export pipeline helper."""
+import asyncio
+import os
+from unittest.mock import patch
+
+from homeassistant.const import (
+    EVENT_HOMEASSISTANT_STOP, EVENT_STATE_CHANGED)
+from homeassistant.helpers import export
+
+
+@asyncio.coroutine
+def _async_pipeline(hass, send, convert=None, entity_filter=None, **config):
+    """Create and start a pipeline."""
+    pipeline = export.ExportPipeline(
+        hass, 'test', convert or (lambda event: event.data['entity_id']),
+        send, entity_filter, config)
+    yield from hass.async_add_job(pipeline.start)
+    return pipeline
+
+
+@asyncio.coroutine
+def test_batches_while_sending(hass):
+    """Test items queued while a batch is sent form the next batches."""
+    batches = []
+    gate = asyncio.Event(loop=hass.loop)
+
+    @asyncio.coroutine
+    def send(batch):
+        """Wait for the gate and record the batch."""
+        yield from gate.wait()
+        batches.append(batch)
+
+    pipeline = yield from _async_pipeline(hass, send, batch_size=2)
+    pipeline.async_add('a')
+    yield from asyncio.sleep(0, loop=hass.loop)
+
+    for item in ('b', 'c', 'd'):
+        pipeline.async_add(item)
+    gate.set()
+    yield from hass.async_block_till_done()
+
+    assert batches == [['a'], ['b', 'c'], ['d']]
+    assert pipeline.stats['sent'] == 4
+    assert pipeline.stats['batches'] == 3
+
+
+@asyncio.coroutine
+def test_batch_timeout(hass):
+    """Test items wait for the batch timeout or a full batch."""
+    batches = []
+    pipeline = yield from _async_pipeline(
+        hass, lambda batch: batches.append(batch), batch_size=2,
+        batch_timeout=60)
+
+    pipeline.async_add('a')
+    yield from hass.async_block_till_done()
+    assert batches == []
+
+    pipeline.async_add('b')
+    yield from hass.async_block_till_done()
+    assert batches == [['a', 'b']]
+    assert pipeline._timer is None
+
+
+@asyncio.coroutine
+def test_queue_size(hass):
+    """Test items are dropped when the queue is full."""
+    gate = asyncio.Event(loop=hass.loop)
+
+    @asyncio.coroutine
+    def send(batch):
+        """Wait for the gate."""
+        yield from gate.wait()
+
+    pipeline = yield from _async_pipeline(hass, send, queue_size=2)
+    pipeline.async_add('a')
+    yield from asyncio.sleep(0, loop=hass.loop)
+
+    for item in ('b', 'c', 'd'):
+        pipeline.async_add(item)
+    gate.set()
+    yield from hass.async_block_till_done()
+
+    assert pipeline.stats['dropped'] == 1
+    assert pipeline.stats['sent'] == 3
+
+
+@asyncio.coroutine
+def test_retry(hass):
+    """Test failed batches are retried."""
+    calls = []
+
+    def send(batch):
+        """Fail the first time."""
+        calls.append(batch)
+        if len(calls) == 1:
+            raise IOError('fail')
+
+    pipeline = yield from _async_pipeline(hass, send, max_retries=1)
+
+    with patch('homeassistant.helpers.export.RETRY_DELAY', 0):
+        pipeline.async_add('a')
+        yield from hass.async_block_till_done()
+
+    assert calls == [['a'], ['a']]
+    assert pipeline.stats['retries'] == 1
+    assert pipeline.stats['sent'] == 1
+
+
+@asyncio.coroutine
+def test_drop_after_failure(hass):
+    """Test failed batches are dropped without a spool."""
+    def send(batch):
+        """Fail always."""
+        raise IOError('fail')
+
+    pipeline = yield from _async_pipeline(hass, send)
+    pipeline.async_add('a')
+    yield from hass.async_block_till_done()
+
+    assert pipeline.stats['dropped'] == 1
+    assert pipeline.stats['sent'] == 0
+
+
+@asyncio.coroutine
+def test_spool(hass, tmpdir):
+    """Test failed batches are spooled and sent after a success."""
+    hass.config.config_dir = str(tmpdir)
+    calls = []
+    fail = True
+
+    def send(batch):
+        """Fail while requested."""
+        calls.append(batch)
+        if fail:
+            raise IOError('fail')
+
+    pipeline = yield from _async_pipeline(hass, send, spool_size=1000)
+    pipeline.async_add({'value': 1})
+    yield from hass.async_block_till_done()
+
+    assert pipeline.stats['spooled'] == 1
+    assert os.path.isfile(pipeline.spool_path)
+
+    fail = False
+    pipeline.async_add({'value': 2})
+    yield from hass.async_block_till_done()
+
+    assert calls == [[{'value': 1}], [{'value': 2}], [{'value': 1}]]
+    assert pipeline.stats['sent'] == 2
+    assert not os.path.isfile(pipeline.spool_path)
+
+
+@asyncio.coroutine
+def test_spool_full(hass, tmpdir):
+    """Test batches are dropped when the spool is full."""
+    hass.config.config_dir = str(tmpdir)
+
+    def send(batch):
+        """Fail always."""
+        raise IOError('fail')
+
+    pipeline = yield from _async_pipeline(hass, send, spool_size=10)
+    pipeline.async_add('a')
+    yield from hass.async_block_till_done()
+    pipeline.async_add('b' * 10)
+    yield from hass.async_block_till_done()
+
+    assert pipeline.stats['spooled'] == 1
+    assert pipeline.stats['dropped'] == 1
+
+
+@asyncio.coroutine
+def test_spool_loaded_on_start(hass, tmpdir):
+    """Test a spool left by an earlier run is sent."""
+    hass.config.config_dir = str(tmpdir)
+    os.makedirs(str(tmpdir.join(export.SPOOL_DIR)))
+    tmpdir.join(export.SPOOL_DIR, 'test.json').write('["a"]\ninvalid\n')
+    batches = []
+
+    pipeline = yield from _async_pipeline(
+        hass, lambda batch: batches.append(batch), spool_size=1000)
+    pipeline.async_add('b')
+    yield from hass.async_block_till_done()
+
+    assert batches == [['b'], ['a']]
+
+
+@asyncio.coroutine
+def test_state_changes(hass):
+    """Test state changes are filtered and converted."""
+    batches = []
+
+    def convert(event):
+        """Skip sensor.skip and fail for sensor.error."""
+        entity_id = event.data['entity_id']
+        if entity_id == 'sensor.error':
+            raise ValueError(entity_id)
+        if entity_id == 'sensor.skip':
+            return None
+        return entity_id
+
+    pipeline = yield from _async_pipeline(
+        hass, lambda batch: batches.append(batch), convert,
+        lambda entity_id: entity_id.startswith('sensor.'))
+
+    for entity_id in ('sensor.one', 'light.two', 'sensor.skip',
+                      'sensor.error'):
+        hass.states.async_set(entity_id, 'on')
+    hass.states.async_remove('sensor.one')
+    yield from hass.async_block_till_done()
+
+    assert batches == [['sensor.one']]
+    assert pipeline.stats['sent'] == 1
+
+
+@asyncio.coroutine
+def test_shared_listener(hass):
+    """Test pipelines share one state changed listener."""
+    first = []
+    second = []
+    listeners = hass.bus.async_listeners().get(EVENT_STATE_CHANGED, 0)
+
+    yield from _async_pipeline(hass, lambda batch: first.append(batch))
+    yield from _async_pipeline(
+        hass, lambda batch: second.append(batch), lambda event: 'other')
+    assert hass.bus.async_listeners()[EVENT_STATE_CHANGED] == listeners + 1
+
+    hass.states.async_set('sensor.one', 'on')
+    yield from hass.async_block_till_done()
+
+    assert first == [['sensor.one']]
+    assert second == [['other']]
+
+
+@asyncio.coroutine
+def test_stop_flushes(hass):
+    """Test queued items are sent when Home Assistant stops."""
+    batches = []
+    yield from _async_pipeline(
+        hass, lambda batch: batches.append(batch), batch_timeout=60)
+
+    hass.states.async_set('sensor.one', 'on')
+    yield from hass.async_block_till_done()
+    assert batches == []
+
+    hass.bus.async_fire(EVENT_HOMEASSISTANT_STOP)
+    yield from hass.async_block_till_done()
+    assert batches == [['sensor.one']]
+
+
+@asyncio.coroutine
+def test_stop_after_failure(hass):
+    """Test the queue is dropped after the first failure on stop."""
+    calls = []
+
+    def send(batch):
+        """Fail always."""
+        calls.append(batch)
+        raise IOError('fail')
+
+    pipeline = yield from _async_pipeline(
+        hass, send, batch_size=1, batch_timeout=60, max_retries=3)
+    for item in ('a', 'b', 'c'):
+        pipeline.async_add(item)
+
+    yield from pipeline.async_stop(None)
+
+    assert calls == [['a']]
+    assert pipeline.stats['retries'] == 0
+    assert pipeline.stats['dropped'] == 3
+
+
+@asyncio.coroutine
+def test_stop_cancels_retry_delay(hass):
+    """Test a batch waiting for a retry is not sent again on stop."""
+    calls = []
+
+    @asyncio.coroutine
+    def send(batch):
+        """Fail always."""
+        calls.append(batch)
+        raise IOError('fail')
+
+    pipeline = yield from _async_pipeline(hass, send, max_retries=3)
+    pipeline.async_add('a')
+    while pipeline._retry_delay is None:
+        yield from asyncio.sleep(0, loop=hass.loop)
+
+    yield from pipeline.async_stop(None)
+
+    assert calls == [['a']]
+    assert pipeline.stats['dropped'] == 1
+
+
+@asyncio.coroutine
+def test_stop_timeout(hass, tmpdir):
+    """Test items that are not sent in time are spooled or dropped on stop.
+
+    The batch that is being sent is dropped, so it is not sent twice.
+    """
+    hass.config.config_dir = str(tmpdir)
+    gate = asyncio.Event(loop=hass.loop)
+
+    @asyncio.coroutine
+    def send(batch):
+        """Wait for the gate."""
+        yield from gate.wait()
+
+    pipeline = yield from _async_pipeline(
+        hass, send, batch_size=1, spool_size=1000)
+    pipeline.async_add('a')
+    pipeline.async_add('b')
+
+    with patch('homeassistant.helpers.export.STOP_TIMEOUT', 0):
+        yield from pipeline.async_stop(None)
+
+    assert pipeline.stats['spooled'] == 1
+    assert pipeline.stats['dropped'] == 1
+    assert pipeline.stats['sent'] == 0
+    with open(pipeline.spool_path) as spool:
+        assert spool.read() == '["b"]\n'
@@ -4,6 +4,7 @@ from collections import OrderedDict
 import unittest
 
 from homeassistant import helpers
+from homeassistant.helpers.template import Template
 
 from tests.common import get_test_home_assistant
 
@@ -48,3 +49,25 @@ class TestHelpers(unittest.TestCase):
             (None, 1),
             ('hello 2', config['zone Hallo'][1]),
         ] == list(helpers.config_per_platform(config, 'zone'))
+
+    def test_config_hash(self):
+        """Test hashing validated configs."""
+        template = Template('{{ 1 }}', self.hass)
+        config = {
+            'alias': 'hello',
+            'action': [{'service': 'test.automation', 'data': template}],
+            'ids': {'a', 'b'},
+        }
+
+        assert helpers.config_hash(config) == helpers.config_hash({
+            'ids': {'b', 'a'},
+            'action': [{
+                'data': Template('{{ 1 }}', self.hass),
+                'service': 'test.automation',
+            }],
+            'alias': 'hello',
+        })
+        assert helpers.config_hash(config) != helpers.config_hash(
+            dict(config, alias='bye'))
+        assert helpers.config_hash([1, 2]) != helpers.config_hash([2, 1])
+        hash(helpers.config_hash(config))
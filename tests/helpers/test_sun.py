@@ -5,6 +5,7 @@ from unittest.mock import patch
 from datetime import timedelta, datetime
 
 import homeassistant.util.dt as dt_util
+from homeassistant.util.async import run_coroutine_threadsafe
 import homeassistant.helpers.sun as sun
 
 from tests.common import get_test_home_assistant
@@ -225,3 +226,52 @@ class TestSun(unittest.TestCase):
             datetime(2016, 7, 26, 22, 19, 1, tzinfo=dt_util.UTC)
         assert sun.get_astral_event_date(self.hass, 'sunrise', june) is None
         assert sun.get_astral_event_date(self.hass, 'sunset', june) is None
+
+    def test_events_cached(self):
+        """Test solar events are calculated once per location and date."""
+        june = datetime(2016, 6, 1, tzinfo=dt_util.UTC)
+
+        with patch('homeassistant.helpers.sun._calculate_astral_event',
+                   return_value=june) as mock_calc:
+            sun.get_astral_event_date(self.hass, 'sunrise', june)
+            sun.get_astral_event_date(self.hass, 'sunrise', june)
+            self.assertEqual(1, len(mock_calc.mock_calls))
+
+            self.hass.config.latitude = 69.6
+            sun.get_astral_event_date(self.hass, 'sunrise', june)
+            self.assertEqual(2, len(mock_calc.mock_calls))
+
+        with patch('homeassistant.helpers.sun.EVENT_CACHE_SIZE', 2):
+            for day in range(3):
+                sun.get_astral_event_date(
+                    self.hass, 'sunset', june + timedelta(days=day))
+        self.assertEqual(2, len(self.hass.data[sun.DATA_EVENT_CACHE]))
+
+    def test_precompute(self):
+        """Test solar events of the coming days are precomputed."""
+        run_coroutine_threadsafe(
+            sun.async_precompute_astral_events(self.hass, 1),
+            self.hass.loop).result()
+
+        # Yesterday until tomorrow, and the position today and tomorrow
+        self.assertEqual(3 * len(sun.SOLAR_EVENTS) + 2,
+                         len(self.hass.data[sun.DATA_EVENT_CACHE]))
+
+        with patch('homeassistant.helpers.sun._calculate_astral_event') \
+                as mock_calc:
+            sun.get_astral_event_next(self.hass, 'sunset')
+            sun.get_astral_position(self.hass)
+        self.assertEqual(0, len(mock_calc.mock_calls))
+
+    def test_position(self):
+        """Test the interpolated position of the sun."""
+        location = sun.get_astral_location(self.hass)
+
+        for hour in range(24):
+            utc_now = datetime(2016, 6, 1, hour, 17, 0, tzinfo=dt_util.UTC)
+            elevation, azimuth = sun.get_astral_position(self.hass, utc_now)
+
+            self.assertAlmostEqual(
+                location.solar_elevation(utc_now), elevation, delta=0.1)
+            self.assertAlmostEqual(
+                location.solar_azimuth(utc_now), azimuth, delta=0.5)
@@ -6,10 +6,10 @@ from unittest.mock import Mock, patch
 import logging
 
 import homeassistant.config as config_util
-from homeassistant import bootstrap
+from homeassistant import bootstrap, loader
 import homeassistant.util.dt as dt_util
 
-from tests.common import patch_yaml_files, get_test_config_dir
+from tests.common import patch_yaml_files, get_test_config_dir, MockModule
 
 ORIG_TIMEZONE = dt_util.DEFAULT_TIME_ZONE
 VERSION_PATH = os.path.join(get_test_config_dir(), config_util.VERSION_FILE)
@@ -23,6 +23,7 @@ _LOGGER = logging.getLogger(__name__)
 @patch('homeassistant.util.location.detect_location_info',
        Mock(return_value=None))
 @patch('homeassistant.bootstrap.async_register_signal_handling', Mock())
+@patch('homeassistant.loader.save_manifest', Mock())
 @patch('os.path.isfile', Mock(return_value=True))
 @patch('os.access', Mock(return_value=True))
 @patch('homeassistant.bootstrap.async_enable_logging',
@@ -52,3 +53,53 @@ def test_home_assistant_core_config_validation(hass):
         }
     }, hass)
     assert result is None
+
+
+@asyncio.coroutine
+def test_setup_components_not_blocked_by_first_init(hass):
+    """Test a slow first init component does not block other components."""
+    other_setup = asyncio.Event(loop=hass.loop)
+
+    @asyncio.coroutine
+    def slow_setup(hass, config):
+        """Wait until the other component is set up."""
+        yield from other_setup.wait()
+        return True
+
+    def other_component_setup(hass, config):
+        """Set up the other component."""
+        hass.loop.call_soon_threadsafe(other_setup.set)
+        return True
+
+    loader.set_component(
+        'test_slow', MockModule('test_slow', async_setup=slow_setup))
+    loader.set_component(
+        'test_component', MockModule(
+            'test_component', setup=other_component_setup))
+    loader.set_component(
+        'test_dependent', MockModule(
+            'test_dependent', dependencies=['test_component']))
+
+    with patch.object(bootstrap, 'FIRST_INIT_COMPONENT', set(['test_slow'])):
+        yield from asyncio.wait_for(bootstrap._async_setup_components(
+            hass, set(['test_slow', 'test_component', 'test_dependent']), {}),
+                                    timeout=5, loop=hass.loop)
+
+    assert 'test_slow' in hass.config.components
+    assert 'test_component' in hass.config.components
+    assert 'test_dependent' in hass.config.components
+
+
+def test_load_order_follows_dependencies():
+    """Test components are scheduled after their dependencies."""
+    loader.set_component(
+        'test_component', MockModule('test_component'))
+    loader.set_component(
+        'test_dependent', MockModule(
+            'test_dependent', dependencies=['test_component']))
+
+    with patch.object(bootstrap, 'FIRST_INIT_COMPONENT',
+                      set(['test_dependent'])):
+        order = bootstrap._load_order(set(['test_dependent', 'non_existing']))
+
+    assert list(order) == ['test_component', 'test_dependent', 'non_existing']
@@ -1,7 +1,10 @@
 """Test to verify that we can load components."""
 # pylint: disable=protected-access
 import asyncio
+import os
+import sys
 import unittest
+from unittest.mock import patch
 
 import pytest
 
@@ -60,6 +63,62 @@ class TestLoader(unittest.TestCase):
         self.assertEqual([], loader.load_order_component('mod1'))
 
 
+def test_get_manifest_without_import(hass):
+    """Test the manifest is read without importing the component."""
+    module = 'homeassistant.components.mqtt_statestream'
+
+    with patch.dict(sys.modules), patch.dict(loader._COMPONENT_CACHE):
+        sys.modules.pop(module, None)
+        loader._COMPONENT_CACHE.pop('mqtt_statestream', None)
+
+        manifest = loader.get_manifest('mqtt_statestream')
+
+        assert module not in sys.modules
+
+    assert manifest['dependencies'] == ['mqtt']
+    assert manifest['requirements'] == []
+    assert manifest['config_schema']
+    assert not manifest['platform_schema']
+
+    manifest = loader.get_manifest('notify.pushbullet')
+    assert manifest['requirements'] == ['pushbullet.py==0.11.0']
+    assert manifest['platform_schema']
+
+
+def test_get_manifest_dynamic(hass, tmpdir):
+    """Test the component is imported if the manifest is dynamic."""
+    source = tmpdir.join('dynamic.py')
+    source.write('DEPENDENCIES = [\'http\'] + []\n')
+    assert loader._parse_manifest(str(source)) is None
+
+    source.write(
+        'try:\n    DEPENDENCIES = []\nexcept ImportError:\n    pass\n')
+    assert loader._parse_manifest(str(source)) is None
+
+    source.write('from x import PLATFORM_SCHEMA\nREQUIREMENTS = (\'a\',)\n')
+    assert loader._parse_manifest(str(source)) == {
+        'dependencies': [],
+        'requirements': ['a'],
+        'config_schema': False,
+        'platform_schema': True,
+    }
+
+
+def test_manifest_saved(hass):
+    """Test the manifests are saved in the config dir."""
+    loader.get_manifest('mqtt_statestream')
+    path = hass.config.path(loader.MANIFEST_FILE)
+
+    try:
+        loader.save_manifest(hass)
+        data = loader.load_json(path)
+    finally:
+        os.remove(path)
+
+    assert data['components']['mqtt_statestream']['dependencies'] == ['mqtt']
+    assert 'homeassistant.components.http' in data['builtin']['components']
+
+
 def test_component_loader(hass):
     """Test loading components."""
     components = loader.Components(hass)
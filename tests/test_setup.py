@@ -478,3 +478,22 @@ def test_platform_no_warn_slow(hass):
             hass, 'test_component1', {})
         assert result
         assert not mock_call.called
+
+
+@asyncio.coroutine
+def test_setup_timeline(hass):
+    """Test the setup timeline is recorded for each component."""
+    loader.set_component('test_component1', MockModule('test_component1'))
+    loader.set_component('test_component2', MockModule(
+        'test_component2', setup=lambda hass, config: False))
+
+    assert (yield from setup.async_setup_component(
+        hass, 'test_component1', {}))
+    assert not (yield from setup.async_setup_component(
+        hass, 'test_component2', {}))
+
+    timeline = setup.async_get_setup_timeline(hass)
+    assert timeline['test_component1']['success']
+    assert timeline['test_component1']['wait'] >= 0
+    assert timeline['test_component1']['setup'] >= 0
+    assert not timeline['test_component2']['success']
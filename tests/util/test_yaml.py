@@ -1,6 +1,7 @@
 """Test Home Assistant yaml loader."""
 import io
 import os
+import pickle
 import unittest
 import logging
 from unittest.mock import patch
@@ -426,3 +427,115 @@ def test_duplicate_key(caplog):
     with patch_yaml_files(files):
         load_yaml_config_file(YAML_CONFIG_FILE)
     assert 'contains duplicate key' in caplog.text
+
+
+@pytest.fixture
+def yaml_cache():
+    """Start and end with an empty cache of parsed files."""
+    yaml.clear_cache()
+    yield
+    yaml.clear_cache()
+
+
+def test_load_yaml_cached(tmpdir, yaml_cache):
+    """Test only changed files are parsed again."""
+    tmpdir.join('configuration.yaml').write(
+        'first: !include first.yaml\nsecond: !include second.yaml\n')
+    tmpdir.join('first.yaml').write('value: 1')
+    tmpdir.join('second.yaml').write('value: 2')
+    path = str(tmpdir.join('configuration.yaml'))
+
+    with patch.object(yaml, '_parse_yaml', wraps=yaml._parse_yaml) as parse:
+        conf = yaml.load_yaml(path)
+        assert parse.call_count == 3
+
+        cached = yaml.load_yaml(path)
+        assert parse.call_count == 3
+        assert cached == conf
+        assert cached is not conf
+        assert cached['first'].__line__ == conf['first'].__line__ == 0
+
+        tmpdir.join('second.yaml').write('value: 22')
+        conf = yaml.load_yaml(path)
+        assert parse.call_count == 5
+        assert conf['second'] == {'value': 22}
+
+
+def test_load_yaml_cached_env_var(tmpdir, yaml_cache):
+    """Test a changed environment variable invalidates the cache."""
+    tmpdir.join('configuration.yaml').write('key: !env_var HASS_TEST_VAR')
+    path = str(tmpdir.join('configuration.yaml'))
+
+    with patch.dict(os.environ, {'HASS_TEST_VAR': 'one'}):
+        assert yaml.load_yaml(path) == {'key': 'one'}
+
+    with patch.dict(os.environ, {'HASS_TEST_VAR': 'two'}):
+        assert yaml.load_yaml(path) == {'key': 'two'}
+
+
+def test_load_yaml_cached_include_dir(tmpdir, yaml_cache):
+    """Test a file added to an included directory invalidates the cache."""
+    tmpdir.join('configuration.yaml').write('key: !include_dir_list items')
+    tmpdir.mkdir('items').join('one.yaml').write('one')
+    path = str(tmpdir.join('configuration.yaml'))
+
+    assert yaml.load_yaml(path) == {'key': ['one']}
+
+    tmpdir.join('items', 'two.yaml').write('two')
+    assert sorted(yaml.load_yaml(path)['key']) == ['one', 'two']
+
+
+def test_save_load_cache(tmpdir, yaml_cache):
+    """Test the cache of parsed files is stored on disk."""
+    tmpdir.join('configuration.yaml').write(
+        'key: value\nitems:\n  - one\n  - 2\nempty:\n')
+    path = str(tmpdir.join('configuration.yaml'))
+    cache_path = str(tmpdir.join(yaml.CACHE_FILE))
+
+    conf = yaml.load_yaml(path)
+    yaml.save_cache(cache_path)
+    yaml.clear_cache()
+    yaml.load_cache(cache_path)
+
+    with patch.object(yaml, '_parse_yaml') as parse:
+        cached = yaml.load_yaml(path)
+    assert not parse.called
+    assert cached == conf
+    assert list(cached) == ['key', 'items', 'empty']
+    assert cached.__line__ == conf.__line__
+    assert cached['items'].__line__ == conf['items'].__line__ == 2
+    assert cached['items'].__config_file__ == path
+
+
+def test_save_cache_without_secrets(tmpdir, yaml_cache):
+    """Test files with secrets are not stored on disk."""
+    tmpdir.join('configuration.yaml').write(
+        'password: !secret password\nother: !include other.yaml\n')
+    tmpdir.join('other.yaml').write('key: value')
+    tmpdir.join(yaml.SECRET_YAML).write('password: very_secret')
+    path = str(tmpdir.join('configuration.yaml'))
+    cache_path = str(tmpdir.join(yaml.CACHE_FILE))
+
+    assert yaml.load_yaml(path)['password'] == 'very_secret'
+    yaml.clear_secret_cache()
+    yaml.save_cache(cache_path)
+
+    assert 'very_secret' not in tmpdir.join(yaml.CACHE_FILE).read()
+    yaml.clear_cache()
+    yaml.load_cache(cache_path)
+
+    with patch.object(yaml, '_parse_yaml', wraps=yaml._parse_yaml) as parse:
+        assert yaml.load_yaml(path)['password'] == 'very_secret'
+    assert [call[0][0] for call in parse.call_args_list] == [
+        path, str(tmpdir.join(yaml.SECRET_YAML))]
+
+
+def test_load_cache_invalid(tmpdir, yaml_cache, caplog):
+    """Test a cache file that is not JSON is ignored."""
+    cache_path = tmpdir.join(yaml.CACHE_FILE)
+    cache_path.write_binary(pickle.dumps({'files': {}}))
+
+    yaml.load_cache(str(cache_path))
+
+    assert 'Unable to load YAML cache' in caplog.text
+    assert not yaml._YAML_CACHE